@@ -3,8 +3,36 @@
 # ============================================
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool
+from crew_utils.search_tool import CachedSerperDevTool
+from pydantic import BaseModel, Field
+from typing import List
 import os
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
+from crew_utils.context_budget import compress_context
+
+
+class ChapterOutline(BaseModel):
+    """ One chapter of the book outline """
+    number: int = Field(description="Chapter number, starting at 1")
+    title: str = Field(description="Chapter title")
+    sections: List[str] = Field(description="The 3-5 main sections of the chapter")
+    key_points: List[str] = Field(description="Key points and themes the chapter must cover")
+
+
+class BookOutline(BaseModel):
+    """ Chapter-by-chapter outline of the whole book """
+    chapters: List[ChapterOutline] = Field(description="Every chapter of the book, in order")
+
+class TranslatedParagraph(BaseModel):
+    """ One re-translated paragraph of the Bengali edition """
+    index: int = Field(description="The paragraph number given in square brackets")
+    text: str = Field(description="The paragraph translated into Bengali, with its markdown markers")
+
+
+class TranslatedParagraphs(BaseModel):
+    """ Re-translated paragraphs, one per numbered input paragraph """
+    paragraphs: List[TranslatedParagraph] = Field(description="Every numbered paragraph, translated")
 
 @CrewBase
 class BookWriter():
@@ -16,7 +44,7 @@ class BookWriter():
     def researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['researcher'],
-            tools=[SerperDevTool()],
+            tools=[CachedSerperDevTool()],
             verbose=True
         )
     
@@ -83,14 +111,124 @@ class BookWriter():
             agent=self.translator()
         )
 
+    def planning_crew(self) -> Crew:
+        """Research and outline only, with the outline as a BookOutline for the chapter pipeline"""
+        os.makedirs("./output", exist_ok=True)
+
+        outline_task = Task(
+            config=self.tasks_config['planning_task'],
+            agent=self.planner(),
+            output_pydantic=BookOutline,
+            output_file='output/book_outline.json',
+        )
+        return instrument(cache_llm_calls(compress_context(Crew(
+            agents=[self.researcher(), self.planner()],
+            tasks=[self.research_task(), outline_task],
+            process=Process.sequential,
+            verbose=True,
+        ), self.tasks_config)), name=__package__)
+
     @crew
     def crew(self) -> Crew:
         """Creates the Book Writing crew"""
         os.makedirs("./output", exist_ok=True)
         
-        return Crew(
+        return instrument(cache_llm_calls(compress_context(Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+        ), self.tasks_config)), name=__package__)
+
+
+@CrewBase
+class ChapterWriter():
+    """Writes, edits and translates a single chapter"""
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/chapter_tasks.yaml'
+
+    @agent
+    def writer(self) -> Agent:
+        return Agent(
+            config=self.agents_config['writer'],
+            verbose=True
+        )
+
+    @agent
+    def editor(self) -> Agent:
+        return Agent(
+            config=self.agents_config['editor'],
+            verbose=True
+        )
+
+    @agent
+    def translator(self) -> Agent:
+        return Agent(
+            config=self.agents_config['translator'],
+            verbose=True
+        )
+
+    @task
+    def write_chapter_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['write_chapter_task'],
+            agent=self.writer()
+        )
+
+    @task
+    def edit_chapter_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['edit_chapter_task'],
+            agent=self.editor()
+        )
+
+    @task
+    def translate_chapter_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['translate_chapter_task'],
+            agent=self.translator()
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the per-chapter crew"""
+        os.makedirs("./output/chapters", exist_ok=True)
+
+        return instrument(cache_llm_calls(Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+        )), name=__package__)
+
+
+@CrewBase
+class ParagraphTranslator():
+    """Re-translates only the paragraphs the translation check flagged"""
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/retranslate_tasks.yaml'
+
+    @agent
+    def translator(self) -> Agent:
+        return Agent(
+            config=self.agents_config['translator'],
+            verbose=True
+        )
+
+    @task
+    def retranslate_paragraphs_task(self) -> Task:
+        return Task(
+            config=self.tasks_config['retranslate_paragraphs_task'],
+            agent=self.translator(),
+            output_pydantic=TranslatedParagraphs,
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the paragraph re-translation crew"""
+        return instrument(cache_llm_calls(Crew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
             verbose=True,
-        )
\ No newline at end of file
+        )), name=__package__)
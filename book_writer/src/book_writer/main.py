@@ -15,8 +15,9 @@ load_dotenv()
 if not os.environ.get('LITELLM_REQUEST_TIMEOUT'):
     os.environ['LITELLM_REQUEST_TIMEOUT'] = '3600'
 
-from book_writer.crew import BookWriter
-from book_writer.utils.book_converter import convert_markdown_to_formats
+# The crew, the pipeline and the checkpoints load crewai and litellm, and the
+# publisher loads the converters; each entry point imports what it uses
+# (uv run benchmark_imports keeps this module light)
 
 def sanitize_filename(text, max_length=100):
     '''Convert text to safe filename (max 100 chars)'''
@@ -24,8 +25,9 @@ def sanitize_filename(text, max_length=100):
     filename = re.sub(r'[-\s]+', '_', filename)
     return filename[:max_length].strip('_').lower()
 
-def run():
-    inputs = {
+def book_inputs():
+    '''The book to write; edit these to write a different book'''
+    return {
         'title': 'LLM Application Engineer on Education Platform',
         'subtitle': 'A Guide to the Future of AI Jobs',
         'author': 'Abdul Matin',
@@ -48,22 +50,24 @@ def run():
         'examples_type': 'real-world, non-mathematical',
         'platforms': ['Amazon KDP', 'Gumroad', 'Leanpub']
     }
-    
-    # Use title for filenames
-    title = inputs['title']
-    safe_title = sanitize_filename(title)
-    
+
+def print_banner(inputs):
     print("=" * 70)
     print("📚 BOOK WRITING CREW - STARTED")
     print("=" * 70)
-    print(f"Title: {title}")
+    print(f"Title: {inputs['title']}")
     print(f"Author: {inputs['author']}")
     print(f"Chapters: {inputs['chapters']}")
     print(f"Words per chapter: {inputs['words_per_chapter']}")
     print("=" * 70)
+
+def run():
+    inputs = book_inputs()
+    print_banner(inputs)
     
     # Run the crew
     print("\n🤖 Starting AI agents...")
+    from book_writer.crew import BookWriter
     try:
         result = BookWriter().crew().kickoff(inputs=inputs)
         translation_successful = True
@@ -74,77 +78,188 @@ def run():
         print(str(e))
         traceback.print_exc()
         translation_successful = False
-    
-    # Convert English version
-    en_md = f'output/{title}_en.md'
+
+    retranslate_leftovers(inputs)
+    publish(inputs)
+
+def resume():
+    '''
+    Run the crew with per-task checkpoints (output/.checkpoints/).
+
+    Tasks whose inputs and upstream outputs are unchanged since the last run
+    are skipped, so a crash or an edited input only re-runs what it affects.
+    Pass --fresh to drop the checkpoints and start over.
+    '''
+    inputs = book_inputs()
+    print_banner(inputs)
+
+    print("\n🤖 Starting AI agents (resumable)...")
+    from book_writer.crew import BookWriter
+    from book_writer.utils.checkpoints import CheckpointStore, kickoff_with_checkpoints
+    try:
+        crew = BookWriter().crew()
+        if '--fresh' in sys.argv:
+            CheckpointStore().clear()
+        kickoff_with_checkpoints(crew, inputs)
+        print("\n✅ All tasks completed successfully!")
+    except Exception as e:
+        import traceback
+        print("\n⚠️  Error occurred during crew execution")
+        print(str(e))
+        print("Run resume again to continue from the failed task.")
+        traceback.print_exc()
+
+    retranslate_leftovers(inputs)
+    publish(inputs)
+
+def run_chapters():
+    '''
+    Write the book chapter by chapter, several chapters at a time.
+
+    Usage: run_chapters [chapters] [workers]
+    '''
+    inputs = book_inputs()
+    if len(sys.argv) > 1:
+        inputs['chapters'] = int(sys.argv[1])
+        inputs['total_word_count'] = inputs['chapters'] * inputs['words_per_chapter']
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    print_banner(inputs)
+
+    print(f"\n🤖 Starting AI agents ({workers} chapters at a time)...")
+    from book_writer.pipeline import write_book_by_chapter
+    try:
+        write_book_by_chapter(inputs, workers=workers)
+        print("\n✅ All chapters completed successfully!")
+    except Exception as e:
+        import traceback
+        print("\n⚠️  Error occurred during chapter pipeline")
+        print(str(e))
+        traceback.print_exc()
+
+    retranslate_leftovers(inputs)
+    publish(inputs)
+
+def retranslate_leftovers(inputs):
+    '''Re-translate the paragraphs of the Bengali edition that are still in English'''
+    bn_md = f"output/{inputs['title']}_bn.md"
+    if not os.path.exists(bn_md):
+        return
+    try:
+        from book_writer.pipeline import fix_translation
+        fix_translation(inputs, bn_md)
+    except Exception as e:
+        print("\n⚠️  Translation check failed")
+        print(str(e))
+
+def retranslate():
+    '''
+    Check an existing Bengali edition, re-translate only its untranslated
+    paragraphs, then publish again.
+    '''
+    inputs = book_inputs()
+    retranslate_leftovers(inputs)
+    publish(inputs)
+
+def benchmark():
+    '''
+    Time the crew end to end against the local stub server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    '''
+    from book_writer.crew import BookWriter
+    from crew_utils.crew_benchmark import run_benchmark
+
+    run_benchmark([('book_writer', BookWriter, book_inputs())])
+
+def benchmark_imports():
+    """
+    Check that importing book_writer.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('book_writer')
+
+
+def serve():
+    '''
+    Serve the crew over HTTP: queued kickoff jobs, progress events, and the
+    markdown, PDF and EPUB editions of each job's book (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    '''
+    from book_writer.crew import BookWriter
+    from crew_utils.crew_service import CrewService, run_service
+
+    service = CrewService()
+    service.register('book_writer', lambda: BookWriter().crew(), book_inputs,
+                     after=lambda output, job_dir, inputs: publish(inputs, job_dir))
+    run_service(service)
+
+def publish(inputs, output_dir='output'):
+    '''Convert the English and Bengali markdown in output_dir to PDF/EPUB and print a summary'''
+    from book_writer.utils.translation_check import check_translation_file
+    from book_writer.utils.publisher import publish_editions
+
+    title = inputs['title']
+    safe_title = sanitize_filename(title)
+    # BOOK_STREAMING=1 converts chapter by chapter and reuses unchanged chapters
+    streaming = os.environ.get('BOOK_STREAMING', '').lower() in ('1', 'true', 'yes')
+
+    editions = []
+    edition = {
+        'title': title,
+        'subtitle': inputs['subtitle'],
+        'author': inputs['author'],
+        'output_dir': output_dir,
+    }
+
+    # English version
+    en_md = os.path.join(output_dir, f'{title}_en.md')
     print(f"\nLooking for English file: {en_md}")
     
     if os.path.exists(en_md):
-        print("=" * 70)
-        print("📄 Converting English version to PDF and EPUB...")
-        print("=" * 70)
-        
-        try:
-            convert_markdown_to_formats(
-                markdown_file=en_md,
-                title=title,
-                subtitle=inputs['subtitle'],
-                author=inputs['author'],
-                output_dir='output',
-                output_prefix=f'{safe_title}_en',
-                language='en'
-            )
-            print("\n✅ English conversion complete!")
-        except Exception as e:
-            print("\n❌ English conversion error:")
-            print(str(e))
+        editions.append({**edition, 'markdown_file': en_md, 'output_prefix': f'{safe_title}_en', 'language': 'en'})
     else:
         print("\n⚠️  English file not found!")
         print(f"Expected location: {en_md}")
-        print("\nChecking what files exist in output/:")
-        if os.path.exists('output'):
-            files = os.listdir('output')
+        print(f"\nChecking what files exist in {output_dir}/:")
+        if os.path.exists(output_dir):
+            files = os.listdir(output_dir)
             for f in files:
                 print(f"  - {f}")
         else:
             print("  Output directory doesn't exist!")
     
-    # Convert Bengali version
-    bn_md = f'output/{title}_bn.md'
+    # Bengali version
+    bn_md = os.path.join(output_dir, f'{title}_bn.md')
     print(f"\nLooking for bn file: {bn_md}")
     
     if os.path.exists(bn_md):
         # Check if file actually contains Bengali text
-        with open(bn_md, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Check for Bengali Unicode range
-            has_bengali = any('\u0980' <= char <= '\u09FF' for char in content)
+        coverage = check_translation_file(bn_md)
         
-        if has_bengali:
-            print("=" * 70)
-            print("📄 Converting Bengali version to PDF and EPUB...")
-            print("=" * 70)
-            
-            try:
-                convert_markdown_to_formats(
-                    markdown_file=bn_md,
-                    title=title,
-                    subtitle=inputs['subtitle'],
-                    author=inputs['author'],
-                    output_dir='output',
-                    output_prefix=f'{safe_title}_bn',
-                    language='bn'
-                )
-                print("\n✅ bn conversion complete!")
-            except Exception as e:
-                print("\n❌ bn conversion error:")
-                print(str(e))
+        if coverage.has_bengali:
+            editions.append({**edition, 'markdown_file': bn_md, 'output_prefix': f'{safe_title}_bn', 'language': 'bn'})
         else:
             print("\n⚠️  WARNING: bn file exists but contains NO Bengali text!")
             print("The translation failed. File contains English instead of বাংলা.")
     else:
         print("\n⚠️  bn file not found!")
         print(f"Expected location: {bn_md}")
+
+    # Render every (language x format) job at once
+    if editions:
+        print("=" * 70)
+        print(f"📄 Converting {', '.join(e['language'] for e in editions)} to PDF and EPUB...")
+        print("=" * 70)
+        try:
+            publish_editions(editions, streaming=streaming)
+        except Exception as e:
+            print("\n❌ Conversion error:")
+            print(str(e))
     
     # Summary
     print("\n" + "=" * 70)
@@ -156,20 +271,20 @@ def run():
     if os.path.exists(en_md):
         print(f"\n📄 English Version:")
         print(f"  ├─ Markdown: {title}_en.md")
-        if os.path.exists(f'output/{safe_title}_en.pdf'):
+        if os.path.exists(os.path.join(output_dir, f'{safe_title}_en.pdf')):
             print(f"  ├─ PDF: {safe_title}_en.pdf")
-        if os.path.exists(f'output/{safe_title}_en.epub'):
+        if os.path.exists(os.path.join(output_dir, f'{safe_title}_en.epub')):
             print(f"  └─ EPUB: {safe_title}_en.epub")
     
     if os.path.exists(bn_md):
         print(f"\n📄 bn Version (বাংলা):")
         print(f"  ├─ Markdown: {title}_bn.md")
-        if os.path.exists(f'output/{safe_title}_bn.pdf'):
+        if os.path.exists(os.path.join(output_dir, f'{safe_title}_bn.pdf')):
             print(f"  ├─ PDF: {safe_title}_bn.pdf")
-        if os.path.exists(f'output/{safe_title}_bn.epub'):
+        if os.path.exists(os.path.join(output_dir, f'{safe_title}_bn.epub')):
             print(f"  └─ EPUB: {safe_title}_bn.epub")
     
-    print("\n📁 Location: output/ folder")
+    print(f"\n📁 Location: {output_dir}/ folder")
     print("=" * 70)
 
 if __name__ == "__main__":
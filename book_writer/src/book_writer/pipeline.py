@@ -0,0 +1,124 @@
+# ============================================
+# FILE: src/book_writer/pipeline.py
+# ============================================
+'''
+Chapter-parallel book pipeline.
+
+Research and outline run once (BookWriter.planning_crew). Then every chapter of
+the outline gets its own write -> edit -> translate chain (ChapterWriter). The
+chains run concurrently on a worker pool, so no single LLM request has to
+carry the whole book. The chapters are stitched back together in outline order
+into output/{title}_en.md and output/{title}_bn.md, the same files the
+sequential crew produces.
+
+fix_translation() is the cheap second pass for either pipeline: it re-sends
+only the paragraphs of the Bengali edition that are still in English.
+'''
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from book_writer.crew import BookWriter, ChapterWriter, ParagraphTranslator
+from book_writer.utils.translation_check import check_translation_file, replace_paragraphs
+
+
+def format_outline(outline):
+    '''Short table of contents used to give each chapter its place in the book'''
+    return '\n'.join(f'{c.number}. {c.title}' for c in outline.chapters)
+
+
+def format_chapter(chapter):
+    lines = ['Sections:'] + [f'- {s}' for s in chapter.sections]
+    lines += ['Key points:'] + [f'- {p}' for p in chapter.key_points]
+    return '\n'.join(lines)
+
+
+def write_chapter(inputs, chapter, book_outline, research):
+    '''Run one chapter's write -> edit -> translate chain; returns (english, bengali)'''
+    chapter_inputs = {
+        **inputs,
+        'chapter_number': f'{chapter.number:02d}',
+        'chapter_title': chapter.title,
+        'chapter_outline': format_chapter(chapter),
+        'book_outline': book_outline,
+        'research': research,
+    }
+    start = time.perf_counter()
+    result = ChapterWriter().crew().kickoff(inputs=chapter_inputs)
+    _, edited, translated = result.tasks_output
+    print(f"✅ Chapter {chapter.number} done in {time.perf_counter() - start:.1f}s: {chapter.title}")
+    return edited.raw.strip(), translated.raw.strip()
+
+
+def write_book_by_chapter(inputs, workers=3, output_dir='output'):
+    '''
+    Plan the book once, then write/edit/translate every chapter concurrently.
+
+    Returns the paths of the assembled English and Bengali markdown files.
+    '''
+    title = inputs['title']
+
+    print("\n🧭 Researching and outlining...")
+    plan = BookWriter().planning_crew().kickoff(inputs=inputs)
+    research = plan.tasks_output[0].raw
+    outline = plan.pydantic
+    chapters = sorted(outline.chapters, key=lambda c: c.number)
+    book_outline = format_outline(outline)
+
+    print(f"\n✍️  Writing {len(chapters)} chapters with {workers} workers...")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_chapter, inputs, c, book_outline, research) for c in chapters]
+        # Collect in outline order, whatever order the chapters finish in
+        results = [f.result() for f in futures]
+    print(f"\n📚 All chapters written in {time.perf_counter() - start:.1f}s")
+
+    os.makedirs(output_dir, exist_ok=True)
+    en_md = os.path.join(output_dir, f'{title}_en.md')
+    bn_md = os.path.join(output_dir, f'{title}_bn.md')
+    with open(en_md, 'w', encoding='utf-8') as f:
+        f.write('\n\n'.join(english for english, _ in results) + '\n')
+    with open(bn_md, 'w', encoding='utf-8') as f:
+        f.write('\n\n'.join(bengali for _, bengali in results) + '\n')
+
+    return en_md, bn_md
+
+
+def retranslate_batch(inputs, batch):
+    '''Translate one batch of flagged paragraphs; returns {paragraph index: text}'''
+    paragraphs = '\n\n'.join(f'[{p.index}]\n{p.text.strip()}' for p in batch)
+    result = ParagraphTranslator().crew().kickoff(inputs={**inputs, 'paragraphs': paragraphs})
+    wanted = {p.index for p in batch}
+    translated = result.pydantic.paragraphs if result.pydantic else []
+    return {t.index: t.text for t in translated if t.index in wanted and t.text.strip()}
+
+
+def fix_translation(inputs, bn_md, batch_size=20, workers=3):
+    '''
+    Check the Bengali edition and re-translate only its untranslated paragraphs.
+
+    The paragraphs are patched into bn_md in place. Returns the coverage
+    report of the file afterwards.
+    '''
+    report = check_translation_file(bn_md)
+    report.print_report()
+    flagged = report.untranslated
+    if not flagged:
+        return report
+
+    batches = [flagged[i:i + batch_size] for i in range(0, len(flagged), batch_size)]
+    print(f"\n🔁 Re-translating {len(flagged)} paragraphs in {len(batches)} batches...")
+    replacements = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(retranslate_batch, inputs, batch) for batch in batches]
+        for future in futures:
+            try:
+                replacements.update(future.result())
+            except Exception as e:
+                # Keep whatever the other batches translated
+                print(f"⚠️  Re-translation batch failed: {e}")
+
+    replace_paragraphs(bn_md, report, replacements)
+    report = check_translation_file(bn_md)
+    report.print_report()
+    return report
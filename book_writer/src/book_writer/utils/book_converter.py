@@ -1,33 +1,32 @@
 # ============================================
 # FILE: src/book_writer/utils/book_converter.py
 # ============================================
+import hashlib
 import os
+from html import escape as html_escape
 from pathlib import Path
 
-def convert_markdown_to_formats(markdown_file, title, author, output_dir='output', output_prefix='final_book', language='en', subtitle=''):
+from book_writer.utils.markdown_splitter import heading_outline, split_chapters
+
+# header-ids gives every heading an anchor for the EPUB table of contents
+MARKDOWN_EXTRAS = ['fenced-code-blocks', 'tables', 'header-ids']
+
+def convert_markdown_to_formats(markdown_file, title, author, output_dir='output', output_prefix='final_book', language='en', subtitle='', streaming=False):
     '''
     Convert markdown file to PDF and EPUB formats
+
+    streaming=True converts chapter by chapter with a per-chapter cache
+    (see create_pdf_streaming), which keeps memory flat on long books.
     '''
     try:
-        from markdown2 import markdown
-        from weasyprint import HTML, CSS
-        from ebooklib import epub
-        
-        # Read markdown content
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # Convert markdown to HTML
-        html_content = markdown(md_content, extras=['fenced-code-blocks', 'tables'])
-        
         # Create PDF
         pdf_path = os.path.join(output_dir, f'{output_prefix}.pdf')
-        create_pdf(html_content, title, author, pdf_path, language, subtitle)
+        convert_markdown_to_pdf(markdown_file, title, author, pdf_path, language, subtitle, streaming)
         print(f"✅ PDF created: {pdf_path}")
         
         # Create EPUB
         epub_path = os.path.join(output_dir, f'{output_prefix}.epub')
-        create_epub(md_content, title, author, epub_path, language, subtitle)
+        convert_markdown_to_epub(markdown_file, title, author, epub_path, language, subtitle, streaming)
         print(f"✅ EPUB created: {epub_path}")
         
         return True
@@ -35,101 +34,140 @@ def convert_markdown_to_formats(markdown_file, title, author, output_dir='output
     except ImportError as e:
         print(f"Missing required library: {e}")
         print("\nInstall required packages:")
-        print("uv add markdown2 weasyprint ebooklib")
+        print("uv add markdown2 weasyprint ebooklib pypdf")
         return False
 
-def create_pdf(html_content, title, author, output_path, language='en', subtitle=''):
-    '''Create PDF from HTML content with Bengali font support'''
-    from weasyprint import HTML, CSS
-    
+def convert_markdown_to_pdf(markdown_file, title, author, output_path, language='en', subtitle='', streaming=False):
+    '''Markdown file -> PDF, in one pass or chapter by chapter'''
+    if streaming:
+        return create_pdf_streaming(markdown_file, title, author, output_path, language, subtitle)
+
+    from markdown2 import markdown
+
+    # Read markdown content
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+
+    # Convert markdown to HTML
+    html_content = markdown(md_content, extras=['fenced-code-blocks', 'tables'])
+    create_pdf(html_content, title, author, output_path, language, subtitle)
+
+def convert_markdown_to_epub(markdown_file, title, author, output_path, language='en', subtitle='', streaming=False):
+    '''Markdown file -> EPUB, in one pass or chapter by chapter'''
+    if streaming:
+        return create_epub_streaming(markdown_file, title, author, output_path, language, subtitle)
+
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+    create_epub(md_content, title, author, output_path, language, subtitle)
+
+def pdf_css(title, language='en'):
+    '''Page and typography CSS for the PDF edition'''
+    return pdf_base_css(language) + pdf_header_css(title)
+
+def pdf_base_css(language='en'):
+    '''Everything in the PDF stylesheet that does not depend on the book, parsed once per language'''
     # Choose font based on language
     if language == 'bn':
         font_family = "'Noto Sans Bengali', 'Kalpurush', 'SolaimanLipi', sans-serif"
     else:
         font_family = "'Georgia', serif"
+
+    return f'''
+    @page {{
+        size: A4;
+        margin: 2.5cm;
+        @bottom-center {{
+            content: "Page " counter(page);
+            font-size: 10pt;
+        }}
+    }}
+    body {{
+        font-family: {font_family};
+        font-size: 12pt;
+        line-height: 1.8;
+        color: #333;
+    }}
+    h1 {{
+        font-size: 24pt;
+        margin-top: 2em;
+        margin-bottom: 1em;
+        page-break-before: always;
+        page-break-after: avoid;
+    }}
+    h1:first-of-type {{
+        page-break-before: avoid;
+    }}
+    h2 {{
+        font-size: 18pt;
+        margin-top: 1.5em;
+        margin-bottom: 0.75em;
+        page-break-after: avoid;
+    }}
+    h3 {{
+        font-size: 14pt;
+        margin-top: 1em;
+        margin-bottom: 0.5em;
+        page-break-after: avoid;
+    }}
+    p {{
+        text-align: justify;
+        margin-bottom: 1em;
+        orphans: 3;
+        widows: 3;
+    }}
+    .title-page {{
+        text-align: center;
+        margin-top: 30%;
+        page-break-after: always;
+    }}
+    .title-page h1 {{
+        font-size: 32pt;
+        page-break-before: avoid;
+        page-break-after: avoid;
+        margin-bottom: 0.5em;
+    }}
+    .title-page .subtitle {{
+        font-size: 16pt;
+        margin-top: 1em;
+        margin-bottom: 2em;
+        color: #555;
+        font-style: italic;
+    }}
+    .title-page .author {{
+        font-size: 18pt;
+        margin-top: 3em;
+        font-weight: bold;
+    }}
+    '''
+
+def pdf_header_css(title):
+    '''Running header with the book title'''
+    title = title.replace('\\', '\\\\').replace('"', '\\"')
+    return f'''
+    @page {{
+        @top-center {{
+            content: "{title}";
+            font-size: 10pt;
+            color: #666;
+        }}
+    }}
+    '''
+
+def create_pdf(html_content, title, author, output_path, language='en', subtitle=''):
+    '''Create PDF from HTML content with Bengali font support'''
+    from book_writer.utils.publishing_engine import get_engine
     
     # Format subtitle if provided
     subtitle_html = f'<p class="subtitle">{subtitle}</p>' if subtitle else ''
     
-    # Add styling with Bengali font support
+    # Stylesheets come pre-parsed from the engine (one per language)
     styled_html = f'''
     <!DOCTYPE html>
     <html lang="{language}">
     <head>
         <meta charset="UTF-8">
         <title>{title}</title>
-        <style>
-            @page {{
-                size: A4;
-                margin: 2.5cm;
-                @top-center {{
-                    content: "{title}";
-                    font-size: 10pt;
-                    color: #666;
-                }}
-                @bottom-center {{
-                    content: "Page " counter(page);
-                    font-size: 10pt;
-                }}
-            }}
-            body {{
-                font-family: {font_family};
-                font-size: 12pt;
-                line-height: 1.8;
-                color: #333;
-            }}
-            h1 {{
-                font-size: 24pt;
-                margin-top: 2em;
-                margin-bottom: 1em;
-                page-break-before: always;
-                page-break-after: avoid;
-            }}
-            h1:first-of-type {{
-                page-break-before: avoid;
-            }}
-            h2 {{
-                font-size: 18pt;
-                margin-top: 1.5em;
-                margin-bottom: 0.75em;
-                page-break-after: avoid;
-            }}
-            h3 {{
-                font-size: 14pt;
-                margin-top: 1em;
-                margin-bottom: 0.5em;
-                page-break-after: avoid;
-            }}
-            p {{
-                text-align: justify;
-                margin-bottom: 1em;
-                orphans: 3;
-                widows: 3;
-            }}
-            .title-page {{
-                text-align: center;
-                margin-top: 30%%;
-                page-break-after: always;
-            }}
-            .title-page h1 {{
-                font-size: 32pt;
-                page-break-before: avoid;
-                page-break-after: avoid;
-                margin-bottom: 0.5em;
-            }}
-            .title-page .subtitle {{
-                font-size: 16pt;
-                margin-top: 1em;
-                margin-bottom: 2em;
-                color: #555;
-                font-style: italic;
-            }}
-            .title-page .author {{
-                font-size: 18pt;
-                margin-top: 3em;
-                font-weight: bold;
-            }}
-        </style>
     </head>
     <body>
         <div class="title-page">
@@ -142,27 +180,12 @@ def create_pdf(html_content, title, author, output_path, language='en', subtitle
     </html>
     '''
     
-    HTML(string=styled_html).write_pdf(output_path)
+    get_engine().write_pdf(styled_html, title, language, output_path)
 
-def create_epub(markdown_content, title, author, output_path, language='en', subtitle=''):
-    '''Create EPUB from markdown content with Bengali support'''
-    from ebooklib import epub
-    
-    book = epub.EpubBook()
-    
-    # Set metadata
-    book.set_identifier(f'book_{title.replace(" ", "_")}')
-    book.set_title(title)
-    book.set_language(language)
-    book.add_author(author)
-    
-    # Add subtitle to metadata if provided
-    if subtitle:
-        book.add_metadata('DC', 'description', subtitle)
-    
-    # Add CSS for Bengali font support
+def epub_css(language='en'):
+    '''Stylesheet for the EPUB edition, with Bengali font support'''
     if language == 'bn':
-        style = '''
+        return '''
         body {
             font-family: 'Noto Sans Bengali', 'Kalpurush', 'SolaimanLipi', sans-serif;
             line-height: 1.8;
@@ -178,7 +201,7 @@ def create_epub(markdown_content, title, author, output_path, language='en', sub
         }
         '''
     else:
-        style = '''
+        return '''
         body {
             font-family: Georgia, serif;
             line-height: 1.6;
@@ -190,6 +213,24 @@ def create_epub(markdown_content, title, author, output_path, language='en', sub
             margin-bottom: 2em;
         }
         '''
+
+def create_epub(markdown_content, title, author, output_path, language='en', subtitle=''):
+    '''Create EPUB from markdown content with Bengali support'''
+    from ebooklib import epub
+    
+    book = epub.EpubBook()
+    
+    # Set metadata
+    book.set_identifier(f'book_{title.replace(" ", "_")}')
+    book.set_title(title)
+    book.set_language(language)
+    book.add_author(author)
+    
+    # Add subtitle to metadata if provided
+    if subtitle:
+        book.add_metadata('DC', 'description', subtitle)
+    
+    style = epub_css(language)
     
     nav_css = epub.EpubItem(
         uid="style_nav",
@@ -199,27 +240,29 @@ def create_epub(markdown_content, title, author, output_path, language='en', sub
     )
     book.add_item(nav_css)
     
-    # Split content into chapters
+    # Split at real H1 headings and render each chapter once
+    from markdown2 import markdown
+
     chapters = []
-    chapter_contents = markdown_content.split('# ')
-    
-    for i, chapter_content in enumerate(chapter_contents[1:], 1):  # Skip first split
-        chapter_title = chapter_content.split('\n')[0]
-        chapter_body = '\n'.join(chapter_content.split('\n')[1:])
+    toc = []
+    for i, (chapter_title, chapter_md) in enumerate(split_chapters(markdown_content.splitlines(True)), 1):
+        heading = f'# {chapter_title}\n' if chapter_title else ''
+        chapter_html = markdown(heading + chapter_md, extras=MARKDOWN_EXTRAS)
         
         # Create chapter
         c = epub.EpubHtml(
-            title=chapter_title,
+            title=chapter_title or title,
             file_name=f'chap_{i:02d}.xhtml',
             lang=language
         )
-        c.content = f'<h1>{chapter_title}</h1>{chapter_body}'
+        c.content = chapter_html
         c.add_item(nav_css)
         book.add_item(c)
         chapters.append(c)
+        toc.append(epub_toc_entry(c, chapter_html))
     
-    # Add table of contents
-    book.toc = tuple(chapters)
+    # Add table of contents (chapters, with their H2/H3 sections nested)
+    book.toc = tuple(toc)
     
     # Add navigation files
     book.add_item(epub.EpubNcx())
@@ -229,4 +272,241 @@ def create_epub(markdown_content, title, author, output_path, language='en', sub
     book.spine = ['nav'] + chapters
     
     # Write EPUB file
-    epub.write_epub(output_path, book)
\ No newline at end of file
+    epub.write_epub(output_path, book)
+
+def epub_toc_entry(chapter, chapter_html):
+    '''TOC entry for one chapter: the chapter itself, or (chapter, [sections]) when it has H2/H3s'''
+    from ebooklib import epub
+
+    def link(text, anchor):
+        return epub.Link(f'{chapter.file_name}#{anchor}', text, f'{chapter.get_id()}_{anchor}')
+
+    sections = []
+    for text, anchor, subsections in heading_outline(chapter_html):
+        if subsections:
+            section = epub.Section(text, f'{chapter.file_name}#{anchor}')
+            sections.append((section, [link(t, a) for t, a in subsections]))
+        else:
+            sections.append(link(text, anchor))
+    return (chapter, sections) if sections else chapter
+
+# --------------------------------------------
+# Streaming mode: one chapter at a time
+# --------------------------------------------
+# Long manuscripts are read, rendered and laid out chapter by chapter instead
+# of as one big string. Every chapter's HTML, EPUB XHTML and PDF pages are
+# cached on disk by content hash, so a re-run after editing one chapter only
+# re-renders that chapter (plus, for the PDF, any later chapters whose page
+# numbers moved).
+
+RENDER_VERSION = '3'  # bump to invalidate cached chapters when rendering changes
+
+
+def iter_markdown_chapters(markdown_file):
+    '''
+    Yield (chapter_title, chapter_markdown) pairs while reading the file line by line.
+
+    A chapter starts at every top-level '# ' heading outside code blocks
+    (see split_chapters). Text before the first heading is yielded with an
+    empty title.
+    '''
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        yield from split_chapters(f)
+
+
+def content_hash(*parts):
+    digest = hashlib.sha256(RENDER_VERSION.encode('utf-8'))
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(str(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ChapterCache:
+    '''Content-addressed files under cache_dir: <hash>.html, <hash>.xhtml, <hash>.pdf and its <hash>.pages'''
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key, ext):
+        return os.path.join(self.cache_dir, f'{key}.{ext}')
+
+    def has(self, key, *exts):
+        '''True if every one of the key's files is there'''
+        found = all(os.path.exists(self.path(key, ext)) for ext in exts)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    def read_text(self, key, ext):
+        with open(self.path(key, ext), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def write_text(self, key, ext, text):
+        tmp = f'{self.path(key, ext)}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, self.path(key, ext))
+
+
+def render_chapter_html(chapter_title, chapter_md, cache):
+    '''Markdown -> HTML for one chapter, cached by the chapter's content'''
+    from markdown2 import markdown
+
+    key = content_hash('html', chapter_title, chapter_md)
+    if cache.has(key, 'html'):
+        return cache.read_text(key, 'html')
+
+    heading = f'# {chapter_title}\n' if chapter_title else ''
+    html = markdown(heading + chapter_md, extras=MARKDOWN_EXTRAS)
+    cache.write_text(key, 'html', html)
+    return html
+
+
+def render_chapter_xhtml(chapter_html, language, cache):
+    '''Chapter HTML -> well-formed XHTML body for the EPUB, cached by content'''
+    from lxml import etree, html as lxml_html
+
+    key = content_hash('xhtml', language, chapter_html)
+    if cache.has(key, 'xhtml'):
+        return cache.read_text(key, 'xhtml')
+
+    fragments = lxml_html.fragments_fromstring(chapter_html)
+    xhtml = ''.join(
+        etree.tostring(f, method='xml', encoding='unicode') if not isinstance(f, str) else html_escape(f)
+        for f in fragments
+    )
+    cache.write_text(key, 'xhtml', xhtml)
+    return xhtml
+
+
+def chapter_page_html(body_html, title, language, first_page):
+    '''Standalone HTML page for one chapter whose page numbers start at first_page'''
+    return f'''<!DOCTYPE html>
+    <html lang="{language}">
+    <head>
+        <meta charset="UTF-8">
+        <title>{title}</title>
+        <style>
+            @page :first {{
+                counter-reset: page {first_page};
+            }}
+        </style>
+    </head>
+    <body>
+        {body_html}
+    </body>
+    </html>
+    '''
+
+
+def title_page_html(title, author, subtitle):
+    subtitle_html = f'<p class="subtitle">{subtitle}</p>' if subtitle else ''
+    return f'''
+    <div class="title-page">
+        <h1>{title}</h1>
+        {subtitle_html}
+        <p class="author">by {author}</p>
+    </div>
+    '''
+
+
+def render_chapter_pdf(body_html, title, language, first_page, cache):
+    '''Lay out one chapter to its own cached PDF; returns (path, page_count)'''
+    key = content_hash('pdf', title, language, first_page, pdf_css(title, language), body_html)
+    path = cache.path(key, 'pdf')
+    # A PDF without its page count (an older crash) is laid out again
+    if cache.has(key, 'pdf', 'pages'):
+        return path, int(cache.read_text(key, 'pages'))
+
+    from book_writer.utils.publishing_engine import get_engine
+
+    document = get_engine().render(chapter_page_html(body_html, title, language, first_page), title, language)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    document.write_pdf(tmp)
+    # The page count goes first: the PDF only counts as cached once both are there
+    cache.write_text(key, 'pages', str(len(document.pages)))
+    os.replace(tmp, path)
+    return path, len(document.pages)
+
+
+def merge_pdfs(paths, output_path):
+    '''Concatenate chapter PDFs into the final book'''
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+    writer.close()
+
+
+def default_cache_dir(output_path):
+    return os.path.join(os.path.dirname(output_path) or '.', '.book_cache')
+
+
+def create_pdf_streaming(markdown_file, title, author, output_path, language='en', subtitle='', cache_dir=None):
+    '''
+    Lay out the PDF one chapter at a time, reusing cached chapters.
+
+    Only one chapter's markdown and layout are held in memory at once; the
+    book is assembled from the per-chapter PDFs.
+    '''
+    cache = ChapterCache(cache_dir or default_cache_dir(output_path))
+
+    # The title page is page 1; each chapter continues the numbering
+    path, pages = render_chapter_pdf(title_page_html(title, author, subtitle), title, language, 1, cache)
+    pdf_parts = [path]
+    next_page = 1 + pages
+
+    for i, (chapter_title, chapter_md) in enumerate(iter_markdown_chapters(markdown_file), 1):
+        chapter_html = render_chapter_html(chapter_title, chapter_md, cache)
+        path, pages = render_chapter_pdf(chapter_html, title, language, next_page, cache)
+        pdf_parts.append(path)
+        next_page += pages
+        print(f"  📄 Chapter {i}: {chapter_title or '(front matter)'} ({pages} pages)")
+
+    merge_pdfs(pdf_parts, output_path)
+    print(f"🗄️  PDF chapter cache: {cache.hits} reused, {cache.misses} rendered ({cache.cache_dir})")
+
+
+def create_epub_streaming(markdown_file, title, author, output_path, language='en', subtitle='', cache_dir=None):
+    '''Build the EPUB one chapter at a time from cached per-chapter XHTML'''
+    from ebooklib import epub
+
+    cache = ChapterCache(cache_dir or default_cache_dir(output_path))
+
+    book = epub.EpubBook()
+    book.set_identifier(f'book_{title.replace(" ", "_")}')
+    book.set_title(title)
+    book.set_language(language)
+    book.add_author(author)
+    if subtitle:
+        book.add_metadata('DC', 'description', subtitle)
+    nav_css = epub.EpubItem(uid="style_nav", file_name="style/nav.css",
+                            media_type="text/css", content=epub_css(language))
+    book.add_item(nav_css)
+
+    chapters = []
+    toc = []
+    for i, (chapter_title, chapter_md) in enumerate(iter_markdown_chapters(markdown_file), 1):
+        chapter_html = render_chapter_html(chapter_title, chapter_md, cache)
+        c = epub.EpubHtml(title=chapter_title or title, file_name=f'chap_{i:02d}.xhtml', lang=language)
+        c.content = render_chapter_xhtml(chapter_html, language, cache)
+        c.add_item(nav_css)
+        book.add_item(c)
+        chapters.append(c)
+        toc.append(epub_toc_entry(c, chapter_html))
+
+    book.toc = tuple(toc)
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = ['nav'] + chapters
+    epub.write_epub(output_path, book)
+    print(f"🗄️  EPUB chapter cache: {cache.hits} reused, {cache.misses} rendered ({cache.cache_dir})")
@@ -0,0 +1,154 @@
+# ============================================
+# FILE: src/book_writer/utils/checkpoints.py
+# ============================================
+'''
+Resumable crew runs: one checkpoint per task.
+
+kickoff_with_checkpoints() runs a sequential crew one task at a time. Before
+each task it hashes everything that decides the task's result:
+
+- the task's description, expected output and output file, with the inputs
+  filled in (so only the inputs the task actually uses count)
+- its agent's role, goal, backstory and model
+- the raw outputs of its upstream tasks (its `context`, or every earlier
+  task when no context is set)
+
+If output/.checkpoints/<task>.json holds the same hash, the saved output is
+reused and the task is skipped. Otherwise the task runs and its checkpoint is
+rewritten. A crash in the last task therefore resumes at the last task, and a
+changed input (say words_per_chapter) only re-runs the tasks that use it and
+the tasks downstream of them.
+'''
+import hashlib
+import json
+import os
+import time
+
+from crewai import Crew, Process
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
+
+CHECKPOINT_VERSION = '1'  # bump to invalidate every checkpoint
+
+
+class CheckpointStore:
+    '''JSON files under checkpoint_dir, one per task name'''
+
+    def __init__(self, checkpoint_dir='output/.checkpoints'):
+        self.checkpoint_dir = checkpoint_dir
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.checkpoint_dir, f'{name}.json')
+
+    def load(self, name):
+        try:
+            with open(self.path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, name, key, output):
+        checkpoint = {
+            'key': key,
+            'raw': output.raw,
+            'agent': output.agent,
+            'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        tmp = f'{self.path(name)}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path(name))
+
+    def clear(self):
+        for name in os.listdir(self.checkpoint_dir):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.checkpoint_dir, name))
+
+
+def upstream_tasks(tasks, i):
+    '''The tasks whose output task i sees, the same way a sequential crew decides it'''
+    context = tasks[i].context
+    if context is NOT_SPECIFIED:
+        return tasks[:i]
+    return context or []
+
+
+def task_key(task, upstream):
+    '''Hash of an (already interpolated) task, its agent and its upstream outputs'''
+    agent = task.agent
+    parts = [
+        CHECKPOINT_VERSION,
+        task.name,
+        task.description,
+        task.expected_output,
+        task.output_file or '',
+        agent.role,
+        agent.goal,
+        agent.backstory,
+        str(getattr(agent.llm, 'model', agent.llm)),
+    ]
+    parts += [u.output.raw if u.output else '' for u in upstream]
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def restore_output(task, checkpoint):
+    '''Put a checkpointed output back on the task, and its output file back on disk if missing'''
+    task.output = TaskOutput(
+        name=task.name,
+        description=task.description,
+        expected_output=task.expected_output,
+        raw=checkpoint['raw'],
+        agent=checkpoint.get('agent') or task.agent.role,
+    )
+    if task.output_file and not os.path.exists(task.output_file):
+        os.makedirs(os.path.dirname(task.output_file) or '.', exist_ok=True)
+        with open(task.output_file, 'w', encoding='utf-8') as f:
+            f.write(checkpoint['raw'])
+
+
+def kickoff_with_checkpoints(crew, inputs, checkpoint_dir='output/.checkpoints'):
+    '''
+    Run a sequential crew task by task, skipping tasks whose checkpoint is still valid.
+
+    Returns the list of task outputs, in task order.
+    '''
+    store = CheckpointStore(checkpoint_dir)
+    tasks = crew.tasks
+    for task in tasks:
+        task.interpolate_inputs_and_add_conversation_history(inputs)
+        task.agent.interpolate_inputs(inputs)
+
+    for i, task in enumerate(tasks):
+        key = task_key(task, upstream_tasks(tasks, i))
+        checkpoint = store.load(task.name)
+        if checkpoint and checkpoint.get('key') == key:
+            restore_output(task, checkpoint)
+            print(f"⏭️  {task.name}: checkpoint is up to date, skipped")
+            continue
+
+        print(f"▶️  {task.name}: {'inputs changed' if checkpoint else 'no checkpoint'}, running")
+        start = time.perf_counter()
+        # Run alone, the task would no longer see the earlier tasks' outputs
+        if task.context is NOT_SPECIFIED:
+            task.context = tasks[:i]
+        single = instrument(cache_llm_calls(Crew(
+            agents=[task.agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=crew.verbose,
+        )), name='book_writer')
+        if getattr(crew, '_context_budget', None):
+            crew._context_budget.attach(single)
+        single.kickoff(inputs=inputs)
+        store.save(task.name, key, task.output)
+        print(f"💾 {task.name}: checkpoint saved ({time.perf_counter() - start:.1f}s)")
+
+    return [task.output for task in tasks]
@@ -0,0 +1,116 @@
+# ============================================
+# FILE: src/book_writer/utils/converter_benchmark.py
+# ============================================
+'''
+Peak memory and time of the one-shot vs streaming book converter.
+
+Generates a synthetic manuscript (300 pages by default), then converts it in a
+fresh subprocess per scenario so each peak RSS is measured on its own:
+
+    classic          convert_markdown_to_formats(...)
+    streaming cold   streaming mode, empty chapter cache
+    streaming warm   streaming mode again, nothing changed
+    one chapter      streaming mode after editing a single chapter
+
+    uv run benchmark_converter [pages]
+'''
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+WORDS_PER_PAGE = 300
+PAGES_PER_CHAPTER = 10
+SENTENCE = ("Large language models are changing how teams build software, "
+            "and the engineers who ship them learn to test, measure and iterate. ")
+
+
+def write_manuscript(path, pages):
+    '''Write a markdown book of roughly `pages` A4 pages'''
+    chapters = max(1, pages // PAGES_PER_CHAPTER)
+    words_per_sentence = len(SENTENCE.split())
+    sentences_per_chapter = PAGES_PER_CHAPTER * WORDS_PER_PAGE // words_per_sentence
+    with open(path, 'w', encoding='utf-8') as f:
+        for c in range(1, chapters + 1):
+            f.write(f'# Chapter {c}: Working With Models\n\n')
+            for s in range(sentences_per_chapter):
+                if s % 40 == 0:
+                    f.write(f'\n## Section {s // 40 + 1}\n\n')
+                f.write(SENTENCE)
+                if s % 5 == 4:
+                    f.write('\n\n')
+            f.write('\n\n')
+
+
+def edit_one_chapter(path, chapter=3):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    marker = f'# Chapter {chapter}:'
+    text = text.replace(marker, marker + ' (revised)', 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def child(mode, markdown_file, output_dir):
+    '''Run one conversion and print its wall time and peak RSS as JSON'''
+    from book_writer.utils.book_converter import convert_markdown_to_formats
+
+    start = time.perf_counter()
+    ok = convert_markdown_to_formats(markdown_file, 'Benchmark Book', 'Bench', output_dir=output_dir,
+                                     output_prefix='bench', streaming=(mode == 'streaming'))
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_kb //= 1024  # macOS reports bytes
+    print(json.dumps({'ok': ok, 'seconds': seconds, 'peak_mb': peak_kb / 1024}))
+
+
+def measure(mode, markdown_file, output_dir):
+    result = subprocess.run(
+        [sys.executable, '-m', 'book_writer.utils.converter_benchmark', '--child', mode, markdown_file, output_dir],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else 'benchmark child failed')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run():
+    '''
+    Benchmark the converter on a synthetic manuscript and print a report.
+    '''
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    workdir = tempfile.mkdtemp(prefix='book_bench_')
+    markdown_file = os.path.join(workdir, 'book.md')
+    write_manuscript(markdown_file, pages)
+    size_mb = os.path.getsize(markdown_file) / 1024 / 1024
+
+    scenarios = [
+        ('classic', 'classic', None),
+        ('streaming cold', 'streaming', None),
+        ('streaming warm', 'streaming', None),
+        ('one chapter edited', 'streaming', edit_one_chapter),
+    ]
+    print(f"\n📊 Converting a ~{pages}-page manuscript ({size_mb:.1f} MB of markdown)")
+    print("-" * 60)
+    print(f"{'scenario':<22}{'seconds':>10}{'peak RSS (MB)':>18}")
+    for label, mode, prepare in scenarios:
+        if prepare:
+            prepare(markdown_file)
+        r = measure(mode, markdown_file, os.path.join(workdir, 'output'))
+        if not r['ok']:
+            print(f"{label:<22}{'missing libraries':>28}")
+            continue
+        print(f"{label:<22}{r['seconds']:>10.2f}{r['peak_mb']:>18.1f}")
+    print("-" * 60)
+    print(f"Files in {workdir}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(*sys.argv[2:5])
+    else:
+        run()
@@ -0,0 +1,74 @@
+# ============================================
+# FILE: src/book_writer/utils/markdown_splitter.py
+# ============================================
+'''
+Split a markdown manuscript into chapters at its real H1 headings.
+
+`text.split('# ')` also cuts at '## ' / '### ' headings, at '# ' in the middle
+of a sentence and at comments inside code blocks. This splitter walks the
+manuscript once, line by line, and only starts a new chapter at an ATX
+'# Heading' line that is outside a fenced code block. It keeps no state
+besides the current fence, so it runs in linear time and never needs the
+whole book in memory.
+'''
+import re
+from html import unescape
+
+# Opening/closing code fence: up to 3 spaces, then ``` or ~~~ (3 or more)
+FENCE_RE = re.compile(r' {0,3}(`{3,}|~{3,})')
+# ATX level-1 heading: '# Title', optional closing hashes
+H1_RE = re.compile(r' {0,3}#(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+# H2/H3 in markdown2 output rendered with the 'header-ids' extra
+SUBHEADING_RE = re.compile(r'<h([23]) id="([^"]*)">(.*?)</h\1>', re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def split_chapters(lines):
+    '''
+    Yield (chapter_title, chapter_markdown) pairs from an iterable of lines.
+
+    Lines keep their line endings (a file object or str.splitlines(True)).
+    Text before the first H1 is yielded with an empty title, and only if it
+    is not blank.
+    '''
+    chapter_title, chapter_lines = '', []
+    fence = None  # the opening fence marker while inside a code block
+
+    for line in lines:
+        first = line.lstrip(' ')[:1]
+        if first in ('`', '~'):
+            match = FENCE_RE.match(line)
+            if match:
+                marker = match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence) and not line[match.end():].strip():
+                    fence = None
+        elif first == '#' and fence is None:
+            match = H1_RE.match(line.rstrip('\r\n'))
+            if match:
+                if chapter_title or any(l.strip() for l in chapter_lines):
+                    yield chapter_title, ''.join(chapter_lines)
+                chapter_title, chapter_lines = (match.group(1) or '').strip(), []
+                continue
+        chapter_lines.append(line)
+
+    if chapter_title or any(l.strip() for l in chapter_lines):
+        yield chapter_title, ''.join(chapter_lines)
+
+
+def heading_outline(chapter_html):
+    '''
+    Nested H2/H3 outline of one rendered chapter.
+
+    Returns [(h2_text, h2_id, [(h3_text, h3_id), ...]), ...]. An H3 that
+    comes before any H2 is listed at the top level with no children.
+    '''
+    outline = []
+    for level, anchor, inner in SUBHEADING_RE.findall(chapter_html):
+        text = unescape(TAG_RE.sub('', inner)).strip()
+        if level == '3' and outline:
+            outline[-1][2].append((text, anchor))
+        else:
+            outline.append((text, anchor, []))
+    return outline
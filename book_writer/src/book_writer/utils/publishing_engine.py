@@ -0,0 +1,84 @@
+# ============================================
+# FILE: src/book_writer/utils/publishing_engine.py
+# ============================================
+'''
+Reusable WeasyPrint context for rendering many PDFs in one process.
+
+Every `HTML(...).write_pdf()` without a font_config builds a new
+FontConfiguration (Fontconfig loads and scans every installed font) and every
+inline <style> block is parsed again. For the Bengali edition that also means
+resolving the 'Noto Sans Bengali' / 'Kalpurush' / 'SolaimanLipi' fallbacks
+from scratch each time. PublishingEngine pays those costs once:
+
+- one FontConfiguration, so the Pango font map and its font lookups are shared
+- the base stylesheet parsed with CSS() once per language
+- the small running-header stylesheet parsed once per title
+- one image cache shared by all documents
+
+WeasyPrint is not thread-safe, so use one engine per process (get_engine()).
+The publisher's worker processes each keep theirs across jobs.
+'''
+import time
+
+from book_writer.utils.book_converter import pdf_base_css, pdf_header_css
+
+
+class PublishingEngine:
+    '''Shared fonts and parsed stylesheets for PDF rendering'''
+
+    def __init__(self):
+        from weasyprint.text.fonts import FontConfiguration
+
+        start = time.perf_counter()
+        self.font_config = FontConfiguration()
+        self.setup_seconds = time.perf_counter() - start
+        self.image_cache = {}
+        self._base_css = {}
+        self._header_css = {}
+        self.documents = 0
+
+    def base_stylesheet(self, language):
+        if language not in self._base_css:
+            self._base_css[language] = self._parse(pdf_base_css(language))
+        return self._base_css[language]
+
+    def header_stylesheet(self, title):
+        if title not in self._header_css:
+            self._header_css[title] = self._parse(pdf_header_css(title))
+        return self._header_css[title]
+
+    def _parse(self, css):
+        from weasyprint import CSS
+
+        start = time.perf_counter()
+        stylesheet = CSS(string=css, font_config=self.font_config)
+        self.setup_seconds += time.perf_counter() - start
+        return stylesheet
+
+    def stylesheets(self, title, language):
+        return [self.base_stylesheet(language), self.header_stylesheet(title)]
+
+    def render(self, html, title, language):
+        '''Lay out an HTML string with the book's stylesheets; returns a WeasyPrint Document'''
+        from weasyprint import HTML
+
+        self.documents += 1
+        return HTML(string=html).render(
+            font_config=self.font_config,
+            stylesheets=self.stylesheets(title, language),
+            cache=self.image_cache,
+        )
+
+    def write_pdf(self, html, title, language, output_path):
+        self.render(html, title, language).write_pdf(output_path)
+
+
+_engine = None
+
+
+def get_engine():
+    '''The process-wide engine, created on first use'''
+    global _engine
+    if _engine is None:
+        _engine = PublishingEngine()
+    return _engine
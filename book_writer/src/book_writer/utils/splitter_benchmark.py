@@ -0,0 +1,87 @@
+# ============================================
+# FILE: src/book_writer/utils/splitter_benchmark.py
+# ============================================
+'''
+Chapter splitting: the old `split('# ')` scan vs the H1 splitter.
+
+Builds manuscripts of growing size (1, 4 and 16 MB by default) whose chapters
+contain ## / ### sections and a code block with '# ' comments, then times both
+approaches and counts the chapters each one finds.
+
+    uv run benchmark_splitter [mb ...]
+'''
+import sys
+import time
+
+from book_writer.utils.markdown_splitter import split_chapters
+
+CHAPTER = '''# Chapter {n}: Working With Models
+
+Large language models are changing how teams build software. Tag your notes #ml and move on.
+
+## Setting up
+
+Engineers who ship them learn to test, measure and iterate.
+
+### Installing the tools
+
+```bash
+# install the runtime
+pip install crewai
+# check it works
+crewai --version
+```
+
+## Measuring
+
+Every change gets a benchmark before it gets merged.
+
+'''
+
+
+def legacy_split(markdown_content):
+    '''The chapter split create_epub used before: every '# ' starts a chapter'''
+    chapters = []
+    for chapter_content in markdown_content.split('# ')[1:]:
+        chapter_title = chapter_content.split('\n')[0]
+        chapter_body = '\n'.join(chapter_content.split('\n')[1:])
+        chapters.append((chapter_title, chapter_body))
+    return chapters
+
+
+def manuscript(size_mb):
+    chapter_bytes = len(CHAPTER.encode('utf-8'))
+    count = max(1, int(size_mb * 1024 * 1024 / chapter_bytes))
+    return ''.join(CHAPTER.format(n=n) for n in range(1, count + 1)), count
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run():
+    '''
+    Time both splitters on synthetic manuscripts and print a report.
+    '''
+    sizes = [float(a) for a in sys.argv[1:]] or [1, 4, 16]
+
+    print("\n📊 Splitting manuscripts into chapters")
+    print("-" * 78)
+    print(f"{'size':>7}{'chapters':>10}{'split(# )':>12}{'found':>8}{'H1 splitter':>14}{'found':>8}{'MB/s':>9}")
+    for size_mb in sizes:
+        text, expected = manuscript(size_mb)
+        legacy_seconds, legacy = best_of(lambda: legacy_split(text))
+        new_seconds, chapters = best_of(lambda: list(split_chapters(text.splitlines(True))))
+        print(f"{size_mb:>5.0f}MB{expected:>10}{legacy_seconds:>11.3f}s{len(legacy):>8}"
+              f"{new_seconds:>13.3f}s{len(chapters):>8}{size_mb / new_seconds:>9.0f}")
+    print("-" * 78)
+    print("'found' should equal 'chapters'; split('# ') also cuts at ##, ### and code comments.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,206 @@
+# ============================================
+# FILE: src/book_writer/utils/translation_check.py
+# ============================================
+'''
+How much of the Bengali edition is actually in Bengali.
+
+Counts Bengali and Latin letters per chapter and per paragraph and flags the
+paragraphs that are still mostly English, so only those go back to the
+translator instead of re-running the whole translation.
+
+Counting works on the UTF-8 bytes, so it runs in C rather than one Python
+comparison per character: every Bengali code point (U+0980-U+09FF) encodes
+as E0 A6 xx or E0 A7 xx, and Latin letters are the ASCII A-Z / a-z bytes.
+'''
+import re
+from dataclasses import dataclass, field
+
+from book_writer.utils.markdown_splitter import FENCE_RE, H1_RE
+
+BENGALI_PREFIXES = (b'\xe0\xa6', b'\xe0\xa7')
+LATIN_LETTERS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+NOT_LATIN = bytes(b for b in range(256) if b not in LATIN_LETTERS)
+
+# Left out of the counts: inline code, link targets and bare URLs
+IGNORED_RE = re.compile(r'`[^`]*`|\]\([^)]*\)|https?://\S+')
+# Any ATX heading, '#' to '######'
+HEADING_RE = re.compile(r' {0,3}#{1,6}(?:[ \t]|$)')
+
+# A paragraph needs this many letters to be judged, and this share of Bengali to pass
+MIN_LETTERS = 12
+MIN_BENGALI_SHARE = 0.5
+
+
+def script_counts(text):
+    '''(bengali, latin) letter counts of a string'''
+    data = IGNORED_RE.sub(' ', text).encode('utf-8')
+    bengali = data.count(BENGALI_PREFIXES[0]) + data.count(BENGALI_PREFIXES[1])
+    latin = len(data.translate(None, NOT_LATIN))
+    return bengali, latin
+
+
+def bengali_share(bengali, latin):
+    return bengali / (bengali + latin) if bengali + latin else 0.0
+
+
+@dataclass
+class ParagraphCoverage:
+    ''' One paragraph; start/end are its line span in the file (end exclusive) '''
+    index: int
+    chapter: int
+    start: int
+    end: int
+    text: str
+    bengali: int
+    latin: int
+
+    @property
+    def share(self):
+        return bengali_share(self.bengali, self.latin)
+
+    @property
+    def untranslated(self):
+        return self.bengali + self.latin >= MIN_LETTERS and self.share < MIN_BENGALI_SHARE
+
+
+@dataclass
+class ChapterCoverage:
+    number: int
+    title: str
+    paragraphs: list = field(default_factory=list)
+
+    @property
+    def bengali(self):
+        return sum(p.bengali for p in self.paragraphs)
+
+    @property
+    def latin(self):
+        return sum(p.latin for p in self.paragraphs)
+
+    @property
+    def share(self):
+        return bengali_share(self.bengali, self.latin)
+
+    @property
+    def untranslated(self):
+        return [p for p in self.paragraphs if p.untranslated]
+
+
+@dataclass
+class TranslationReport:
+    chapters: list = field(default_factory=list)
+
+    @property
+    def paragraphs(self):
+        return [p for c in self.chapters for p in c.paragraphs]
+
+    @property
+    def bengali(self):
+        return sum(c.bengali for c in self.chapters)
+
+    @property
+    def latin(self):
+        return sum(c.latin for c in self.chapters)
+
+    @property
+    def share(self):
+        return bengali_share(self.bengali, self.latin)
+
+    @property
+    def has_bengali(self):
+        return self.bengali > 0
+
+    @property
+    def untranslated(self):
+        return [p for c in self.chapters for p in c.untranslated]
+
+    def print_report(self):
+        print("\n🔎 Translation coverage (Bengali share of letters)")
+        print("-" * 70)
+        for c in self.chapters:
+            flagged = len(c.untranslated)
+            status = '✅' if not flagged else '⚠️ '
+            print(f"{status} {c.number:>3}. {c.title[:42]:<42} {c.share:>6.0%}"
+                  f"  {flagged}/{len(c.paragraphs)} untranslated")
+        print("-" * 70)
+        print(f"Book: {self.share:.0%} Bengali, {len(self.untranslated)} of "
+              f"{len(self.paragraphs)} paragraphs need translating")
+
+
+def check_translation(lines):
+    '''
+    Build a TranslationReport from an iterable of markdown lines.
+
+    Paragraphs are blocks separated by blank lines. Headings count as their
+    own paragraph, and fenced code blocks are skipped.
+    '''
+    report = TranslationReport()
+    chapter = ChapterCoverage(0, '(front matter)')
+    block, block_start = [], 0
+    fence = None
+    count = 0
+
+    def close_block(end):
+        nonlocal count
+        text = ''.join(block)
+        if text.strip():
+            bengali, latin = script_counts(text)
+            chapter.paragraphs.append(ParagraphCoverage(count, chapter.number, block_start, end, text, bengali, latin))
+            count += 1
+        block.clear()
+
+    n = -1
+    for n, line in enumerate(lines):
+        match = FENCE_RE.match(line)
+        if match and (fence is None or (match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence))):
+            close_block(n)
+            fence = match.group(1) if fence is None else None
+            continue
+        if fence is not None:
+            continue
+
+        if not line.strip():
+            close_block(n)
+        elif HEADING_RE.match(line):
+            # A heading is a paragraph of its own
+            close_block(n)
+            h1 = H1_RE.match(line.rstrip('\r\n'))
+            if h1:
+                if chapter.number or chapter.paragraphs:
+                    report.chapters.append(chapter)
+                chapter = ChapterCoverage(chapter.number + 1, (h1.group(1) or '').strip())
+            block_start = n
+            block.append(line)
+            close_block(n + 1)
+        else:
+            if not block:
+                block_start = n
+            block.append(line)
+
+    close_block(n + 1)
+    if chapter.number or chapter.paragraphs:
+        report.chapters.append(chapter)
+    return report
+
+
+def check_translation_file(markdown_file):
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        return check_translation(f)
+
+
+def replace_paragraphs(markdown_file, report, replacements):
+    '''
+    Swap paragraphs in the file for new text.
+
+    replacements: {paragraph index: new text}, indexes from `report`, which
+    must have been built from the file as it is now. Spans are replaced from
+    the end of the file backwards so earlier line numbers stay valid.
+    '''
+    paragraphs = report.paragraphs
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    for index in sorted(replacements, key=lambda i: paragraphs[i].start, reverse=True):
+        paragraph = paragraphs[index]
+        lines[paragraph.start:paragraph.end] = [replacements[index].strip() + '\n']
+    with open(markdown_file, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
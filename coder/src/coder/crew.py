@@ -1,5 +1,7 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
  
 @CrewBase
 class Coder():
@@ -25,9 +27,9 @@ class Coder():
     @crew
     def crew(self) -> Crew:
         """Creates the Coder crew"""
-        return Crew(
+        return instrument(cache_llm_calls(Crew(
             agents=self.agents, 
             tasks=self.tasks,
             process=Process.sequential,
             verbose=True,
-        )
+        )), name=__package__)
@@ -3,7 +3,7 @@ import sys
 import warnings
 import os
 from datetime import datetime
-from coder.crew import Coder
+# The crew is imported by each entry point, so crewai loads only when one runs
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 # Create output directory if it doesn't exist
@@ -19,10 +19,46 @@ def run():
     inputs = {
         'assignment': assignment,
     }
+    from coder.crew import Coder
     
     result = Coder().crew().kickoff(inputs=inputs)
     print(result.raw)
 
 
+def benchmark():
+    """
+    Time the crew end to end against the local stub server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    """
+    from coder.crew import Coder
+    from crew_utils.crew_benchmark import run_benchmark
+
+    run_benchmark([('coder', Coder, {'assignment': assignment})])
+
+
+def benchmark_imports():
+    """
+    Check that importing coder.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
 
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('coder')
+
+
+def serve():
+    """
+    Serve the crew over HTTP: queued kickoff jobs, progress events, and the
+    code and its output for each job (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    """
+    from coder.crew import Coder
+    from crew_utils.crew_service import CrewService, run_service
 
+    service = CrewService()
+    service.register('coder', lambda: Coder().crew(), {'assignment': assignment})
+    run_service(service)
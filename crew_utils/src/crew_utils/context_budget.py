@@ -0,0 +1,248 @@
+"""
+Token budgets for the context passed between sequential tasks.
+
+A sequential crew hands every downstream task the full raw output of its
+upstream tasks, so prompts grow with every stage. compress_context(crew,
+tasks_config) puts a budget check in between. A task gets a budget from a
+`context_budget` key in tasks.yaml (in tokens):
+
+    reporting_task:
+      ...
+      context_budget: 3000
+
+When a task's context is over its budget, the budget is shared among its
+upstream outputs. Small outputs (an outline, say) pass whole, and only the
+large ones are cut down, in one of two ways (CONTEXT_COMPRESSION):
+
+- select (default): the output is split into sections, and the sections that
+  share the most words with the task's description are kept, in their
+  original order. The headings of the dropped sections are listed, so the
+  agent knows what was left out. No LLM call
+- summarize: the task's own LLM condenses the output to the budget, keeping
+  what the task needs. If that fails, select is used
+
+Tasks without a budget (say, one that edits a whole document) always get
+their full context. CONTEXT_BUDGET=0 turns every budget off, and
+CONTEXT_BUDGET=N gives tasks without a budget one of N tokens.
+
+After each run, the crew prints the context tokens of every task, what was
+passed on, and the tokens saved.
+"""
+import math
+import os
+import re
+
+from crewai.utilities.constants import NOT_SPECIFIED
+from crewai.utilities.formatter import DIVIDERS
+
+HEADING_RE = re.compile(r'^#{1,6}\s+\S')
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+WORD_RE = re.compile(r'\w{4,}')
+STOPWORDS = {
+    'this', 'that', 'with', 'from', 'your', 'have', 'will', 'should', 'each', 'into', 'they',
+    'their', 'them', 'then', 'than', 'what', 'when', 'which', 'make', 'sure', 'about', 'based',
+    'write', 'book', 'chapter', 'task', 'output', 'also', 'more', 'most', 'some', 'such',
+}
+
+_encoding = None
+
+
+def count_tokens(text):
+    """tiktoken's cl100k_base count, or about 4 characters per token without it"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            # Not installed, or its vocabulary can't be downloaded here
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+def keywords(text):
+    return {w for w in WORD_RE.findall(text.lower()) if w not in STOPWORDS}
+
+
+def split_blocks(text):
+    """Split at markdown headings (outside code fences), and at blank lines inside long blocks"""
+    blocks, current, in_fence = [], [], False
+    for line in text.splitlines(keepends=True):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        if not in_fence and HEADING_RE.match(line) and current:
+            blocks.append(''.join(current))
+            current = []
+        current.append(line)
+    if current:
+        blocks.append(''.join(current))
+    if len(blocks) > 1:
+        return blocks
+    # No headings: fall back to paragraphs
+    return [p + '\n\n' for p in re.split(r'\n\s*\n', text) if p.strip()]
+
+
+def block_title(block):
+    first = block.strip().splitlines()[0] if block.strip() else ''
+    return first.lstrip('#').strip()[:80]
+
+
+def select_sections(text, budget, query):
+    """The blocks of `text` most relevant to `query` that fit in `budget` tokens, in order"""
+    blocks = split_blocks(text)
+    wanted = keywords(query)
+    scored = []
+    for i, block in enumerate(blocks):
+        tokens = count_tokens(block)
+        overlap = len(keywords(block) & wanted)
+        # Earlier blocks win ties: introductions and key facts tend to come first
+        scored.append((overlap / math.sqrt(tokens + 1), -i, i, tokens))
+
+    ranked = [i for _, _, i, _ in sorted(scored, reverse=True)]
+    kept, used = [], 0
+    for i in ranked:
+        if used + scored[i][3] <= budget:
+            kept.append(i)
+            used += scored[i][3]
+    while True:
+        dropped = [t for t in (block_title(blocks[i]) for i in range(len(blocks)) if i not in kept) if t]
+        selected = ''.join(blocks[i] for i in sorted(kept)).rstrip()
+        if dropped:
+            more = f'; and {len(dropped) - 12} more' if len(dropped) > 12 else ''
+            selected += '\n\n[Left out to fit the context budget: ' + '; '.join(dropped[:12]) + more + ']'
+        # The note about what was left out has to fit too
+        if not kept or count_tokens(selected) <= budget:
+            return selected
+        kept.pop()
+
+
+def share_budget(sizes, budget):
+    """Split `budget` over outputs of `sizes` tokens: small ones whole, the rest evenly"""
+    shares = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for n, i in enumerate(order):
+        fair = remaining // (len(order) - n)
+        shares[i] = min(sizes[i], fair)
+        remaining -= shares[i]
+    return shares
+
+
+class ContextBudget:
+    """Per-task budgets, the compression, and the tokens-saved report for one crew"""
+
+    def __init__(self, budgets, method=None, default=None):
+        env = os.getenv('CONTEXT_BUDGET')
+        self.enabled = env != '0'
+        self.default = default if default is not None else (int(env) if env and env != '0' else None)
+        self.budgets = budgets
+        self.method = method or os.getenv('CONTEXT_COMPRESSION', 'select')
+        self.records = []
+
+    def copy_for(self, crew):
+        """The same budgets, with a report of their own, for a copy of the crew (crew_pool.py)"""
+        return ContextBudget(self.budgets, self.method, self.default)
+
+    def budget_for(self, task):
+        if not self.enabled:
+            return None
+        return self.budgets.get(task.name) or self.default
+
+    def compress(self, task, outputs):
+        """The context string for `task` from its upstream outputs, within its budget"""
+        if not outputs:
+            return ''
+        raws = [output.raw for output in outputs]
+        sizes = [count_tokens(raw) for raw in raws]
+        budget = self.budget_for(task)
+        # The dividers between outputs count too
+        overhead = count_tokens(DIVIDERS) * max(0, len(raws) - 1)
+        record = {'task': task.name, 'budget': budget, 'before': sum(sizes) + overhead, 'method': '-'}
+        if budget and record['before'] > budget:
+            query = f'{task.description}\n{task.expected_output}'
+            shares = share_budget(sizes, max(0, budget - overhead))
+            for i, (raw, size, share) in enumerate(zip(raws, sizes, shares)):
+                if size > share:
+                    raws[i], record['method'] = self.shrink(task, raw, share, query)
+        context = DIVIDERS.join(raws)
+        record['after'] = count_tokens(context)
+        self.records.append(record)
+        return context
+
+    def shrink(self, task, text, budget, query):
+        if self.method == 'summarize' and task.agent is not None:
+            try:
+                summary = task.agent.llm.call([{'role': 'user', 'content': (
+                    f'Condense the text below to at most {int(budget * 0.7)} words. Keep every fact, figure, '
+                    f'name and source that matters for this task, and drop the rest.\n\nTASK:\n{query}\n\n'
+                    f'TEXT:\n{text}'
+                )}])
+                if isinstance(summary, str) and summary.strip():
+                    if count_tokens(summary) <= budget:
+                        return summary.strip(), 'summarize'
+                    return select_sections(summary, budget, query), 'summarize+select'
+            except Exception as e:
+                print(f"⚠️  Summarizing context for {task.name} failed ({e}); selecting sections instead")
+        return select_sections(text, budget, query), 'select'
+
+    def report(self):
+        if not self.records:
+            return
+        print("\n📉 Context tokens per task")
+        print(f"  {'task':<24}{'budget':>8}{'upstream':>10}{'passed':>9}{'saved':>8}  method")
+        for r in self.records:
+            budget = r['budget'] or '-'
+            print(f"  {r['task']:<24}{budget:>8}{r['before']:>10}{r['after']:>9}"
+                  f"{r['before'] - r['after']:>8}  {r['method']}")
+        before = sum(r['before'] for r in self.records)
+        saved = before - sum(r['after'] for r in self.records)
+        share = f" ({saved / before:.0%})" if before else ''
+        print(f"  Tokens saved this run: {saved}{share}")
+        self.records = []
+
+    def attach(self, crew):
+        """Route `crew`'s context through this budget and report after each kickoff"""
+        if type(crew) not in _budgeted_classes.values():
+            crew.__class__ = _budgeted_class(type(crew))
+        crew._context_budget = self
+        crew.after_kickoff_callbacks.append(self.finish)
+        return crew
+
+    def finish(self, output):
+        self.report()
+        return output
+
+
+_budgeted_classes = {}
+
+
+def _budgeted_class(base):
+    """Subclass of a Crew class whose _get_context goes through the budget"""
+    if base not in _budgeted_classes:
+        def _get_context(self, task, task_outputs):
+            if not task.context:
+                return ''
+            if task.context is NOT_SPECIFIED:
+                outputs = task_outputs
+            else:
+                outputs = [t.output for t in task.context if t.output is not None]
+            return self._context_budget.compress(task, outputs)
+
+        _budgeted_classes[base] = type(f'Budgeted{base.__name__}', (base,), {'_get_context': _get_context})
+    return _budgeted_classes[base]
+
+
+def budgets_from_config(tasks_config):
+    """{task name: context_budget} from a tasks.yaml dict"""
+    return {
+        name: int(config['context_budget'])
+        for name, config in (tasks_config or {}).items()
+        if isinstance(config, dict) and config.get('context_budget')
+    }
+
+
+def compress_context(crew, tasks_config, method=None):
+    """Give `crew` the context budgets set in tasks_config (see the module docstring)"""
+    return ContextBudget(budgets_from_config(tasks_config), method).attach(crew)
@@ -0,0 +1,235 @@
+"""
+End-to-end crew benchmark against the local stub server.
+
+Each case builds a crew, points every agent at stub_server.py,
+runs a full kickoff `rounds` times and reports, from the run metrics of
+instrumentation.py:
+
+- wall time of the kickoff (best and median)
+- LLM calls, tool calls and tokens
+- framework overhead: the time spent neither waiting on an LLM nor in a
+  tool, in total and per task. With a stub that answers at once, this is
+  the cost of crewai and of this repo's own code
+- setup: the time to build the crew from scratch, and to copy it from a warm
+  template (crew_pool.py), which is what each kickoff runs on
+
+No API keys or network are needed, and the runs happen in a scratch
+directory, so output/ is left alone. Every result is appended to
+benchmarks/history.jsonl (BENCH_HISTORY) with the git commit it ran on,
+and compared with the last result for the same case and stub settings, so
+a change in overhead shows up between commits.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from .crew_pool import CrewPool, quiet
+from .instrumentation import instrument
+from .stub_server import StubServer, stub_environment, use_stub_models
+
+DEFAULT_HISTORY = os.path.join('benchmarks', 'history.jsonl')
+
+
+def git_commit(cwd):
+    """'<short hash>' or '<short hash>+dirty', or None outside git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                               capture_output=True, text=True).stdout.strip()
+        return f'{commit}+dirty' if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(records, wall):
+    """Totals and per-task overhead from one run's metrics records"""
+    llm = [r for r in records if r['kind'] == 'llm']
+    tools = [r for r in records if r['kind'] == 'tool']
+    result = {
+        'wall': wall,
+        'llm_calls': len(llm),
+        'tool_calls': len(tools),
+        'tokens': sum(r['total_tokens'] for r in llm),
+        'llm_seconds': sum(r['seconds'] for r in llm),
+        'tool_seconds': sum(r['seconds'] for r in tools),
+        'tasks': {},
+    }
+    result['overhead'] = max(0.0, wall - result['llm_seconds'] - result['tool_seconds'])
+    for task in (r for r in records if r['kind'] == 'task'):
+        waited = sum(r['seconds'] for r in llm + tools if r['task'] == task['task'])
+        result['tasks'][task['task']] = {
+            'wall': task['seconds'],
+            'llm_calls': task['llm_calls'],
+            'overhead': max(0.0, task['seconds'] - waited),
+        }
+    return result
+
+
+def run_case(name, make_crew_base, inputs, rounds, after_kickoff=None):
+    """Kick a copy of the case's crew off `rounds` times; returns one measure() dict per round"""
+    def build():
+        # The crew's own LLMs are swapped for the stub's, and instrumented again
+        return quiet(instrument(use_stub_models(make_crew_base().crew())))
+
+    pool = CrewPool({name: build}).warm()
+    runs = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        build()
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        crew = pool.crew(name)
+        copied = time.perf_counter() - start
+
+        start = time.perf_counter()
+        crew.kickoff(inputs=dict(inputs))
+        wall = time.perf_counter() - start
+        if after_kickoff:
+            after_kickoff()
+        metrics = getattr(crew, '_metrics', None)
+        runs.append({**measure(metrics.records if metrics else [], wall), 'build': built, 'copy': copied})
+        print(f"  {name} round {i + 1}/{rounds}: {wall:.2f}s, {runs[-1]['llm_calls']} LLM calls")
+    return runs
+
+
+def summarize(name, runs, settings, commit):
+    walls = [r['wall'] for r in runs]
+    overheads = [r['overhead'] for r in runs]
+    last = runs[-1]
+    tasks = {}
+    for task in last['tasks']:
+        values = [r['tasks'][task]['overhead'] for r in runs if task in r['tasks']]
+        tasks[task] = {
+            'wall': round(statistics.median(r['tasks'][task]['wall'] for r in runs if task in r['tasks']), 4),
+            'llm_calls': last['tasks'][task]['llm_calls'],
+            'overhead': round(statistics.median(values), 4),
+        }
+    return {
+        'case': name,
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        **settings,
+        'rounds': len(runs),
+        'wall_best': round(min(walls), 4),
+        'wall_median': round(statistics.median(walls), 4),
+        'overhead_median': round(statistics.median(overheads), 4),
+        'build_median': round(statistics.median(r['build'] for r in runs), 4),
+        'copy_median': round(statistics.median(r['copy'] for r in runs), 4),
+        'llm_calls': last['llm_calls'],
+        'tool_calls': last['tool_calls'],
+        'tokens': last['tokens'],
+        'tasks': tasks,
+    }
+
+
+def previous_result(history, result):
+    """The last result in the history file for the same case and stub settings"""
+    try:
+        with open(history, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get('case') == result['case'] and entry.get('latency') == result['latency']:
+            return entry
+    return None
+
+
+def append_result(history, result):
+    os.makedirs(os.path.dirname(os.path.abspath(history)), exist_ok=True)
+    with open(history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def change(now, before):
+    if not before:
+        return ''
+    return f" ({(now - before) / before:+.0%} vs {before:.3f})"
+
+
+def report(result, before):
+    since = f" since {before['commit']}" if before and before.get('commit') else ''
+    print(f"\n📊 {result['case']}: {result['rounds']} round(s), stub latency {result['latency']}s{since}")
+    print(f"  wall      best {result['wall_best']:.3f}s  median {result['wall_median']:.3f}s"
+          f"{change(result['wall_median'], before and before['wall_median'])}")
+    print(f"  overhead  median {result['overhead_median']:.3f}s"
+          f"{change(result['overhead_median'], before and before['overhead_median'])}")
+    if 'build_median' in result:
+        print(f"  setup     build {result['build_median']:.3f}s  warm copy {result['copy_median']:.3f}s"
+              f"  ({result['build_median'] - result['copy_median']:.3f}s saved per kickoff)")
+    print(f"  {result['llm_calls']} LLM calls, {result['tool_calls']} tool calls, {result['tokens']} tokens")
+    if result['tasks']:
+        print(f"  {'task':<34}{'wall s':>9}{'LLM calls':>11}{'overhead s':>12}")
+        for task, row in result['tasks'].items():
+            old = ((before or {}).get('tasks') or {}).get(task)
+            delta = f"  {row['overhead'] - old['overhead']:+.3f}" if old else ''
+            print(f"  {(task or '-')[:33]:<34}{row['wall']:>9.3f}{row['llm_calls']:>11}{row['overhead']:>12.3f}{delta}")
+
+
+def run_benchmark(cases, rounds=None, latency=None, after_kickoff=None):
+    """
+    Benchmark each (name, make_crew_base, inputs) case against a fresh stub server.
+
+    make_crew_base() returns a new @CrewBase instance; every agent of its
+    crew() is pointed at the stub before the kickoff. rounds and latency default to
+    sys.argv[1] and sys.argv[2] (3 rounds, no latency). after_kickoff() runs
+    after every kickoff, outside the timed wall, while the stub is still up
+    (e.g. to flush work the crew left in the background).
+    """
+    rounds = rounds or (int(sys.argv[1]) if len(sys.argv) > 1 else 3)
+    latency = latency if latency is not None else (float(sys.argv[2]) if len(sys.argv) > 2 else 0.0)
+    history = os.path.abspath(os.getenv('BENCH_HISTORY') or DEFAULT_HISTORY)
+    commit = git_commit(os.getcwd())
+    home = os.getcwd()
+
+    results = []
+    with StubServer(latency=latency) as server:
+        env = {
+            **stub_environment(server.url),
+            'CREW_METRICS': '1',
+            'CREWAI_DISABLE_TELEMETRY': 'true',
+            'CREWAI_TRACING_ENABLED': 'false',
+            'OTEL_SDK_DISABLED': 'true',
+            'CREW_METRICS_FILE': os.path.join(tempfile.gettempdir(), f'bench_metrics_{os.getpid()}.jsonl'),
+        }
+        saved = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        # Keep the crews' output files out of the project
+        os.chdir(tempfile.mkdtemp(prefix='crew_bench_'))
+        try:
+            for name, make_crew_base, inputs in cases:
+                print(f"\n⏱️  Benchmarking {name}...")
+                try:
+                    runs = run_case(name, make_crew_base, inputs, rounds, after_kickoff)
+                except Exception as e:
+                    print(f"⚠️  {name} failed: {type(e).__name__}: {e}")
+                    continue
+                result = summarize(name, runs, {'latency': latency}, commit)
+                before = previous_result(history, result)
+                report(result, before)
+                append_result(history, result)
+                results.append(result)
+        finally:
+            os.chdir(home)
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        pushes = f", {server.counts['push']} push notifications" if server.counts['push'] else ''
+        print(f"\n🧪 Stub served {server.counts['chat']} chat calls, {server.counts['search']} searches{pushes}; "
+              f"results appended to {history}")
+    return results
@@ -0,0 +1,172 @@
+"""
+Warm crew pool: build each crew once, kick off cheap copies of it.
+
+Building a crew from its @CrewBase class parses agents.yaml and tasks.yaml,
+creates every tool and LLM client, and sets up memory storage. That is
+about 0.1s a crew, and a long-running process (a batch runner, a service)
+would otherwise pay it on every kickoff. A CrewPool builds each crew once as
+a template and hands out a copy of it per kickoff:
+
+    pool = CrewPool({'research': lambda: Researcher().crew()})
+    pool.crew('research').kickoff(inputs=...)
+
+A copy comes from crewai's Crew.copy(), so it gets new agents and tasks
+that share the template's LLM clients and tools, and deep copies of its
+memory objects. On top of that, each copied task runs on the clone of its
+own template agent (Task.copy() would pick the first agent with the same
+role), and the copy keeps the template's crew class and gets run metrics,
+a context budget and LLM token counters of its own. Copies take a few milliseconds,
+are independent of each other (run them on as many threads as you like)
+and are thrown away after their kickoff. The template is never kicked off.
+
+Inputs still vary per kickoff, and output files can follow them through
+placeholders in output_file (e.g. '{output_dir}/report.md').
+
+pool.report() prints, per crew, the build time, the copy time and the
+setup time saved by not building every kickoff's crew from scratch.
+"""
+import threading
+import time
+
+from .instrumentation import instrument
+
+# Per-crew helpers set by instrument() and compress_context(); a copy needs its own
+PER_CREW_HELPERS = ('_metrics', '_context_budget')
+
+
+def _rebind(callback, helpers):
+    """The same method of the copy's helper, for a callback bound to one of the template's"""
+    owner = getattr(callback, '__self__', None)
+    if id(owner) in helpers:
+        return getattr(helpers[id(owner)], callback.__name__)
+    return callback
+
+
+def _all_agents(crew):
+    """The crew's agents, its manager and agents only reachable through a task, each once"""
+    agents = list(crew.agents) + ([crew.manager_agent] if crew.manager_agent else [])
+    agents += [task.agent for task in crew.tasks if task.agent]
+    return list({id(agent): agent for agent in agents}.values())
+
+
+def _repoint_task_agents(template, crew):
+    """
+    Give every copied task the clone of its own template agent.
+
+    Task.copy() looks agents up by role, so two agents with one role (the
+    proposing and opposing debaters) end up sharing one clone, and an agent
+    that is only set on a task gets none of its own.
+    """
+    clones = {id(original): clone for original, clone in zip(template.agents, crew.agents)}
+    if template.manager_agent and crew.manager_agent:
+        clones[id(template.manager_agent)] = crew.manager_agent
+    for original, task in zip(template.tasks, crew.tasks):
+        if original.agent is None:
+            continue
+        if id(original.agent) not in clones:
+            clones[id(original.agent)] = original.agent.copy()
+        task.agent = clones[id(original.agent)]
+
+
+def _fresh_token_counters(crew):
+    # A shallow copy of an LLM shares the template's counters, and the run metrics read them
+    for agent in _all_agents(crew):
+        for llm in (agent.llm, getattr(agent, 'function_calling_llm', None)):
+            usage = getattr(llm, '_token_usage', None)
+            if isinstance(usage, dict):
+                llm._token_usage = dict.fromkeys(usage, 0)
+
+
+def quiet(crew):
+    """Turn off the crew's and its agents' console output"""
+    crew.verbose = False
+    for agent in _all_agents(crew):
+        agent.verbose = False
+    return crew
+
+
+def copy_crew(template):
+    """A copy of a built crew that can be kicked off on its own (see the module docstring)"""
+    crew = template.copy()
+    # Crew.copy() builds a plain Crew; keep subclasses such as the context budget's
+    crew.__class__ = type(template)
+    _repoint_task_agents(template, crew)
+
+    helpers = {}
+    for name in PER_CREW_HELPERS:
+        helper = getattr(template, name, None)
+        if helper is not None:
+            helpers[id(helper)] = fresh = helper.copy_for(crew)
+            setattr(crew, name, fresh)
+    crew.before_kickoff_callbacks = [_rebind(c, helpers) for c in crew.before_kickoff_callbacks]
+    crew.after_kickoff_callbacks = [_rebind(c, helpers) for c in crew.after_kickoff_callbacks]
+
+    _fresh_token_counters(crew)
+    # Points the copied LLMs and tasks at the copy's own run metrics
+    return instrument(crew)
+
+
+class CrewPool:
+    """Crew templates by name, each built on first use, and the setup time their copies saved"""
+
+    def __init__(self, builders=None):
+        self.builders = dict(builders or {})
+        self.templates = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def register(self, name, build):
+        """Add a crew; `build()` returns a new crew, e.g. lambda: Researcher().crew()"""
+        with self.lock:
+            self.builders[name] = build
+            self.templates.pop(name, None)
+        return self
+
+    def template(self, name):
+        with self.lock:
+            if name not in self.templates:
+                start = time.perf_counter()
+                self.templates[name] = self.builders[name]()
+                self.stats[name] = {'build': time.perf_counter() - start, 'copies': 0, 'copy': 0.0}
+            return self.templates[name]
+
+    def warm(self, *names):
+        """Build the templates now (all of them by default), so the first kickoff doesn't wait"""
+        for name in names or list(self.builders):
+            self.template(name)
+        return self
+
+    def crew(self, name):
+        """A fresh copy of the `name` crew, for one kickoff"""
+        template = self.template(name)
+        start = time.perf_counter()
+        crew = copy_crew(template)
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.stats[name]['copies'] += 1
+            self.stats[name]['copy'] += seconds
+        return crew
+
+    def kickoff(self, name, inputs=None):
+        return self.crew(name).kickoff(inputs=inputs)
+
+    def summary(self):
+        """Per crew: build and mean copy seconds, copies made, and setup seconds saved"""
+        with self.lock:
+            stats = {name: dict(s) for name, s in self.stats.items()}
+        summary = {}
+        for name, s in stats.items():
+            copy = s['copy'] / s['copies'] if s['copies'] else 0.0
+            summary[name] = {
+                'build_seconds': round(s['build'], 4),
+                'copy_seconds': round(copy, 4),
+                'copies': s['copies'],
+                # Without the pool each kickoff builds its crew; with it, one build plus the copies
+                'saved_seconds': round((s['copies'] - 1) * s['build'] - s['copy'], 3) if s['copies'] else 0.0,
+            }
+        return summary
+
+    def report(self):
+        for name, s in self.summary().items():
+            print(f"♻️  Crew pool {name}: built once in {s['build_seconds']:.3f}s, {s['copies']} copies at "
+                  f"{s['copy_seconds'] * 1000:.1f} ms, {s['saved_seconds']:.2f}s of setup saved")
@@ -0,0 +1,543 @@
+"""
+HTTP service for a project's crews: queued kickoff jobs, live progress
+and the files each job produces.
+
+main.py registers the crews and runs it (uvicorn serves the ASGI app):
+
+    uv run serve_crew [--host 127.0.0.1] [--port 8000] [--workers 2] [--queue 16]
+
+    GET    /crews                        the registered crews and their default inputs
+    POST   /crews/<name>/jobs            queue a kickoff: {"inputs": {...}} (merged over the
+                                         defaults), optionally "trigger": {...}, which is passed
+                                         on as the crewai_trigger_payload input
+                                         -> 202 and the job, or 429 + Retry-After if the queue is full
+    GET    /jobs                         every job still in memory, newest first
+    GET    /jobs/<id>                    status, timings, result, error and artifact names
+    GET    /jobs/<id>/events             server-sent events: queued, started, task_started,
+                                         llm_call, task_completed, task_failed, then one of
+                                         done, failed or cancelled. Past events are replayed
+                                         first (or those after Last-Event-ID)
+    GET    /jobs/<id>/artifacts/<name>   a file the job wrote (report.md, decide.md, a PDF, ...)
+    DELETE /jobs/<id>                    cancel: a queued job is dropped, a running one stops
+                                         at its next LLM call
+    GET    /metrics                      queue depth, jobs per status, and p50/p99 of the queue
+                                         wait, run time and total latency per crew
+    GET    /health
+
+Each crew is built once and every job runs on its own copy (crew_pool.py),
+on at most `workers` threads. Jobs beyond that wait in a queue of `queue`
+places, and further submissions are turned away with 429 until one frees
+up. A job's output files are written to output/jobs/<id>/ instead of the
+crew's usual paths, so concurrent jobs never overwrite each other.
+"""
+import argparse
+import asyncio
+import json
+import math
+import mimetypes
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict, deque
+from datetime import datetime
+
+from crewai.hooks import register_before_llm_call_hook, unregister_before_llm_call_hook
+
+from .crew_pool import CrewPool, quiet
+
+DEFAULT_JOBS_DIR = os.path.join('output', 'jobs')
+FINISHED = ('done', 'failed', 'cancelled')
+MAX_BODY = 1024 * 1024
+MAX_JOBS = 1000
+LATENCY_SAMPLES = 1000
+
+mimetypes.add_type('text/markdown', '.md')
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def percentile(values, p):
+    """Nearest-rank percentile, or None without values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 3)
+
+
+def excerpt(text, limit=280):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= limit else text[:limit].rsplit(' ', 1)[0] + '…'
+
+
+class Job:
+    """One kickoff request, its progress events and its outcome"""
+
+    def __init__(self, crew, inputs, jobs_dir):
+        self.id = uuid.uuid4().hex[:12]
+        self.crew = crew
+        self.inputs = inputs
+        self.dir = os.path.join(jobs_dir, self.id)
+        self.status = 'queued'
+        self.submitted = time.time()
+        self.started = self.finished = None
+        self.result = self.error = None
+        self.artifacts = []
+        self.cancel_requested = False
+        self.events = []
+        self.lock = threading.Lock()
+
+    def emit(self, event, **data):
+        with self.lock:
+            self.events.append({'event': event, 'time': datetime.now().isoformat(timespec='milliseconds'), **data})
+
+    def events_since(self, index):
+        with self.lock:
+            return self.events[index:]
+
+    def to_dict(self):
+        def stamp(t):
+            return datetime.fromtimestamp(t).isoformat(timespec='seconds') if t else None
+
+        return {
+            'id': self.id,
+            'crew': self.crew,
+            'status': self.status,
+            'inputs': self.inputs,
+            'submitted_at': stamp(self.submitted),
+            'started_at': stamp(self.started),
+            'finished_at': stamp(self.finished),
+            'queue_seconds': round(self.started - self.submitted, 3) if self.started else None,
+            'run_seconds': round(self.finished - self.started, 3) if self.finished and self.started else None,
+            'result': self.result,
+            'error': self.error,
+            'artifacts': self.artifacts,
+            'events': f'/jobs/{self.id}/events',
+        }
+
+
+_progress_classes = {}
+
+
+def _progress_task_class(base):
+    """Subclass of a Task class that reports its start and end to its job, and stops a cancelled one"""
+    if base not in _progress_classes:
+        def _execute_core(self, agent, context, tools):
+            job = self._job
+            if job.cancel_requested:
+                raise JobCancelled(f'job {job.id} was cancelled')
+            role = (getattr(agent or self.agent, 'role', None) or '').strip() or None
+            job.emit('task_started', task=self.name, agent=role)
+            start = time.perf_counter()
+            try:
+                output = base._execute_core(self, agent, context, tools)
+            except Exception as e:
+                job.emit('task_failed', task=self.name, agent=role, error=f'{type(e).__name__}: {e}')
+                raise
+            job.emit('task_completed', task=self.name, agent=role,
+                     seconds=round(time.perf_counter() - start, 3), output=excerpt(output.raw),
+                     file=os.path.basename(self.output_file) if self.output_file else None)
+            return output
+
+        _progress_classes[base] = type(f'Progress{base.__name__}', (base,), {'_execute_core': _execute_core})
+    return _progress_classes[base]
+
+
+class CrewService:
+    """Registered crews, the bounded job queue, the worker threads and the latency figures"""
+
+    def __init__(self, workers=2, queue_size=16, jobs_dir=DEFAULT_JOBS_DIR):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs_dir = jobs_dir
+        self.pool = CrewPool()
+        self.specs = {}
+        self.jobs = OrderedDict()
+        self.pending = deque()
+        self.running = {}
+        self.rejected = 0
+        self.latencies = defaultdict(lambda: {k: deque(maxlen=LATENCY_SAMPLES) for k in ('queue', 'run', 'total')})
+        self.cond = threading.Condition()
+        self.threads = []
+        self.stopping = False
+
+    def register(self, name, build, inputs=None, after=None):
+        """
+        Serve the crew `build()` returns under `name`.
+
+        `inputs` (a dict, or a function returning one) are the defaults a job's
+        inputs are merged over. `after(output, job_dir, inputs)` runs once the
+        kickoff is done, to add files of its own (the book's PDFs, say).
+        """
+        self.pool.register(name, build)
+        self.specs[name] = {'inputs': inputs, 'after': after}
+        return self
+
+    def default_inputs(self, name):
+        inputs = self.specs[name]['inputs']
+        return dict((inputs() if callable(inputs) else inputs) or {})
+
+    def start(self):
+        with self.cond:
+            if self.threads:
+                return self
+            self.stopping = False
+            for i in range(max(1, self.workers)):
+                thread = threading.Thread(target=self._work, name=f'crew-worker-{i + 1}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+        register_before_llm_call_hook(self._before_llm_call)
+        for name in self.specs:
+            try:
+                self.pool.template(name)
+            except Exception as e:
+                # Its jobs will try again, and fail with this error if it persists
+                print(f"⚠️  Could not build the {name} crew: {type(e).__name__}: {e}")
+        return self
+
+    def stop(self):
+        with self.cond:
+            self.stopping = True
+            for job in self.pending:
+                self._finish(job, 'cancelled', error='service stopped')
+            self.pending.clear()
+            for job in self.running.values():
+                job.cancel_requested = True
+            self.cond.notify_all()
+        unregister_before_llm_call_hook(self._before_llm_call)
+        for thread in self.threads:
+            thread.join(timeout=5)
+        self.threads = []
+
+    def submit(self, name, inputs=None, trigger=None):
+        """Queue a kickoff of crew `name`; raises KeyError or QueueFull"""
+        if name not in self.specs:
+            raise KeyError(name)
+        inputs = {**self.default_inputs(name), **(inputs or {})}
+        if trigger is not None:
+            inputs['crewai_trigger_payload'] = trigger
+        job = Job(name, inputs, self.jobs_dir)
+        with self.cond:
+            if len(self.pending) >= self.queue_size:
+                self.rejected += 1
+                raise QueueFull(name)
+            self.jobs[job.id] = job
+            self._forget_old_jobs()
+            self.pending.append(job)
+            job.emit('queued', position=len(self.pending))
+            self.cond.notify()
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a job; returns it, or None if there is no such job"""
+        with self.cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            if job in self.pending:
+                self.pending.remove(job)
+                self._finish(job, 'cancelled')
+            else:
+                job.cancel_requested = True
+                job.status = 'cancelling'
+                job.emit('cancelling')
+        return job
+
+    def list_jobs(self):
+        """Every job still in memory, newest first"""
+        with self.cond:
+            return list(reversed(self.jobs.values()))
+
+    def retry_after(self):
+        """Seconds until a place in the queue is likely to free up"""
+        runs = [s for crew in self.latencies.values() for s in crew['run']]
+        median = percentile(runs, 50) or 5
+        return max(1, math.ceil(median / max(1, self.workers)))
+
+    def metrics(self):
+        jobs = self.list_jobs()
+        with self.cond:
+            queued, running = len(self.pending), len(self.running)
+            latencies = {name: {k: list(v) for k, v in crew.items()} for name, crew in self.latencies.items()}
+        crews = {}
+        for name in self.specs:
+            samples = latencies.get(name, {'queue': [], 'run': [], 'total': []})
+            crews[name] = {'jobs': sum(j.crew == name for j in jobs)}
+            for kind, values in samples.items():
+                crews[name][f'{kind}_seconds'] = {'p50': percentile(values, 50), 'p99': percentile(values, 99),
+                                                  'samples': len(values)}
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'queued': queued,
+            'running': running,
+            'rejected': self.rejected,
+            'jobs': dict(Counter(j.status for j in jobs)),
+            'crews': crews,
+            'pool': self.pool.summary(),
+        }
+
+    def _forget_old_jobs(self):
+        # Finished jobs beyond MAX_JOBS are dropped from memory; their files stay
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= MAX_JOBS:
+                break
+            if self.jobs[job_id].status in FINISHED:
+                del self.jobs[job_id]
+
+    def _work(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.stopping:
+                    self.cond.wait()
+                if self.stopping:
+                    return
+                job = self.pending.popleft()
+                job.status = 'running'
+                job.started = time.time()
+                self.running[job.id] = job
+            self._run(job)
+
+    def _run(self, job):
+        job.emit('started')
+        print(f"▶️  Job {job.id} ({job.crew}) started")
+        try:
+            crew = self._prepare(self.pool.crew(job.crew), job)
+            output = crew.kickoff(inputs=dict(job.inputs))
+            if job.cancel_requested:
+                raise JobCancelled(f'job {job.id} was cancelled')
+            after = self.specs[job.crew]['after']
+            if after:
+                after(output, job.dir, job.inputs)
+            job.result = output.raw
+            status, error = 'done', None
+        except Exception as e:
+            status = 'cancelled' if job.cancel_requested else 'failed'
+            error = None if status == 'cancelled' else f'{type(e).__name__}: {e}'
+        with self.cond:
+            self.running.pop(job.id, None)
+            self._finish(job, status, error)
+
+    def _prepare(self, crew, job):
+        """Quiet the copy, send its output files to the job's directory, and hook up progress and cancelling"""
+        os.makedirs(job.dir, exist_ok=True)
+        quiet(crew)
+        crew._job = job
+        for task in crew.tasks:
+            if task.output_file:
+                task.output_file = os.path.join(job.dir, os.path.basename(task.output_file))
+            if type(task) not in _progress_classes.values():
+                task.__class__ = _progress_task_class(type(task))
+            task._job = job
+        return crew
+
+    def _finish(self, job, status, error=None):
+        # Called with self.cond held
+        job.status, job.error = status, error
+        job.finished = time.time()
+        if os.path.isdir(job.dir):
+            job.artifacts = sorted(
+                os.path.relpath(os.path.join(root, name), job.dir).replace(os.sep, '/')
+                for root, _, names in os.walk(job.dir) for name in names
+            )
+        if status != 'cancelled' and job.started:
+            samples = self.latencies[job.crew]
+            samples['queue'].append(job.started - job.submitted)
+            samples['run'].append(job.finished - job.started)
+            samples['total'].append(job.finished - job.submitted)
+        job.emit(status, error=error, seconds=round(job.finished - job.submitted, 3), artifacts=job.artifacts)
+        icon = {'done': '✅', 'failed': '❌', 'cancelled': '🛑'}[status]
+        print(f"{icon} Job {job.id} ({job.crew}) {status} after {job.finished - job.submitted:.1f}s"
+              + (f": {error}" if error else ''))
+
+    def _before_llm_call(self, context):
+        """Global crewai hook: a progress event per LLM call, and no more calls for a cancelled job"""
+        job = getattr(getattr(context, 'crew', None), '_job', None)
+        if job is None:
+            return None
+        if job.cancel_requested:
+            return False
+        job.emit('llm_call', agent=(getattr(context.agent, 'role', None) or '').strip() or None,
+                 task=getattr(context.task, 'name', None), iteration=context.iterations)
+        return None
+
+
+async def _respond(send, status, body, content_type='application/json', headers=()):
+    if not isinstance(body, bytes):
+        body = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status, 'headers': [
+        (b'content-type', content_type.encode()), (b'content-length', str(len(body)).encode()),
+        *[(k.encode(), str(v).encode()) for k, v in headers],
+    ]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY:
+            return None
+        if not message.get('more_body'):
+            return body
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class ServiceApp:
+    """The ASGI application in front of a CrewService"""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+        # Servers without lifespan support start the workers on the first request
+        if not self.service.threads:
+            await asyncio.to_thread(self.service.start)
+        method = scope['method']
+        parts = [p for p in scope['path'].split('/') if p]
+        try:
+            await self.route(method, parts, scope, receive, send)
+        except Exception as e:
+            await _respond(send, 500, {'error': f'{type(e).__name__}: {e}'})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await asyncio.to_thread(self.service.start)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await asyncio.to_thread(self.service.stop)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def route(self, method, parts, scope, receive, send):
+        service = self.service
+        if parts == ['health'] and method == 'GET':
+            return await _respond(send, 200, {'status': 'ok'})
+        if parts == ['metrics'] and method == 'GET':
+            return await _respond(send, 200, service.metrics())
+        if parts == ['crews'] and method == 'GET':
+            return await _respond(send, 200, {name: {'inputs': service.default_inputs(name)}
+                                              for name in service.specs})
+        if len(parts) == 3 and parts[0] == 'crews' and parts[2] == 'jobs' and method == 'POST':
+            return await self.submit(parts[1], receive, send)
+        if parts == ['jobs'] and method == 'GET':
+            return await _respond(send, 200, [job.to_dict() for job in service.list_jobs()])
+        if len(parts) >= 2 and parts[0] == 'jobs':
+            job = service.jobs.get(parts[1])
+            if job is None:
+                return await _respond(send, 404, {'error': f'no job {parts[1]}'})
+            if len(parts) == 2 and method == 'GET':
+                return await _respond(send, 200, job.to_dict())
+            if len(parts) == 2 and method == 'DELETE':
+                job = service.cancel(job.id)
+                status = 409 if job.status in ('done', 'failed') else 202
+                return await _respond(send, status, job.to_dict())
+            if parts[2:] == ['events'] and method == 'GET':
+                return await self.stream(job, scope, receive, send)
+            if len(parts) >= 4 and parts[2] == 'artifacts' and method == 'GET':
+                return await self.artifact(job, '/'.join(parts[3:]), send)
+        return await _respond(send, 404, {'error': 'not found'})
+
+    async def submit(self, name, receive, send):
+        body = await _read_body(receive)
+        if body is None:
+            return await _respond(send, 413, {'error': f'request body over {MAX_BODY} bytes'})
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return await _respond(send, 400, {'error': 'body is not valid JSON'})
+        if not isinstance(payload, dict):
+            return await _respond(send, 400, {'error': 'body must be a JSON object'})
+        inputs = payload.get('inputs', {k: v for k, v in payload.items() if k != 'trigger'})
+        try:
+            job = self.service.submit(name, inputs, payload.get('trigger'))
+        except KeyError:
+            return await _respond(send, 404, {'error': f'no crew {name}', 'crews': list(self.service.specs)})
+        except QueueFull:
+            return await _respond(send, 429, {'error': 'the job queue is full, try again later'},
+                                  headers=[('retry-after', self.service.retry_after())])
+        return await _respond(send, 202, job.to_dict(), headers=[('location', f'/jobs/{job.id}')])
+
+    async def stream(self, job, scope, receive, send):
+        headers = dict(scope.get('headers') or [])
+        last = headers.get(b'last-event-id', b'').decode()
+        index = int(last) + 1 if last.isdigit() else 0
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'),
+        ]})
+        # The stream ends when the client goes away, not only when the job finishes
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            await self._send_events(job, index, send, disconnected)
+        finally:
+            disconnected.cancel()
+
+    async def _send_events(self, job, index, send, disconnected):
+        idle = 0.0
+        while not disconnected.done():
+            events = job.events_since(index)
+            for event in events:
+                data = json.dumps(event, ensure_ascii=False, default=str)
+                message = f"id: {index}\nevent: {event['event']}\ndata: {data}\n\n"
+                await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+                index += 1
+                if event['event'] in FINISHED:
+                    await send({'type': 'http.response.body', 'body': b''})
+                    return
+            idle = 0.0 if events else idle + 0.25
+            if idle >= 15:
+                # Keeps proxies from closing an idle stream
+                await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                idle = 0.0
+            await asyncio.wait([disconnected], timeout=0.25)
+
+    async def artifact(self, job, name, send):
+        if name not in job.artifacts:
+            return await _respond(send, 404, {'error': f'no artifact {name}', 'artifacts': job.artifacts})
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/json':
+            content_type += '; charset=utf-8'
+        body = await asyncio.to_thread(_read_file, os.path.join(job.dir, name))
+        return await _respond(send, 200, body, content_type)
+
+
+def run_service(service, argv=None):
+    """Parse --host/--port/--workers/--queue from argv and serve `service` until interrupted"""
+    parser = argparse.ArgumentParser(description="HTTP service for a project's crews")
+    parser.add_argument('--host', default=os.getenv('SERVICE_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('SERVICE_PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=service.workers, help="Jobs run at the same time")
+    parser.add_argument('--queue', type=int, default=service.queue_size, help="Jobs waiting before 429s")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    service.workers, service.queue_size = args.workers, args.queue
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is needed to serve the crews: uv add uvicorn")
+        return
+    print(f"🌐 Serving {', '.join(service.specs)} on http://{args.host}:{args.port} "
+          f"({args.workers} workers, {args.queue} queued at most)")
+    uvicorn.run(ServiceApp(service), host=args.host, port=args.port, log_level='warning')
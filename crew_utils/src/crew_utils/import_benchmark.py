@@ -0,0 +1,172 @@
+"""
+Import-time guard for the CLI entry points.
+
+Every pyproject script of a crew starts by importing <package>.main. The
+crew behind it loads crewai, crewai_tools, litellm and pydantic, which take
+seconds, so main.py imports them inside the entry point that needs them,
+after its arguments are checked. This benchmark keeps it that way: it imports
+<package>.main in a fresh interpreter under `python -X importtime`, `rounds`
+times, and fails (exit 1) if
+
+- any of HEAVY_MODULES was imported; the report names the import chain
+  that pulled it in, e.g. crewai <- researcher.crew <- researcher.main
+  (modules of the crew's package and of crew_utils are kept in the chain)
+- the median import time is over the budget (IMPORT_BUDGET_MS, 300 ms)
+
+It also prints the slowest imports and appends the result to
+benchmarks/history.jsonl (BENCH_HISTORY), next to the crew benchmarks,
+with the change since the last run.
+
+    uv run benchmark_imports [rounds] [budget_ms]
+"""
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from .crew_benchmark import DEFAULT_HISTORY, append_result, git_commit
+
+# Packages an entry point may load once it runs, but not before
+HEAVY_MODULES = (
+    'crewai', 'crewai_tools', 'litellm', 'pydantic', 'openai', 'anthropic', 'tiktoken',
+    'chromadb', 'langchain', 'weasyprint', 'ebooklib', 'markdown2', 'lxml', 'pypdf',
+)
+DEFAULT_BUDGET_MS = 300
+TOP = 10
+
+# import time:  self [us] | cumulative | imported package
+LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def source_root(package):
+    """The directory `package` is imported from, without importing it"""
+    spec = importlib.util.find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        raise RuntimeError(f"{package} is not an importable package")
+    return os.path.dirname(os.path.abspath(list(spec.submodule_search_locations)[0]))
+
+
+def measure_imports(module):
+    """(depth, module, self us, cumulative us) per import, in `python -X importtime` order"""
+    package = module.split('.')[0]
+    env = dict(os.environ)
+    # The same sources as this process, and no model cost map download if litellm does get imported
+    paths = dict.fromkeys((source_root(package), source_root(__package__), env.get('PYTHONPATH')))
+    env['PYTHONPATH'] = os.pathsep.join(p for p in paths if p)
+    env.setdefault('LITELLM_LOCAL_MODEL_COST_MAP', 'True')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative, indent, name = match.groups()
+            imports.append((len(indent) // 2, name, int(self_us), int(cumulative)))
+    return imports
+
+
+def import_chain(imports, index, package):
+    """
+    The heavy package imported at `index`, then the modules of `package` and
+    crew_utils that led to it, innermost first: e.g. ['crewai', 'researcher.crew', 'researcher.main']
+    """
+    root = imports[index][1].split('.')[0]
+    chain, depth = [imports[index][1]], imports[index][0]
+    # importtime prints a module after everything it imported
+    for entry in imports[index + 1:]:
+        if entry[0] < depth:
+            chain.append(entry[1])
+            depth = entry[0]
+    outermost = max(i for i, name in enumerate(chain) if name.split('.')[0] == root)
+    own = (package, __package__)
+    return [root] + [name for name in chain[outermost + 1:] if name.split('.')[0] in own]
+
+
+def heavy_imports(imports, package):
+    """{heavy package: import chain} for each HEAVY_MODULES package that was imported"""
+    found = {}
+    for index, (depth, name, _, _) in enumerate(imports):
+        root = name.split('.')[0]
+        if root in HEAVY_MODULES and root not in found:
+            found[root] = import_chain(imports, index, package)
+    return found
+
+
+def total_ms(imports):
+    return sum(cumulative for depth, _, _, cumulative in imports if depth == 0) / 1000
+
+
+def previous_total(history, case):
+    """The last total_ms in the history file for `case`"""
+    try:
+        with open(history, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get('case') == case and 'total_ms' in entry:
+            return entry['total_ms']
+    return None
+
+
+def run(package):
+    """
+    Import <package>.main under -X importtime and fail on heavy imports or an
+    import time over budget; the crew's benchmark_imports script calls this.
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else float(os.getenv('IMPORT_BUDGET_MS') or DEFAULT_BUDGET_MS)
+    module = f'{package}.main'
+    history = os.path.abspath(os.getenv('BENCH_HISTORY') or DEFAULT_HISTORY)
+
+    print(f"⏱️  Importing {module} {rounds} times under -X importtime...")
+    runs = [measure_imports(module) for _ in range(rounds)]
+    totals = [total_ms(imports) for imports in runs]
+    median = statistics.median(totals)
+    # The run closest to the median, for the slowest-imports table
+    imports = runs[totals.index(min(totals, key=lambda t: abs(t - median)))]
+    heavy = heavy_imports(imports, package)
+
+    result = {
+        'case': f'imports {module}',
+        'commit': git_commit(os.getcwd()),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'rounds': rounds,
+        'total_ms': round(median, 1),
+        'best_ms': round(min(totals), 1),
+        'modules': len(imports),
+        'heavy': sorted(heavy),
+    }
+    before = previous_total(history, result['case'])
+    since = f" ({(median - before) / before:+.0%} vs {before:.1f} ms)" if before else ''
+
+    print(f"\n📊 import {module}: median {median:.1f} ms, best {min(totals):.1f} ms, "
+          f"{len(imports)} modules{since}")
+    print(f"  {'slowest imports':<48}{'self ms':>9}{'total ms':>10}")
+    for depth, name, self_us, cumulative in sorted(imports, key=lambda i: -i[2])[:TOP]:
+        print(f"  {name[:47]:<48}{self_us / 1000:>9.1f}{cumulative / 1000:>10.1f}")
+    append_result(history, result)
+
+    failed = False
+    for root, chain in heavy.items():
+        print(f"❌ {root} is imported at startup: {' <- '.join(chain)}")
+        failed = True
+    if median > budget:
+        print(f"❌ Import time {median:.1f} ms is over the {budget:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"✅ No heavy imports, {median:.1f} ms within the {budget:.0f} ms budget")
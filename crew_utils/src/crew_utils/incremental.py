@@ -0,0 +1,251 @@
+"""
+Incremental reports: update yesterday's research and report instead of
+writing them again from nothing.
+
+The first run is a normal full run. Every run after that:
+
+1. asks the researcher only for what is new since the last run date. It is
+   given the section headings of the previous research.md and report.md,
+   not their text, and returns a ResearchDelta: new facts per research
+   section, each naming the report sections it affects
+2. appends those facts, dated, to their sections of research.md
+3. gives the analyst the new facts and the current text of the affected
+   report sections only, and replaces exactly those sections in report.md
+   with its rewrites. Every other section stays byte for byte the same
+
+If nothing changed, step 1 is the only LLM call. Tokens and time therefore
+follow the size of the change, not the size of the report.
+
+The last run date is kept in <output_dir>/.incremental.json.
+"""
+import json
+import os
+import re
+import time
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+STATE_FILE = '.incremental.json'
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+
+
+class SectionUpdate(BaseModel):
+    """ New or changed facts for one section of the previous research """
+    section: str = Field(description="Heading of the research section the facts belong to (or a new heading)")
+    facts: List[str] = Field(description="The new or changed facts, one per item, with dates and sources")
+    report_sections: List[str] = Field(description="Headings of the report sections these facts affect")
+
+
+class ResearchDelta(BaseModel):
+    """ Everything that is new since the last run """
+    updates: List[SectionUpdate] = Field(description="New or changed facts by section; empty if nothing changed")
+
+
+class PatchedSection(BaseModel):
+    """ One rewritten report section """
+    heading: str = Field(description="The exact heading of the section")
+    content: str = Field(description="The full new content of the section in markdown, without the heading")
+
+
+class ReportPatch(BaseModel):
+    """ The report sections that were rewritten """
+    sections: List[PatchedSection] = Field(description="Only the rewritten sections")
+
+
+def normalize_heading(heading):
+    """'## 2. **Recent News**' -> 'recent news'"""
+    heading = re.sub(r'^[#\s]+', '', heading or '')
+    heading = re.sub(r'[*_`]', '', heading)
+    heading = re.sub(r'^\d+(\.\d+)*[.)]?\s+', '', heading)
+    return ' '.join(heading.lower().split()).rstrip(':')
+
+
+def split_sections(text):
+    """
+    Split markdown into [(heading, block)], where block includes the heading line.
+
+    Sections are cut at the highest heading level that occurs at least twice
+    (fenced code is skipped), so a '# Title' followed by '## ...' sections splits
+    at '##'. The text before the first heading has heading None.
+    """
+    lines = text.splitlines(keepends=True)
+    headings = []
+    in_fence = False
+    for i, line in enumerate(lines):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            m = HEADING_RE.match(line)
+            if m:
+                headings.append((i, len(m.group(1)), m.group(2)))
+    levels = [level for _, level, _ in headings]
+    level = next((l for l in range(1, 7) if levels.count(l) >= 2), None)
+    cuts = [(i, title) for i, l, title in headings if l == level]
+    if not cuts:
+        return [(None, text)]
+
+    sections = []
+    if cuts[0][0] > 0:
+        sections.append((None, ''.join(lines[:cuts[0][0]])))
+    for n, (start, title) in enumerate(cuts):
+        end = cuts[n + 1][0] if n + 1 < len(cuts) else len(lines)
+        sections.append((title, ''.join(lines[start:end])))
+    return sections
+
+
+def section_headings(text):
+    return [heading for heading, _ in split_sections(text) if heading]
+
+
+def _heading_line(block):
+    return block.splitlines()[0]
+
+
+def _strip_heading(content, heading):
+    """Drop a repeated heading line the model may have put in front of the content"""
+    lines = content.strip().splitlines()
+    if lines and HEADING_RE.match(lines[0]) and normalize_heading(lines[0]) == normalize_heading(heading):
+        lines = lines[1:]
+    return '\n'.join(lines).strip()
+
+
+def replace_sections(text, patches):
+    """Replace the sections named in `patches` ({heading: content}); unknown headings are appended"""
+    patches = {normalize_heading(h): (h, c) for h, c in patches.items()}
+    sections = split_sections(text)
+    level = next((len(HEADING_RE.match(_heading_line(b)).group(1)) for h, b in sections if h), 2)
+    out = []
+    for heading, block in sections:
+        key = normalize_heading(heading) if heading else None
+        if key in patches:
+            original, content = patches.pop(key)
+            out.append(f"{_heading_line(block)}\n\n{_strip_heading(content, original)}\n\n")
+        else:
+            out.append(block)
+    for original, content in patches.values():
+        out.append(f"{'#' * level} {original}\n\n{_strip_heading(content, original)}\n\n")
+    return ''.join(out).rstrip() + '\n'
+
+
+def merge_research(text, updates, run_date):
+    """Append each update's facts, dated, to its research section (new sections go at the end)"""
+    patches = {}
+    blocks = {normalize_heading(h): (h, b) for h, b in split_sections(text) if h}
+    for update in updates:
+        if not update.facts:
+            continue
+        facts = '\n'.join(f'- {fact}' for fact in update.facts)
+        key = normalize_heading(update.section)
+        heading, block = blocks.get(key, (update.section, ''))
+        body = _strip_heading(block, heading) if block else ''
+        body = patches.get(key, (heading, body))[1]
+        patches[key] = (heading, f"{body}\n\n**Update {run_date}:**\n{facts}".strip())
+    return replace_sections(text, dict(patches.values()))
+
+
+def load_state(output_dir):
+    try:
+        with open(os.path.join(output_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(output_dir, **state):
+    with open(os.path.join(output_dir, STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def last_run_date(output_dir, research_path):
+    """From the state file, or the research file's date if there is no state yet"""
+    state = load_state(output_dir)
+    if state.get('last_run'):
+        return state['last_run']
+    return date.fromtimestamp(os.path.getmtime(research_path)).isoformat()
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _write(path, text):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def update_report(updater, inputs, research_path, report_path, full_run):
+    """
+    Bring research_path and report_path up to date.
+
+    `updater` builds the two one-task crews: updates_crew() (-> ResearchDelta)
+    and patch_crew() (-> ReportPatch). `full_run()` is called instead when
+    there is no previous research or report. Returns a dict of what was done.
+    """
+    output_dir = os.path.dirname(report_path) or '.'
+    today = date.today().isoformat()
+    if not (os.path.exists(research_path) and os.path.exists(report_path)):
+        print("🆕 No previous research and report, doing a full run")
+        full_run()
+        save_state(output_dir, last_run=today)
+        return {'mode': 'full'}
+
+    start = time.perf_counter()
+    since = last_run_date(output_dir, research_path)
+    research, report = _read(research_path), _read(report_path)
+    report_headings = section_headings(report)
+
+    print(f"🔎 Looking for changes since {since}...")
+    delta = updater.updates_crew().kickoff(inputs={
+        **inputs,
+        'since': since,
+        'today': today,
+        'research_sections': '\n'.join(f'- {h}' for h in section_headings(research)) or '- (none)',
+        'report_sections': '\n'.join(f'- {h}' for h in report_headings) or '- (none)',
+    }).pydantic
+    updates = [u for u in (delta.updates if isinstance(delta, ResearchDelta) else []) if u.facts]
+    stats = {'mode': 'incremental', 'since': since, 'facts': sum(len(u.facts) for u in updates),
+             'report_sections': len(report_headings), 'patched': 0}
+    if not updates:
+        print(f"✅ Nothing new since {since}; research and report are unchanged")
+        save_state(output_dir, last_run=today)
+        stats['seconds'] = round(time.perf_counter() - start, 1)
+        return stats
+
+    # Only the report sections the new facts touch go to the analyst
+    wanted = {normalize_heading(h) for u in updates for h in u.report_sections}
+    affected = [(h, b) for h, b in split_sections(report) if h and normalize_heading(h) in wanted]
+    if not affected:
+        # The researcher named no existing section: let the analyst add one
+        affected = [(u.section, '') for u in updates]
+    facts = '\n'.join(f'- [{u.section}] {fact}' for u in updates for fact in u.facts)
+    sections = '\n\n'.join(b.strip() or f'## {h}\n\n(new section)' for h, b in affected)
+
+    print(f"✏️  {stats['facts']} new facts; rewriting {len(affected)} of {len(report_headings)} report sections...")
+    patch = updater.patch_crew().kickoff(inputs={
+        **inputs,
+        'since': since,
+        'updates': facts,
+        'sections': sections,
+    }).pydantic
+    if not isinstance(patch, ReportPatch):
+        # Write nothing, so the next run looks at the same window again
+        print("⚠️  The analyst did not return the patched sections; nothing was changed")
+        stats['seconds'] = round(time.perf_counter() - start, 1)
+        return stats
+
+    allowed = {normalize_heading(h) for h, _ in affected}
+    patches = {s.heading: s.content for s in patch.sections if normalize_heading(s.heading) in allowed}
+    _write(research_path, merge_research(research, updates, today))
+    _write(report_path, replace_sections(report, patches))
+    stats['patched'] = len(patches)
+
+    save_state(output_dir, last_run=today)
+    stats['seconds'] = round(time.perf_counter() - start, 1)
+    print(f"✅ Patched {stats['patched']} of {len(report_headings)} report sections in {stats['seconds']}s")
+    return stats
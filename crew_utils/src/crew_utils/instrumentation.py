@@ -0,0 +1,352 @@
+"""
+Per-step timing, token and cost records for every crew.
+
+instrument(crew) hooks the crew's tasks, its agents' LLMs (the manager's
+too) and its agents' tools, and writes one JSON line per step:
+
+    {"kind": "llm",  "agent": ..., "task": ..., "model": ..., "seconds": ...,
+     "prompt_tokens": ..., "completion_tokens": ..., "total_tokens": ..., "cost_usd": ...}
+    {"kind": "tool", "agent": ..., "task": ..., "tool": ..., "seconds": ...}
+    {"kind": "task", "agent": ..., "task": ..., "seconds": ..., "llm_calls": ..., tokens, cost}
+    {"kind": "crew", "seconds": ..., "llm_calls": ..., tokens, cost}
+
+Every record also has the run id (one per kickoff), the crew name, the
+start time and, if the step failed, the error. LLM calls made while a task
+runs count towards that task, including the calls of agents the
+hierarchical manager delegates to. Cost is litellm's price for the model,
+or null when the model has no known price. Responses served from the LLM
+cache show up as calls with no tokens.
+
+After each kickoff a verbose crew prints a summary table: time, calls,
+tokens and cost per agent and per task, and the agent that spent the most
+time waiting on its LLM.
+
+    CREW_METRICS=0              turn the instrumentation off
+    CREW_METRICS_FILE=...       JSONL file the records are appended to
+                                (default output/metrics.jsonl)
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+DEFAULT_FILE = os.path.join('output', 'metrics.jsonl')
+USAGE_FIELDS = ('prompt_tokens', 'completion_tokens', 'total_tokens')
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_unpriced = set()
+
+
+def metrics_enabled():
+    return os.getenv('CREW_METRICS', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def metrics_file():
+    return os.getenv('CREW_METRICS_FILE') or DEFAULT_FILE
+
+
+def write_record(record, path=None):
+    """Append one record to the JSONL file (safe across threads)"""
+    path = path or metrics_file()
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _write_lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """USD cost from litellm's price list, or None if the model is not priced"""
+    if not model or model in _unpriced:
+        return None
+    if not (prompt_tokens or completion_tokens):
+        return 0.0
+    try:
+        from litellm import cost_per_token
+        prompt_cost, completion_cost = cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return round(prompt_cost + completion_cost, 6)
+    except Exception:
+        _unpriced.add(model)
+        return None
+
+
+def task_label(task):
+    if task is None:
+        return None
+    return task.name or ' '.join((task.description or '').split())[:40]
+
+
+def agent_label(agent):
+    return agent.role.strip() if agent is not None and getattr(agent, 'role', None) else None
+
+
+def _usage(llm, callbacks):
+    """Token counters that move when `llm` answers: its own, and the agent's token callback"""
+    counters = [getattr(llm, '_token_usage', None) or {}]
+    for callback in callbacks or []:
+        process = getattr(callback, 'token_cost_process', None)
+        if process is not None:
+            counters.append({k: getattr(process, k, 0) for k in USAGE_FIELDS})
+    return [{k: counter.get(k, 0) for k in USAGE_FIELDS} for counter in counters]
+
+
+def _usage_delta(before, after):
+    # The first counter that moved; they count the same call, so never add them up
+    for b, a in zip(before, after):
+        delta = {k: a[k] - b[k] for k in USAGE_FIELDS}
+        if any(delta.values()):
+            return delta
+    return {k: 0 for k in USAGE_FIELDS}
+
+
+class CrewMetrics:
+    """Collects one crew's records, writes them out, and prints the summary"""
+
+    def __init__(self, crew, name=None, path=None):
+        self.crew = crew
+        self.name = name or crew.name
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = []
+        self.run_id = None
+        self.started = None
+
+    def copy_for(self, crew):
+        """A recorder of its own for a copy of this crew (crew_pool.py)"""
+        return CrewMetrics(crew, self.name, self.path)
+
+    def start(self, inputs):
+        with self.lock:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.records = []
+            self.started = time.perf_counter()
+        return inputs
+
+    def record(self, kind, start, seconds, **fields):
+        record = {
+            'run': self.run_id,
+            'crew': self.name,
+            'kind': kind,
+            'start': datetime.fromtimestamp(start).isoformat(timespec='milliseconds'),
+            'seconds': round(seconds, 3),
+            **fields,
+        }
+        with self.lock:
+            self.records.append(record)
+        write_record(record, self.path)
+        return record
+
+    def llm_totals(self, task=None):
+        with self.lock:
+            calls = [r for r in self.records if r['kind'] == 'llm' and (task is None or r['task'] == task)]
+        totals = {'llm_calls': len(calls)}
+        for field in USAGE_FIELDS:
+            totals[field] = sum(r[field] for r in calls)
+        costs = [r['cost_usd'] for r in calls if r['cost_usd'] is not None]
+        totals['cost_usd'] = round(sum(costs), 6) if costs else None
+        return totals
+
+    def finish(self, output):
+        if self.started is None:
+            return output
+        seconds = time.perf_counter() - self.started
+        self.record('crew', time.time() - seconds, seconds, **self.llm_totals())
+        if getattr(self.crew, 'verbose', True):
+            self.report()
+        self.started = None
+        return output
+
+    def report(self):
+        with self.lock:
+            records = list(self.records)
+        by_agent = defaultdict(lambda: defaultdict(float))
+        for r in records:
+            if r['kind'] in ('llm', 'tool'):
+                row = by_agent[r['agent'] or '-']
+                row[f"{r['kind']}_calls"] += 1
+                row[f"{r['kind']}_seconds"] += r['seconds']
+                if r['kind'] == 'llm':
+                    row['tokens'] += r['total_tokens']
+                    row['cost'] += r['cost_usd'] or 0
+        tasks = [r for r in records if r['kind'] == 'task']
+        crew = next((r for r in records if r['kind'] == 'crew'), None)
+
+        print(f"\n⏱️  {self.name}: time, tokens and cost by agent")
+        print(f"  {'agent':<32}{'LLM calls':>10}{'LLM s':>9}{'tokens':>9}{'cost $':>10}{'tool calls':>11}{'tool s':>8}")
+        for agent, row in sorted(by_agent.items(), key=lambda item: -item[1]['llm_seconds']):
+            print(f"  {agent[:31]:<32}{row['llm_calls']:>10.0f}{row['llm_seconds']:>9.1f}{row['tokens']:>9.0f}"
+                  f"{row['cost']:>10.4f}{row['tool_calls']:>11.0f}{row['tool_seconds']:>8.1f}")
+        if tasks:
+            print(f"\n  {'task':<32}{'wall s':>10}{'LLM calls':>10}{'tokens':>9}{'cost $':>10}  status")
+            for r in tasks:
+                cost = f"{r['cost_usd']:.4f}" if r['cost_usd'] is not None else '-'
+                print(f"  {(r['task'] or '-')[:31]:<32}{r['seconds']:>10.1f}{r['llm_calls']:>10}"
+                      f"{r['total_tokens']:>9}{cost:>10}  {'failed' if r.get('error') else 'ok'}")
+        if crew:
+            cost = f", ${crew['cost_usd']:.4f}" if crew['cost_usd'] is not None else ''
+            print(f"  Total: {crew['seconds']:.1f}s, {crew['llm_calls']} LLM calls, "
+                  f"{crew['total_tokens']} tokens{cost}")
+        if by_agent:
+            slowest, row = max(by_agent.items(), key=lambda item: item[1]['llm_seconds'])
+            llm_seconds = sum(r['llm_seconds'] for r in by_agent.values())
+            if llm_seconds:
+                print(f"  🐢 Slowest agent: {slowest} ({row['llm_seconds']:.1f}s, "
+                      f"{row['llm_seconds'] / llm_seconds:.0%} of LLM time)")
+        print(f"  Records: {self.path or metrics_file()} (run {self.run_id})")
+
+
+def _metrics_for(obj, agent=None):
+    """The recorder of the crew `agent` runs in, else of the task running on this thread, else `obj`'s own"""
+    crew = getattr(agent, 'crew', None)
+    # Tools can be shared by copies of a crew, so their own _metrics is only the last resort
+    return getattr(crew, '_metrics', None) or getattr(_local, 'metrics', None) or getattr(obj, '_metrics', None)
+
+
+_instrumented_llms = {}
+_instrumented_tools = {}
+_instrumented_tasks = {}
+
+
+def _instrumented_llm_class(base):
+    """Subclass of an LLM class whose call() is timed and counted"""
+    if base not in _instrumented_llms:
+        def call(self, messages, tools=None, **kwargs):
+            agent, task = kwargs.get('from_agent'), kwargs.get('from_task')
+            metrics = _metrics_for(self, agent)
+            if metrics is None or metrics.run_id is None:
+                return base.call(self, messages, tools=tools, **kwargs)
+            if agent is not None:
+                _local.agent = agent_label(agent)
+            before = _usage(self, kwargs.get('callbacks'))
+            start, clock = time.time(), time.perf_counter()
+            error = None
+            try:
+                return base.call(self, messages, tools=tools, **kwargs)
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+                raise
+            finally:
+                usage = _usage_delta(before, _usage(self, kwargs.get('callbacks')))
+                model = getattr(self, 'model', None)
+                metrics.record(
+                    'llm', start, time.perf_counter() - clock,
+                    agent=agent_label(agent) or getattr(_local, 'agent', None),
+                    task=getattr(_local, 'task', None) or task_label(task),
+                    model=model,
+                    **usage,
+                    cost_usd=estimate_cost(model, usage['prompt_tokens'], usage['completion_tokens']),
+                    error=error,
+                )
+
+        _instrumented_llms[base] = type(f'Instrumented{base.__name__}', (base,), {'call': call})
+    return _instrumented_llms[base]
+
+
+def _instrumented_tool_class(base):
+    """Subclass of a tool class whose _run() is timed"""
+    if base not in _instrumented_tools:
+        def _run(self, *args, **kwargs):
+            metrics = _metrics_for(self)
+            if metrics is None or metrics.run_id is None:
+                return base._run(self, *args, **kwargs)
+            start, clock = time.time(), time.perf_counter()
+            error = None
+            try:
+                return base._run(self, *args, **kwargs)
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+                raise
+            finally:
+                metrics.record(
+                    'tool', start, time.perf_counter() - clock,
+                    agent=getattr(_local, 'agent', None),
+                    task=getattr(_local, 'task', None),
+                    tool=self.name,
+                    error=error,
+                )
+
+        _instrumented_tools[base] = type(f'Instrumented{base.__name__}', (base,), {'_run': _run})
+    return _instrumented_tools[base]
+
+
+def _instrumented_task_class(base):
+    """Subclass of Task whose execution is timed, and whose LLM calls are counted towards it"""
+    if base not in _instrumented_tasks:
+        def _execute_core(self, agent, context, tools):
+            metrics = _metrics_for(self, agent or self.agent)
+            if metrics is None or metrics.run_id is None:
+                return base._execute_core(self, agent, context, tools)
+            previous = getattr(_local, 'task', None), getattr(_local, 'agent', None), getattr(_local, 'metrics', None)
+            label = task_label(self)
+            _local.task, _local.agent, _local.metrics = label, agent_label(agent or self.agent), metrics
+            start, clock = time.time(), time.perf_counter()
+            error = None
+            try:
+                return base._execute_core(self, agent, context, tools)
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+                raise
+            finally:
+                _local.task, _local.agent, _local.metrics = previous
+                metrics.record(
+                    'task', start, time.perf_counter() - clock,
+                    agent=agent_label(agent or self.agent),
+                    task=label,
+                    **metrics.llm_totals(label),
+                    error=error,
+                )
+
+        _instrumented_tasks[base] = type(f'Instrumented{base.__name__}', (base,), {'_execute_core': _execute_core})
+    return _instrumented_tasks[base]
+
+
+def _swap(obj, make_class, registry, metrics):
+    if obj is None or isinstance(obj, str):
+        return
+    if type(obj) not in registry.values():
+        obj.__class__ = make_class(type(obj))
+    obj._metrics = metrics
+
+
+def instrument(crew, name=None, path=None):
+    """
+    Record the timing, tokens and cost of every task, LLM call and tool call
+    of `crew` (see the module docstring), labelled with `name` (each crew
+    passes its package name), else the crew's own name. Safe to call from
+    every @crew method.
+
+    Calling it again on the same crew picks up LLMs and tools swapped in since.
+    """
+    if not metrics_enabled():
+        return crew
+    metrics = getattr(crew, '_metrics', None)
+    first = metrics is None
+    if first:
+        metrics = crew._metrics = CrewMetrics(crew, name, path)
+
+    agents = list(crew.agents) + [task.agent for task in crew.tasks if task.agent]
+    if crew.manager_agent:
+        agents.append(crew.manager_agent)
+    for agent in agents:
+        for llm in (agent.llm, getattr(agent, 'function_calling_llm', None)):
+            if hasattr(llm, 'call'):
+                _swap(llm, _instrumented_llm_class, _instrumented_llms, metrics)
+        for tool in agent.tools or []:
+            if hasattr(tool, '_run'):
+                _swap(tool, _instrumented_tool_class, _instrumented_tools, metrics)
+    for task in crew.tasks:
+        _swap(task, _instrumented_task_class, _instrumented_tasks, metrics)
+        for tool in task.tools or []:
+            if hasattr(tool, '_run'):
+                _swap(tool, _instrumented_tool_class, _instrumented_tools, metrics)
+
+    if first:
+        crew.before_kickoff_callbacks.append(metrics.start)
+        crew.after_kickoff_callbacks.append(metrics.finish)
+    return crew
@@ -0,0 +1,225 @@
+"""
+Opt-in on-disk cache for LLM responses.
+
+Responses are stored in SQLite, keyed by a SHA-256 hash of
+(model, messages, tools, temperature, response format). Re-running a crew
+with identical inputs (replay, test, a re-run after a crash) then costs no
+tokens for the calls it has already made.
+
+Turn it on with environment variables, no agent needs to change:
+
+    LLM_CACHE=1                 enable the cache
+    LLM_CACHE_PATH=...          database file (default ~/.cache/mycrewai/llm_cache.sqlite,
+                                shared by every crew in this repo)
+    LLM_CACHE_TTL=86400         seconds before an entry expires (0 = never)
+    LLM_CACHE_MAX_MB=512        size cap; least recently used entries are evicted
+
+    python -m crew_utils.llm_cache stats|clear
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'mycrewai', 'llm_cache.sqlite')
+
+
+def cache_enabled():
+    return os.getenv('LLM_CACHE', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class LLMCache:
+    """SQLite store with TTL expiry, size-based LRU eviction and hit/miss counters"""
+
+    def __init__(self, path=None, ttl=None, max_mb=None):
+        self.path = path or os.getenv('LLM_CACHE_PATH') or DEFAULT_PATH
+        self.ttl = float(ttl if ttl is not None else os.getenv('LLM_CACHE_TTL', 0))
+        self.max_bytes = int(float(max_mb if max_mb is not None else os.getenv('LLM_CACHE_MAX_MB', 512)) * 1024 * 1024)
+        self.hits = self.misses = self.stores = self.evictions = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                kind TEXT,
+                response TEXT,
+                size INTEGER,
+                created REAL,
+                accessed REAL
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)')
+        self.db.commit()
+
+    @staticmethod
+    def make_key(model, messages, tools=None, temperature=None, response_format=None):
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'tools': tools,
+             'temperature': temperature, 'response_format': response_format},
+            sort_keys=True, default=str, ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return (kind, response) or None"""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute('SELECT kind, response, created FROM responses WHERE key = ?', (key,)).fetchone()
+            if row and self.ttl and now - row[2] > self.ttl:
+                self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.db.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self.db.commit()
+            self.hits += 1
+            return row[0], row[1]
+
+    def put(self, key, model, kind, response):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, model, kind, response, size, now, now),
+            )
+            self.stores += 1
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        if self.ttl:
+            cur = self.db.execute('DELETE FROM responses WHERE created < ?', (time.time() - self.ttl,))
+            self.evictions += cur.rowcount
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until we're back under the cap
+        for key, size in self.db.execute('SELECT key, size FROM responses ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.db.execute('DELETE FROM responses')
+            self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            entries, total = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_mb': round(total / 1024 / 1024, 2),
+            'path': self.path,
+        }
+
+    def report(self):
+        s = self.stats()
+        print(f"\n🗄️  LLM cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%} hit rate), "
+              f"{s['entries']} entries, {s['size_mb']} MB, {s['evictions']} evicted")
+
+
+_cached_classes = {}
+
+
+def _cached_class(base):
+    """Subclass of an LLM class whose call() goes through the cache first"""
+    if base not in _cached_classes:
+        def call(self, messages, tools=None, **kwargs):
+            cache = self._llm_cache
+            response_model = kwargs.get('response_model')
+            key = cache.make_key(
+                getattr(self, 'model', None), messages, tools,
+                getattr(self, 'temperature', None),
+                response_model.model_json_schema() if response_model else None,
+            )
+            hit = cache.get(key)
+            if hit is not None:
+                kind, response = hit
+                if kind == 'model' and response_model:
+                    return response_model.model_validate_json(response)
+                return response
+
+            result = base.call(self, messages, tools=tools, **kwargs)
+            # Only plain text and structured outputs are safe to replay
+            if isinstance(result, str) and result:
+                cache.put(key, getattr(self, 'model', None), 'text', result)
+            elif response_model and isinstance(result, response_model):
+                cache.put(key, getattr(self, 'model', None), 'model', result.model_dump_json())
+            return result
+
+        _cached_classes[base] = type(f'Cached{base.__name__}', (base,), {'call': call})
+    return _cached_classes[base]
+
+
+def _wrap_llm(llm, cache):
+    if llm is None or isinstance(llm, str) or not hasattr(llm, 'call'):
+        return
+    if type(llm) not in _cached_classes.values():
+        llm.__class__ = _cached_class(type(llm))
+    llm._llm_cache = cache
+
+
+_shared_cache = None
+
+
+def get_cache():
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = LLMCache()
+    return _shared_cache
+
+
+def cache_llm_calls(crew, cache=None):
+    """
+    Route every agent's LLM in `crew` through the response cache.
+
+    Does nothing unless LLM_CACHE is set (or a cache is passed in), so it is
+    safe to call from every @crew method.
+    """
+    if cache is None:
+        if not cache_enabled():
+            return crew
+        cache = get_cache()
+
+    agents = list(crew.agents) + [task.agent for task in crew.tasks if task.agent]
+    if crew.manager_agent:
+        agents.append(crew.manager_agent)
+    for agent in agents:
+        _wrap_llm(agent.llm, cache)
+        _wrap_llm(getattr(agent, 'function_calling_llm', None), cache)
+
+    def report(output):
+        cache.report()
+        return output
+
+    crew.after_kickoff_callbacks.append(report)
+    return crew
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    store = LLMCache()
+    if command == 'clear':
+        store.clear()
+        print(f"Cleared {store.path}")
+    else:
+        print(json.dumps(store.stats(), indent=2))
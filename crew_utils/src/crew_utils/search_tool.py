@@ -0,0 +1,281 @@
+"""
+SerperDevTool with a persistent result cache, in-flight deduplication,
+a pooled HTTP client and an offline fixture mode.
+
+CachedSerperDevTool is a drop-in replacement for crewai_tools' SerperDevTool.
+Only the HTTP request is replaced; the tool's name, schema and result
+formatting stay the same:
+
+- results are stored in SQLite, keyed by the normalized query and the search
+  options, and expire after a TTL (news goes stale faster than web results)
+- identical queries issued at the same time (parallel agents, fan-out crews)
+  share one request
+- every tool instance sends through one pooled requests.Session, with
+  timeouts
+
+Set with environment variables:
+
+    SEARCH_CACHE=0              turn the cache off (deduplication stays on)
+    SEARCH_CACHE_PATH=...       database file (default ~/.cache/mycrewai/search_cache.sqlite,
+                                shared by every crew in this repo)
+    SEARCH_CACHE_TTL=86400      seconds before a web result expires (0 = never)
+    SEARCH_CACHE_NEWS_TTL=3600  seconds before a news result expires (0 = never)
+    SEARCH_MODE=live            live: search the API (through the cache)
+                                record: like live, and save every result as a fixture
+                                replay: only serve fixtures, never touch the network
+    SEARCH_FIXTURES=...         fixture directory (default ./fixtures/search)
+    SERPER_BASE_URL=...         API base URL (default https://google.serper.dev)
+
+    python -m crew_utils.search_tool stats|clear
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from pydantic import Field
+from requests.adapters import HTTPAdapter
+from crewai_tools import SerperDevTool
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'mycrewai', 'search_cache.sqlite')
+DEFAULT_FIXTURES = os.path.join('.', 'fixtures', 'search')
+DEFAULT_TTLS = {'search': 86400, 'news': 3600}
+TIMEOUT = (3.05, 15)
+
+
+def cache_enabled():
+    return os.getenv('SEARCH_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def search_mode():
+    mode = os.getenv('SEARCH_MODE', 'live').lower()
+    if mode not in ('live', 'record', 'replay'):
+        raise ValueError(f"SEARCH_MODE must be live, record or replay, not {mode!r}")
+    return mode
+
+
+def normalize_query(query):
+    """'  Nvidia   NEWS ' -> 'nvidia news'"""
+    return ' '.join(query.lower().split())
+
+
+def make_key(query, search_type, options):
+    payload = json.dumps(
+        {'q': normalize_query(query), 'type': search_type, **options},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SearchCache:
+    """SQLite store of raw API results with per-search-type TTLs and hit/miss counters"""
+
+    def __init__(self, path=None, ttls=None):
+        self.path = path or os.getenv('SEARCH_CACHE_PATH') or DEFAULT_PATH
+        self.ttls = ttls or {
+            'search': float(os.getenv('SEARCH_CACHE_TTL', DEFAULT_TTLS['search'])),
+            'news': float(os.getenv('SEARCH_CACHE_NEWS_TTL', DEFAULT_TTLS['news'])),
+        }
+        self.hits = self.misses = self.stores = self.expired = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                query TEXT,
+                type TEXT,
+                response TEXT,
+                created REAL
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_results_created ON results(created)')
+        self.db.commit()
+
+    def get(self, key, search_type):
+        """Return the cached results dict, or None if missing or stale"""
+        ttl = self.ttls.get(search_type, self.ttls['search'])
+        with self.lock:
+            row = self.db.execute('SELECT response, created FROM results WHERE key = ?', (key,)).fetchone()
+            if row and ttl and time.time() - row[1] > ttl:
+                self.db.execute('DELETE FROM results WHERE key = ?', (key,))
+                self.db.commit()
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key, query, search_type, results):
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                (key, query, search_type, json.dumps(results, ensure_ascii=False), time.time()),
+            )
+            self.stores += 1
+            self.db.commit()
+
+    def clear(self):
+        with self.lock:
+            self.db.execute('DELETE FROM results')
+            self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            entries = self.db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'stores': self.stores,
+            'expired': self.expired,
+            'entries': entries,
+            'path': self.path,
+        }
+
+
+class FixtureStore:
+    """Recorded results, one JSON file per query key"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.getenv('SEARCH_FIXTURES') or DEFAULT_FIXTURES
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def load(self, key):
+        try:
+            with open(self.path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)['results']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, key, query, search_type, results):
+        os.makedirs(self.directory, exist_ok=True)
+        fixture = {'query': query, 'type': search_type, 'results': results}
+        tmp = f'{self.path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path(key))
+
+
+_session = None
+_cache = None
+_shared_lock = threading.Lock()
+_in_flight = {}
+
+
+def get_session():
+    """One pooled session for every search tool in the process"""
+    global _session
+    with _shared_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def get_cache():
+    global _cache
+    with _shared_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool whose API requests go through the cache, dedup and fixtures"""
+
+    base_url: str = Field(default_factory=lambda: os.getenv('SERPER_BASE_URL', 'https://google.serper.dev'))
+
+    def _search_options(self):
+        return {'num': self.n_results, 'gl': self.country, 'location': self.location, 'hl': self.locale}
+
+    def _make_api_request(self, search_query, search_type):
+        key = make_key(search_query, search_type, self._search_options())
+        mode = search_mode()
+        if mode == 'replay':
+            return self._replay(key, search_query)
+
+        # The first caller fetches; identical concurrent calls wait for its result
+        with _shared_lock:
+            future = _in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = _in_flight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            results = self._fetch(key, search_query, search_type)
+            if mode == 'record':
+                FixtureStore().save(key, search_query, search_type, results)
+            future.set_result(results)
+            return results
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _shared_lock:
+                _in_flight.pop(key, None)
+
+    def _fetch(self, key, search_query, search_type):
+        cache = get_cache() if cache_enabled() else None
+        if cache is not None:
+            results = cache.get(key, search_type)
+            if results is not None:
+                return results
+        results = self._post(search_query, search_type)
+        if cache is not None:
+            cache.put(key, search_query, search_type, results)
+        return results
+
+    def _post(self, search_query, search_type):
+        payload = {"q": search_query, "num": self.n_results}
+        if self.country != "":
+            payload["gl"] = self.country
+        if self.location != "":
+            payload["location"] = self.location
+        if self.locale != "":
+            payload["hl"] = self.locale
+        headers = {
+            "X-API-KEY": os.environ["SERPER_API_KEY"],
+            "content-type": "application/json",
+        }
+        response = get_session().post(
+            self._get_search_url(search_type), headers=headers, json=payload, timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
+
+    def _replay(self, key, search_query):
+        results = FixtureStore().load(key)
+        if results is None:
+            # Deterministic offline behaviour: a missing fixture is an empty result
+            print(f"⚠️  No recorded search results for {search_query!r}")
+            return {}
+        return results
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    store = SearchCache()
+    if command == 'clear':
+        store.clear()
+        print(f"Cleared {store.path}")
+    else:
+        print(json.dumps(store.stats(), indent=2))
@@ -0,0 +1,479 @@
+"""
+Local stand-in for the OpenAI and Serper APIs, for running crews offline.
+
+StubServer answers:
+
+    POST /v1/chat/completions   OpenAI chat completions (and /chat/completions)
+    POST /v1/embeddings         deterministic embeddings, for crew memory
+    GET  /v1/models
+    POST /search, /news         Serper web and news results
+    POST /1/messages.json       Pushover notifications (form data)
+
+Chat answers follow the agent's prompt, so every crew runs end to end:
+
+- an agent with tools first calls its first tool (STUB_TOOL_ROUNDS times,
+  default 1) in crewai's Action / Action Input format, with made-up
+  arguments. The manager's delegation goes to the coworker that best
+  matches the task
+- a final answer for a task with output_pydantic / output_json is a JSON
+  object that fits the schema in the prompt. A request with a
+  response_format or a forced tool call gets the same
+- any other final answer is a short markdown document with sections
+
+Scripted answers take precedence: a JSON file of rules, tried in order,
+
+    [{"match": "trending companies", "response": {"companies": []}, "delay": 2.0}]
+
+where `match` is a regex searched in the whole prompt, and `response` is
+text or a JSON value (used as the final answer). Every answer waits
+`latency` seconds, plus `delay` for a rule, plus its completion tokens at
+`token_rate` tokens per second if set. Usage is reported at about 4
+characters per token.
+
+Pushover answers {"status": 1} and keeps the delivered messages in
+`pushes`. `push_statuses` scripts failures: each notification takes the
+next HTTP status from the list (200 is a delivery), and once the list is
+used up every notification is delivered.
+
+crew_benchmark.py starts one and points every agent at it. Run on
+its own, it prints the environment variables that send OpenAI models (and
+agents with no model in agents.yaml), searches and push notifications to it:
+
+    python -m crew_utils.stub_server [--port 8765] [--latency 0.5] [--token-rate 0] [--script rules.json]
+"""
+import argparse
+import ast
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+STUB_MODEL = 'openai/stub-model'
+SCHEMA_MARKER = 'adheres to the following OpenAPI schema:'
+TOOL_RE = re.compile(r'Tool Name: (.+?)\nTool Arguments: (\{.*?\})\nTool Description:', re.S)
+WORD_RE = re.compile(r'[a-z]{4,}')
+EMBEDDING_SIZE = 1536
+FILLER = (
+    'The evidence points in one direction, with a few caveats worth noting. Recent results are '
+    'consistent with the longer trend, and the main risks are well understood. Each claim here '
+    'would be checked against its source before publication.'
+)
+
+
+def count_tokens(text):
+    return math.ceil(len(text or '') / 4)
+
+
+def keywords(text):
+    return set(WORD_RE.findall((text or '').lower()))
+
+
+def message_text(message):
+    content = message.get('content') or ''
+    if isinstance(content, list):
+        content = ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return content
+
+
+def example_for(schema, name='value'):
+    """A value that fits a (dereferenced) JSON schema"""
+    if not isinstance(schema, dict):
+        return f'Stub {name}'
+    if 'const' in schema:
+        return schema['const']
+    if schema.get('enum'):
+        return schema['enum'][0]
+    for key in ('anyOf', 'oneOf', 'allOf'):
+        options = [s for s in schema.get(key, []) if s.get('type') != 'null']
+        if options:
+            return example_for(options[0], name)
+    kind = schema.get('type')
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != 'null'), 'string')
+    if kind == 'object' or 'properties' in schema:
+        return {key: example_for(sub, key) for key, sub in schema.get('properties', {}).items()}
+    if kind == 'array':
+        count = max(schema.get('minItems', 0), 2)
+        return [example_for(schema.get('items', {}), name) for _ in range(count)]
+    if kind == 'integer':
+        return max(schema.get('minimum', 1), 1)
+    if kind == 'number':
+        return float(max(schema.get('minimum', 1), 1))
+    if kind == 'boolean':
+        return True
+    label = name.replace('_', ' ')
+    if name in ('ticker', 'symbol'):
+        return 'STUB'
+    return f'Stub {label}: {FILLER.split(".")[0]}.'
+
+
+def schema_in(text):
+    """The JSON schema crewai put in the prompt for output_pydantic / output_json, or None"""
+    at = text.rfind(SCHEMA_MARKER)
+    if at < 0:
+        return None
+    start = text.find('{', at)
+    try:
+        schema, _ = json.JSONDecoder().raw_decode(text[start:])
+        return schema
+    except ValueError:
+        return None
+
+
+def markdown_answer(prompt, words=180):
+    """A small markdown document about the first line of the task"""
+    topic = next((line.strip() for line in prompt.splitlines() if line.strip()), 'the task')[:80]
+    sentences = max(1, words // len(FILLER.split()))
+    body = ' '.join([FILLER] * sentences)
+    sections = ['Overview', 'Key Findings', 'Analysis', 'Outlook']
+    parts = [f'# {topic}']
+    for section in sections:
+        parts.append(f'## {section}\n\n{body}')
+    return '\n\n'.join(parts)
+
+
+def tool_arguments(name, args, task_text, coworkers):
+    """Arguments for a stub tool call, from crewai's rendering of the tool's args"""
+    values = {}
+    for arg, spec in args.items():
+        kind = spec.get('type', 'str') if isinstance(spec, dict) else 'str'
+        if arg == 'coworker' and coworkers:
+            wanted = keywords(task_text)
+            values[arg] = max(coworkers, key=lambda c: len(keywords(c) & wanted))
+        elif kind in ('int', 'integer'):
+            values[arg] = 1
+        elif kind in ('float', 'number'):
+            values[arg] = 1.0
+        elif kind in ('bool', 'boolean'):
+            values[arg] = True
+        elif arg in ('task', 'question'):
+            values[arg] = ' '.join(task_text.split())[:300]
+        elif arg == 'context':
+            values[arg] = 'Everything needed is in the task.'
+        else:
+            values[arg] = ' '.join(task_text.split()[:8]) or 'stub query'
+    return values
+
+
+class StubBrain:
+    """Decides what the stub says, and keeps request counters"""
+
+    def __init__(self, latency=0.0, token_rate=0.0, script=None, tool_rounds=None, search_latency=0.0,
+                 push_statuses=None):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.search_latency = search_latency
+        self.tool_rounds = int(tool_rounds if tool_rounds is not None else os.getenv('STUB_TOOL_ROUNDS', 1))
+        self.rules = [dict(rule, pattern=re.compile(rule['match'], re.I | re.S)) for rule in (script or [])]
+        self.push_statuses = deque(push_statuses or ())
+        self.pushes = []
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counts[key] += n
+
+    def wait(self, extra, completion_tokens):
+        seconds = self.latency + extra
+        if self.token_rate:
+            seconds += completion_tokens / self.token_rate
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def scripted(self, prompt):
+        for rule in self.rules:
+            if rule['pattern'].search(prompt):
+                response = rule.get('response', '')
+                if not isinstance(response, str):
+                    response = json.dumps(response, ensure_ascii=False)
+                return response, float(rule.get('delay', 0))
+        return None, 0.0
+
+    def chat(self, request):
+        """(message dict, prompt tokens, completion tokens, extra delay) for a chat request"""
+        messages = request.get('messages') or []
+        prompt = '\n'.join(message_text(m) for m in messages)
+        system = '\n'.join(message_text(m) for m in messages if m.get('role') == 'system')
+        task_text = next((message_text(m) for m in messages if m.get('role') == 'user'), prompt)
+        scripted, delay = self.scripted(prompt)
+
+        # Structured output asked for by the API request itself
+        forced = request.get('tool_choice')
+        if isinstance(forced, dict) and forced.get('type') == 'function':
+            name = forced['function']['name']
+            tool = next((t['function'] for t in request.get('tools', []) if t['function']['name'] == name), {})
+            arguments = scripted or json.dumps(example_for(tool.get('parameters', {})), ensure_ascii=False)
+            message = {'role': 'assistant', 'content': None, 'tool_calls': [{
+                'id': f'call_{uuid.uuid4().hex[:12]}', 'type': 'function',
+                'function': {'name': name, 'arguments': arguments},
+            }]}
+            return message, count_tokens(prompt), count_tokens(arguments), delay
+        response_format = request.get('response_format') or {}
+        if response_format.get('type') == 'json_schema':
+            content = scripted or json.dumps(
+                example_for(response_format['json_schema'].get('schema', {})), ensure_ascii=False)
+            return {'role': 'assistant', 'content': content}, count_tokens(prompt), count_tokens(content), delay
+
+        if 'Final Answer:' not in system + task_text:
+            # A plain call (summaries, conversions): just text
+            content = scripted or markdown_answer(task_text)
+            return {'role': 'assistant', 'content': content}, count_tokens(prompt), count_tokens(content), delay
+
+        tools = TOOL_RE.findall(system + '\n' + task_text)
+        observations = prompt.count('Observation:') - (system + task_text).count('Observation:')
+        if tools and not scripted and observations < self.tool_rounds:
+            name, raw_args = tools[0]
+            try:
+                args = ast.literal_eval(raw_args)
+            except (ValueError, SyntaxError):
+                args = {}
+            coworkers = re.findall(r'coworkers?:\s*\[?([^\]\n]+)', system + task_text)
+            coworkers = [c.strip() for c in coworkers[0].split(',')] if coworkers else []
+            call = json.dumps(tool_arguments(name, args, task_text, coworkers), ensure_ascii=False)
+            content = f'Thought: I should use {name.strip()} first.\nAction: {name.strip()}\nAction Input: {call}'
+        else:
+            schema = schema_in(task_text)
+            answer = scripted or (json.dumps(example_for(schema), ensure_ascii=False) if schema
+                                  else markdown_answer(task_text))
+            content = f'Thought: I now know the final answer\nFinal Answer: {answer}'
+        return {'role': 'assistant', 'content': content}, count_tokens(prompt), count_tokens(content), delay
+
+    def search(self, path, request):
+        query = request.get('q', '')
+        n = int(request.get('num') or 10)
+        if path.endswith('/news'):
+            results = {'news': [{
+                'title': f'{query} news item {i}', 'link': f'https://news.example.com/{i}',
+                'snippet': FILLER, 'date': '1 day ago', 'source': 'Stub News', 'position': i,
+            } for i in range(1, n + 1)]}
+        else:
+            results = {'organic': [{
+                'title': f'{query} result {i}', 'link': f'https://example.com/{i}',
+                'snippet': FILLER, 'position': i,
+            } for i in range(1, n + 1)]}
+        return {'searchParameters': {'q': query, 'num': n}, **results}
+
+    def push(self, request):
+        """HTTP status for a Pushover notification; a delivered message is kept in `pushes`"""
+        with self.lock:
+            status = self.push_statuses.popleft() if self.push_statuses else 200
+            if status == 200:
+                self.pushes.append(request.get('message', ''))
+        return status
+
+
+def embedding(text):
+    """A deterministic unit vector for `text`"""
+    seed = hashlib.sha256(text.encode('utf-8')).digest()
+    values = [(seed[i % len(seed)] - 127.5) / 127.5 for i in range(EMBEDDING_SIZE)]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self.send_json({'object': 'list', 'data': [{'id': STUB_MODEL.split('/', 1)[1], 'object': 'model'}]})
+        else:
+            self.send_json({'error': {'message': f'Unknown path {self.path}'}}, 404)
+
+    def do_POST(self):
+        brain = self.server.brain
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            request = dict(parse_qsl(body.decode('utf-8'), keep_blank_values=True))
+        else:
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError:
+                return self.send_json({'error': {'message': 'Invalid JSON'}}, 400)
+        path = self.path.split('?')[0].rstrip('/')
+
+        if path.endswith('/chat/completions'):
+            message, prompt_tokens, completion_tokens, delay = brain.chat(request)
+            brain.count('chat')
+            brain.count('prompt_tokens', prompt_tokens)
+            brain.count('completion_tokens', completion_tokens)
+            brain.wait(delay, completion_tokens)
+            usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                     'total_tokens': prompt_tokens + completion_tokens}
+            if request.get('stream'):
+                return self.stream(request, message, usage)
+            self.send_json({
+                'id': f'chatcmpl-{uuid.uuid4().hex[:12]}', 'object': 'chat.completion',
+                'created': int(time.time()), 'model': request.get('model', STUB_MODEL),
+                'choices': [{'index': 0, 'message': message,
+                             'finish_reason': 'tool_calls' if message.get('tool_calls') else 'stop'}],
+                'usage': usage,
+            })
+        elif path.endswith('/embeddings'):
+            inputs = request.get('input') or []
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            brain.count('embeddings', len(inputs))
+            self.send_json({
+                'object': 'list', 'model': request.get('model', 'stub-embedding'),
+                'data': [{'object': 'embedding', 'index': i, 'embedding': embedding(str(text))}
+                         for i, text in enumerate(inputs)],
+                'usage': {'prompt_tokens': sum(count_tokens(str(t)) for t in inputs),
+                          'total_tokens': sum(count_tokens(str(t)) for t in inputs)},
+            })
+        elif path.endswith(('/search', '/news')):
+            brain.count('search')
+            if brain.search_latency:
+                time.sleep(brain.search_latency)
+            self.send_json(brain.search(path, request))
+        elif path.endswith('/messages.json'):
+            brain.count('push')
+            status = brain.push(request)
+            if status == 200:
+                self.send_json({'status': 1, 'request': uuid.uuid4().hex})
+            else:
+                self.send_json({'status': 0, 'errors': [f'stub answered {status}']}, status)
+        else:
+            self.send_json({'error': {'message': f'Unknown path {self.path}'}}, 404)
+
+    def stream(self, request, message, usage):
+        """The same answer as server-sent events: one content chunk, then usage"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        base = {'id': f'chatcmpl-{uuid.uuid4().hex[:12]}', 'object': 'chat.completion.chunk',
+                'created': int(time.time()), 'model': request.get('model', STUB_MODEL)}
+        chunks = [
+            {**base, 'choices': [{'index': 0, 'delta': message, 'finish_reason': None}]},
+            {**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}], 'usage': usage},
+        ]
+        for chunk in chunks:
+            self.wfile.write(f'data: {json.dumps(chunk, ensure_ascii=False)}\n\n'.encode('utf-8'))
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.close_connection = True
+
+
+class StubServer:
+    """The stub on a background thread; use as a context manager"""
+
+    def __init__(self, host='127.0.0.1', port=0, **brain_options):
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.brain = StubBrain(**brain_options)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def counts(self):
+        return self.httpd.brain.counts
+
+    @property
+    def pushes(self):
+        return self.httpd.brain.pushes
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='stub-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def stub_environment(url):
+    """Environment variables that send every LLM, embedding, search and push notification to the stub at `url`"""
+    return {
+        'MODEL': STUB_MODEL,
+        'OPENAI_API_KEY': 'stub',
+        'OPENAI_API_BASE': f'{url}/v1',
+        'OPENAI_BASE_URL': f'{url}/v1',
+        # The agents.yaml models are built before they are swapped for the stub's
+        'ANTHROPIC_API_KEY': 'stub',
+        'DEEPSEEK_API_KEY': 'stub',
+        'SERPER_API_KEY': 'stub',
+        'SERPER_BASE_URL': url,
+        'SEARCH_MODE': 'live',
+        # stock_picker's push tool: never the real Pushover, whatever .env holds
+        'PUSHOVER_URL': f'{url}/1/messages.json',
+        'PUSHOVER_USER': 'stub',
+        'PUSHOVER_TOKEN': 'stub',
+        'SEARCH_CACHE': '0',
+        'LLM_CACHE': '0',
+    }
+
+
+def use_stub_models(crew):
+    """
+    Give every agent of a built crew, the manager too, its own LLM on the stub
+    model. Call with the stub_environment() variables set.
+    """
+    from crewai import LLM
+
+    agents = list(crew.agents) + [task.agent for task in crew.tasks if task.agent]
+    if crew.manager_agent:
+        agents.append(crew.manager_agent)
+    for agent in {id(agent): agent for agent in agents}.values():
+        agent.llm = LLM(model=STUB_MODEL)
+        agent.function_calling_llm = None
+    return crew
+
+
+def load_script(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Offline OpenAI and Serper stub')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds before every answer')
+    parser.add_argument('--token-rate', type=float, default=0.0, help='completion tokens per second (0 = instant)')
+    parser.add_argument('--search-latency', type=float, default=0.0, help='seconds before every search result')
+    parser.add_argument('--script', help='JSON file of scripted answers')
+    args = parser.parse_args()
+
+    server = StubServer(port=args.port, latency=args.latency, token_rate=args.token_rate,
+                        search_latency=args.search_latency,
+                        script=load_script(args.script) if args.script else None)
+    print(f"🧪 Stub server on {server.url}. Send OpenAI models and searches to it with:\n")
+    for key, value in stub_environment(server.url).items():
+        print(f"export {key}={value}")
+    sys.stdout.flush()
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n{dict(server.counts)}")
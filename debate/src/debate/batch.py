@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Judge many motions in one process.
+
+Motions are read from a JSONL file (one {"motion": ..., "id": ...} object or
+plain string per line) or a CSV file with a `motion` column and an optional
+`id` column. Each motion is debated on a bounded pool of workers and written
+to its own folder, output/motions/<id>/{propose,oppose,decide}.md, so runs
+never overwrite each other. A line is appended to output/motions/results.jsonl
+as soon as each motion finishes.
+
+    uv run batch motions.jsonl --workers 8 --rpm openai=500 --parallel
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from crewai.hooks import register_before_llm_call_hook, unregister_before_llm_call_hook
+
+from debate.crew import Debate
+from crew_utils.crew_pool import CrewPool
+
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+
+OUTPUT_ROOT = 'output/motions'
+
+
+def slugify(text, max_length=60):
+    """Turn a motion into a folder-safe id"""
+    slug = re.sub(r'[^\w\s-]', '', text.lower())
+    slug = re.sub(r'[-\s]+', '_', slug)
+    return slug[:max_length].strip('_') or 'motion'
+
+
+def load_motions(path):
+    """Return a list of {'id', 'motion'} dicts from a .jsonl or .csv file"""
+    rows = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                rows.append({'id': row.get('id'), 'motion': row['motion']})
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if isinstance(record, str):
+                    record = {'motion': record}
+                rows.append({'id': record.get('id'), 'motion': record['motion']})
+
+    # Every motion needs a unique id because it names the output folder
+    seen = set()
+    for i, row in enumerate(rows, 1):
+        motion_id = slugify(str(row['id'])) if row['id'] else f"{i:04d}_{slugify(row['motion'])}"
+        while motion_id in seen:
+            motion_id = f"{motion_id}_{i}"
+        seen.add(motion_id)
+        row['id'] = motion_id
+    return rows
+
+
+def parse_rpm(values):
+    """Parse ['openai=500', 'anthropic=50'] into {'openai': 500.0, ...}"""
+    limits = {}
+    for value in values or []:
+        provider, _, rpm = value.partition('=')
+        if not rpm:
+            raise ValueError(f"Expected PROVIDER=RPM, got '{value}'")
+        limits[provider.strip().lower()] = float(rpm)
+    return limits
+
+
+def llm_provider(llm):
+    """Provider name for an LLM object, e.g. 'openai' or 'ollama'"""
+    model = str(getattr(llm, 'model', '') or '')
+    if '/' in model:
+        return model.split('/', 1)[0].lower()
+    return str(getattr(llm, 'provider', '') or 'unknown').lower()
+
+
+class ProviderRateLimiter:
+    """
+    Spaces LLM calls so each provider stays under its requests-per-minute cap.
+
+    Used as a global before_llm_call hook, so it throttles every agent in
+    every worker thread. Providers without a limit are not throttled.
+    """
+
+    def __init__(self, rpm_limits):
+        self.intervals = {p: 60.0 / rpm for p, rpm in rpm_limits.items() if rpm > 0}
+        self.next_slot = defaultdict(float)
+        self.waited = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def acquire(self, provider):
+        interval = self.intervals.get(provider)
+        if not interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot[provider])
+            self.next_slot[provider] = slot + interval
+            self.waited[provider] += slot - now
+        if slot > now:
+            time.sleep(slot - now)
+
+    def __call__(self, context):
+        self.acquire(llm_provider(context.llm))
+        return None
+
+
+class MotionRunner:
+    """Runs motions on a worker pool, each on its own copy of one warm Debate crew"""
+
+    def __init__(self, workers=4, parallel=False, output_root=OUTPUT_ROOT):
+        self.workers = workers
+        self.parallel = parallel
+        self.output_root = output_root
+        self.write_lock = threading.Lock()
+        # Built once; the output folder follows the motion_id input
+        self.crews = CrewPool({'debate': lambda: Debate(
+            parallel=parallel, output_dir=f"{output_root}/{{motion_id}}").crew()})
+
+    def crew(self):
+        return self.crews.crew('debate')
+
+    def debate(self, row):
+        start = time.perf_counter()
+        record = {'id': row['id'], 'motion': row['motion']}
+        try:
+            result = self.crew().kickoff(inputs={'motion': row['motion'], 'motion_id': row['id']})
+            record['status'] = 'ok'
+            record['decision'] = result.raw
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - start, 2)
+        return record
+
+    def run(self, rows):
+        os.makedirs(self.output_root, exist_ok=True)
+        results_path = os.path.join(self.output_root, 'results.jsonl')
+        start = time.perf_counter()
+        done = failed = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool, \
+                open(results_path, 'a', encoding='utf-8') as results:
+            futures = [pool.submit(self.debate, row) for row in rows]
+            for future in as_completed(futures):
+                record = future.result()
+                with self.write_lock:
+                    results.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    results.flush()
+                done += 1
+                failed += record['status'] != 'ok'
+                elapsed = time.perf_counter() - start
+                print(f"[{done}/{len(rows)}] {record['status']:<5} {record['seconds']:7.1f}s  "
+                      f"{record['id']}  ({done / elapsed * 60:.1f} motions/min)")
+
+        elapsed = time.perf_counter() - start
+        self.crews.report()
+        return {
+            'motions': len(rows),
+            'failed': failed,
+            'seconds': round(elapsed, 2),
+            'motions_per_minute': round(len(rows) / elapsed * 60, 2) if elapsed else 0.0,
+            'results': results_path,
+        }
+
+
+def run():
+    """
+    Debate every motion in a JSONL/CSV file on a bounded worker pool.
+    """
+    parser = argparse.ArgumentParser(description="Batch motion runner for the debate crew")
+    parser.add_argument('motions', help="Path to a .jsonl or .csv file of motions")
+    parser.add_argument('--workers', type=int, default=4, help="Max motions debated at once")
+    parser.add_argument('--rpm', action='append', metavar='PROVIDER=RPM',
+                        help="Requests-per-minute cap for a provider, e.g. openai=500 (repeatable)")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Also argue propose and oppose concurrently within each motion")
+    parser.add_argument('--output', default=OUTPUT_ROOT, help="Root folder for per-motion output")
+    args = parser.parse_args(sys.argv[1:])
+
+    rows = load_motions(args.motions)
+    limiter = ProviderRateLimiter(parse_rpm(args.rpm))
+    register_before_llm_call_hook(limiter)
+
+    print("=" * 70)
+    print(f"Debating {len(rows)} motions with {args.workers} workers")
+    print("=" * 70)
+    try:
+        summary = MotionRunner(args.workers, args.parallel, args.output).run(rows)
+    finally:
+        unregister_before_llm_call_hook(limiter)
+
+    print("=" * 70)
+    print(f"Done: {summary['motions']} motions, {summary['failed']} failed, "
+          f"{summary['seconds']}s, {summary['motions_per_minute']} motions/min")
+    for provider, waited in limiter.waited.items():
+        print(f"Rate limit wait for {provider}: {waited:.1f}s")
+    print(f"Results: {summary['results']}")
+    return summary
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Compare sequential and parallel debate latency against a local stub LLM.
+
+No API keys are needed: every agent talks to DelayedStubLLM, which sleeps for
+a fixed delay and returns a canned final answer, so the only thing measured is
+how the crew schedules its tasks.
+
+    uv run benchmark [delay_seconds] [rounds]
+"""
+import os
+import sys
+import tempfile
+import time
+import threading
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from crewai.llms.base_llm import BaseLLM
+
+from debate.crew import Debate
+
+
+class DelayedStubLLM(BaseLLM):
+    """Offline LLM that answers after `delay` seconds"""
+
+    def __init__(self, delay: float = 1.0):
+        super().__init__(model="stub/delayed")
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return "Thought: I now know the final answer\nFinal Answer: A stub argument."
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+def time_kickoff(parallel: bool, delay: float) -> tuple[float, int]:
+    """Return (seconds, llm_calls) for one debate"""
+    llm = DelayedStubLLM(delay)
+    crew = Debate(parallel=parallel, llm=llm).crew()
+    crew.verbose = False
+    for task in crew.tasks:
+        task.agent.verbose = False
+
+    start = time.perf_counter()
+    crew.kickoff(inputs={'motion': 'Benchmarks should run offline'})
+    return time.perf_counter() - start, llm.calls
+
+
+def run():
+    """
+    Run the sequential vs parallel benchmark and print a summary.
+    """
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    # Keep stub answers out of the real output/ folder
+    os.chdir(tempfile.mkdtemp(prefix="debate_bench_"))
+
+    results = {}
+    for parallel in (False, True):
+        timings = [time_kickoff(parallel, delay) for _ in range(rounds)]
+        results[parallel] = timings
+
+    print(f"\nDebate latency with a {delay:.2f}s stub LLM ({rounds} rounds)")
+    print("-" * 50)
+    for parallel, timings in results.items():
+        best = min(t for t, _ in timings)
+        mean = sum(t for t, _ in timings) / len(timings)
+        calls = timings[0][1]
+        label = "parallel" if parallel else "sequential"
+        print(f"{label:<12} best {best:6.2f}s  mean {mean:6.2f}s  llm calls {calls}")
+
+    sequential = min(t for t, _ in results[False])
+    parallel = min(t for t, _ in results[True])
+    print("-" * 50)
+    print(f"speedup      {sequential / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,7 +1,9 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List 
+from typing import List
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
 
 
 @CrewBase
@@ -10,10 +12,22 @@ class Debate():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
+    def __init__(self, parallel: bool = False, llm=None, output_dir: str = None):
+        # parallel=True dispatches propose and oppose together; decide waits on both
+        # llm overrides the model from agents.yaml (e.g. a stub LLM for benchmarks)
+        # output_dir replaces output/ and may hold input placeholders like {motion_id}
+        self.parallel = parallel
+        self.llm = llm
+        self.output_dir = output_dir
+
+    def output_file(self, name: str):
+        return f"{self.output_dir}/{name}" if self.output_dir else None
+
     @agent
     def debater(self) -> Agent:
         return Agent(
             config=self.agents_config['debater'],
+            llm=self.llm,
             verbose=True
         )
 
@@ -21,14 +35,25 @@ class Debate():
     def judge(self) -> Agent:
         return Agent(
             config=self.agents_config['judge'],
+            llm=self.llm,
+            verbose=True
+        )
+
+    def opposing_debater(self) -> Agent:
+        """A second debater, so both sides never share one agent executor"""
+        return Agent(
+            config=self.agents_config['debater'],
+            llm=self.llm,
             verbose=True
         )
 
- 
+
     @task
     def propose(self) -> Task:
         return Task(
             config=self.tasks_config['propose'],
+            output_file=self.output_file('propose.md'),
+            async_execution=self.parallel,
         )
 
 
@@ -36,23 +61,27 @@ class Debate():
     def oppose(self) -> Task:
         return Task(
             config=self.tasks_config['oppose'],
+            output_file=self.output_file('oppose.md'),
+            agent=self.opposing_debater() if self.parallel else None,
+            async_execution=self.parallel,
         )
 
     @task
     def decide(self) -> Task:
         return Task(
             config=self.tasks_config['decide'],
+            output_file=self.output_file('decide.md'),
         )
 
 
 
     @crew
     def crew(self) -> Crew:
-        """Creates the Debate crew""" 
-        return Crew(
+        """Creates the Debate crew"""
+        return instrument(cache_llm_calls(Crew(
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
             verbose=True,
-             
-        )
+
+        )), name=__package__)
@@ -3,7 +3,9 @@ import sys
 import warnings
 
 from datetime import datetime
-from debate.crew import Debate
+
+# Entry points import the crew (and with it crewai and litellm) when they run,
+# so loading this module stays fast (see crew_utils/import_benchmark.py)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -15,10 +17,77 @@ def run():
     inputs = {
         'motion': 'Ai call centers will handle 80%+ of customer service interactions',
     }
+    from debate.crew import Debate
     
     try:
         result = Debate().crew().kickoff(inputs=inputs)
         print(result.raw)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
- 
\ No newline at end of file
+
+
+def run_parallel():
+    """
+    Run the crew with propose and oppose argued at the same time.
+    """
+    inputs = {
+        'motion': 'Ai call centers will handle 80%+ of customer service interactions',
+    }
+    from debate.crew import Debate
+
+    try:
+        result = Debate(parallel=True).crew().kickoff(inputs=inputs)
+        print(result.raw)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the crew: {e}")
+
+
+def benchmark():
+    """
+    Time the sequential and parallel crews end to end against the local stub
+    server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    """
+    inputs = {
+        'motion': 'Ai call centers will handle 80%+ of customer service interactions',
+    }
+    from debate.crew import Debate
+    from crew_utils.crew_benchmark import run_benchmark
+
+    run_benchmark([
+        ('debate', Debate, inputs),
+        ('debate parallel', lambda: Debate(parallel=True), inputs),
+    ])
+
+
+def benchmark_imports():
+    """
+    Check that importing debate.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('debate')
+
+
+def serve():
+    """
+    Serve the sequential and parallel crews over HTTP: queued kickoff jobs,
+    progress events, and the arguments and verdict of each job
+    (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    """
+    inputs = {
+        'motion': 'Ai call centers will handle 80%+ of customer service interactions',
+    }
+    from debate.crew import Debate
+    from crew_utils.crew_service import CrewService, run_service
+
+    service = CrewService()
+    service.register('debate', lambda: Debate().crew(), inputs)
+    service.register('debate_parallel', lambda: Debate(parallel=True).crew(), inputs)
+    run_service(service)
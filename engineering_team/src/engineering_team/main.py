@@ -3,7 +3,7 @@ import sys
 import warnings
 import os
 from datetime import datetime
-from engineering_team.crew import EngineeringTeam
+# The crew is imported by each entry point, so crewai loads only when one runs
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 # Create output directory if it doesn't exist
 os.makedirs('output', exist_ok=True)
@@ -34,9 +34,60 @@ def run():
         'module_name': module_name,
         'class_name': class_name
     }
+    from engineering_team.crew import EngineeringTeam
     # Create and run the crew
     result = EngineeringTeam().crew().kickoff(inputs=inputs)
 
 
+
+def benchmark():
+    """
+    Time the crew end to end against the local stub server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    """
+    inputs = {
+        'requirements': requirements,
+        'module_name': module_name,
+        'class_name': class_name
+    }
+    from engineering_team.crew import EngineeringTeam
+    from crew_utils.crew_benchmark import run_benchmark
+
+    run_benchmark([('engineering_team', EngineeringTeam, inputs)])
+
+
+def benchmark_imports():
+    """
+    Check that importing engineering_team.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('engineering_team')
+
+
+def serve():
+    """
+    Serve the crew over HTTP: queued kickoff jobs, progress events, and the
+    design, module, app and tests of each job (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    """
+    inputs = {
+        'requirements': requirements,
+        'module_name': module_name,
+        'class_name': class_name
+    }
+    from engineering_team.crew import EngineeringTeam
+    from crew_utils.crew_service import CrewService, run_service
+
+    service = CrewService()
+    service.register('engineering_team', lambda: EngineeringTeam().crew(), inputs)
+    run_service(service)
+
+
 if __name__ == "__main__":
     run()
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Batch runner: research a whole watchlist of companies.
+
+Each company runs on its own copy of one warm FinancialResearcher crew
+(research_task -> analysis_task, see crew_utils/crew_pool.py) and gets its own
+directory, output/companies/<slug>/, holding research.md, report.md and
+status.json. At most `workers` crews run at the
+same time.
+
+A company whose status.json says "done" (and whose report.md exists) is
+skipped on the next run, so a batch that was interrupted or had failures
+picks up where it left off; only the missing and failed companies run
+again. With incremental=True, companies that already have a report are
+updated with what is new since their last run (crew_utils/incremental.py), and
+a company counts as done once it was updated today. After every batch,
+index.md and index.json in the batch directory list every company with its
+status, report and a one-line summary.
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+
+from financial_researcher.crew import FinancialResearcher, IncrementalFinancialResearcher
+from crew_utils.crew_pool import CrewPool
+from crew_utils.incremental import load_state, update_report
+
+DEFAULT_DIR = 'output/companies'
+
+# One crew is built; every company runs on a copy, with its directory as an input
+crews = CrewPool({'research': lambda: FinancialResearcher(output_dir='{company_dir}', verbose=False).crew()})
+
+
+def company_slug(company):
+    """'Saudi Aramco (2222.SR)' -> 'saudi-aramco-2222-sr'"""
+    return re.sub(r'[^a-z0-9]+', '-', company.lower()).strip('-') or 'company'
+
+
+def load_watchlist(path):
+    """One company per line; blank lines and # comments are ignored, duplicates dropped"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.split('#', 1)[0].strip() for line in f]
+    companies = {}
+    for company in lines:
+        if company:
+            companies.setdefault(company_slug(company), company)
+    return list(companies.values())
+
+
+def read_status(company_dir):
+    try:
+        with open(os.path.join(company_dir, 'status.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_status(company_dir, status):
+    path = os.path.join(company_dir, 'status.json')
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(status, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def is_done(company_dir, status, incremental=False):
+    done = bool(status and status.get('status') == 'done'
+                and os.path.exists(os.path.join(company_dir, 'report.md')))
+    if done and incremental:
+        return load_state(company_dir).get('last_run') == date.today().isoformat()
+    return done
+
+
+def report_summary(report_path, limit=200):
+    """First paragraph of the report that is not a heading"""
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return ''
+    for block in re.split(r'\n\s*\n', text):
+        block = ' '.join(block.split())
+        if block and not block.startswith(('#', '---', '```')):
+            block = re.sub(r'[*_`]', '', block)
+            return block if len(block) <= limit else block[:limit].rsplit(' ', 1)[0] + '…'
+    return ''
+
+
+def research_company(company, inputs, company_dir, incremental=False):
+    """Run the research -> analysis chain for one company (or update it); returns its status dict"""
+    os.makedirs(company_dir, exist_ok=True)
+    start = time.perf_counter()
+    status = {'company': company, 'started_at': datetime.now().isoformat(timespec='seconds')}
+    inputs = {**inputs, 'company': company}
+
+    def full_run():
+        crews.crew('research').kickoff(inputs={**inputs, 'company_dir': company_dir})
+
+    try:
+        if incremental:
+            status['update'] = update_report(
+                IncrementalFinancialResearcher(verbose=False),
+                inputs,
+                research_path=os.path.join(company_dir, 'research.md'),
+                report_path=os.path.join(company_dir, 'report.md'),
+                full_run=full_run,
+            )
+        else:
+            full_run()
+        status['status'] = 'done'
+        status['summary'] = report_summary(os.path.join(company_dir, 'report.md'))
+    except Exception as e:
+        status['status'] = 'failed'
+        status['error'] = f'{type(e).__name__}: {e}'
+    status['seconds'] = round(time.perf_counter() - start, 1)
+    status['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    write_status(company_dir, status)
+    return status
+
+
+def write_index(companies, batch_dir, statuses):
+    """index.json and index.md for every company in the watchlist"""
+    entries = []
+    for company in companies:
+        slug = company_slug(company)
+        status = statuses.get(slug) or {'status': 'pending'}
+        done = status.get('status') == 'done'
+        entries.append({
+            'company': company,
+            'status': status.get('status'),
+            'report': os.path.join(slug, 'report.md') if done else None,
+            'research': os.path.join(slug, 'research.md') if done else None,
+            'summary': status.get('summary', '') if done else '',
+            'error': status.get('error'),
+            'seconds': status.get('seconds'),
+            'finished_at': status.get('finished_at'),
+        })
+
+    with open(os.path.join(batch_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+
+    done = sum(e['status'] == 'done' for e in entries)
+    lines = [
+        '# Company Reports',
+        '',
+        f'{done} of {len(entries)} companies researched, updated {datetime.now():%Y-%m-%d %H:%M}.',
+        '',
+        '| Company | Status | Report | Summary |',
+        '|---|---|---|---|',
+    ]
+    for e in entries:
+        report = f"[report]({e['report']})" if e['report'] else ''
+        summary = (e['summary'] or e['error'] or '').replace('|', '\\|')
+        lines.append(f"| {e['company']} | {e['status']} | {report} | {summary} |")
+    with open(os.path.join(batch_dir, 'index.md'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return entries
+
+
+def run_batch(companies, inputs, workers=4, batch_dir=DEFAULT_DIR, fresh=False, incremental=False):
+    """
+    Research every company, at most `workers` at a time.
+
+    Companies already done in batch_dir are skipped unless `fresh` is set.
+    Returns the index entries.
+    """
+    os.makedirs(batch_dir, exist_ok=True)
+    # Read every status once; the index is rebuilt from this dict as companies finish
+    statuses = {company_slug(c): read_status(os.path.join(batch_dir, company_slug(c))) for c in companies}
+    todo = [c for c in companies if fresh or not is_done(
+        os.path.join(batch_dir, company_slug(c)), statuses[company_slug(c)], incremental)]
+    skipped = len(companies) - len(todo)
+    if skipped:
+        print(f"⏭️  {skipped} of {len(companies)} companies already done, skipping them")
+    print(f"📈 Researching {len(todo)} companies with {workers} workers...")
+
+    start = time.perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(research_company, c, inputs, os.path.join(batch_dir, company_slug(c)), incremental): c
+            for c in todo
+        }
+        for n, future in enumerate(as_completed(futures), 1):
+            status = future.result()
+            statuses[company_slug(status['company'])] = status
+            if status['status'] == 'done':
+                print(f"✅ [{n}/{len(todo)}] {status['company']} ({status['seconds']}s)")
+            else:
+                failed += 1
+                print(f"❌ [{n}/{len(todo)}] {status['company']}: {status['error']}")
+            # Keep the index current, so an interrupted batch still has one
+            write_index(companies, batch_dir, statuses)
+
+    entries = write_index(companies, batch_dir, statuses)
+    crews.report()
+    print(f"\n📚 Batch done in {time.perf_counter() - start:.1f}s: "
+          f"{len(todo) - failed} researched, {failed} failed, {skipped} skipped")
+    print(f"📇 Index: {os.path.join(batch_dir, 'index.md')}")
+    return entries
@@ -2,7 +2,10 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
-from crewai_tools import SerperDevTool
+from crew_utils.search_tool import CachedSerperDevTool
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
+from crew_utils.incremental import ResearchDelta, ReportPatch
 
 @CrewBase
 class FinancialResearcher():
@@ -10,42 +13,106 @@ class FinancialResearcher():
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    def __init__(self, output_dir='output', verbose=True):
+        # The batch runner gives every company its own output directory
+        self.output_dir = output_dir
+        self.verbose = verbose
+
     @agent
     def researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['researcher'], # type: ignore[index]
-            verbose=True,
-            tools=[SerperDevTool()]
+            verbose=self.verbose,
+            tools=[CachedSerperDevTool()]
         )
 
     @agent
     def analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['analyst'], # type: ignore[index]
-            verbose=True
+            verbose=self.verbose
         )
     @task
     def research_task(self) -> Task:
         return Task(
             config=self.tasks_config['research_task'], # type: ignore[index]
-             output_file='output/research.md'
+             output_file=f'{self.output_dir}/research.md'
         )
 
     @task
     def analysis_task(self) -> Task:
         return Task(
             config=self.tasks_config['analysis_task'], # type: ignore[index]
-            output_file='output/report.md'
+            output_file=f'{self.output_dir}/report.md'
         )
 
     @crew
     def crew(self) -> Crew:
         """Creates the FinancialResearcher crew""" 
 
-        return Crew(
+        return instrument(cache_llm_calls(Crew(
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=self.verbose,
              
+        )), name=__package__)
+
+
+@CrewBase
+class IncrementalFinancialResearcher():
+    """Updates a previous research.md and report.md with what is new since the last run"""
+    agents: List[BaseAgent]
+    tasks: List[Task]
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/incremental_tasks.yaml'
+
+    def __init__(self, verbose=True):
+        self.verbose = verbose
+
+    @agent
+    def researcher(self) -> Agent:
+        return Agent(
+            config=self.agents_config['researcher'], # type: ignore[index]
+            verbose=self.verbose,
+            tools=[CachedSerperDevTool()]
+        )
+
+    @agent
+    def analyst(self) -> Agent:
+        return Agent(
+            config=self.agents_config['analyst'], # type: ignore[index]
+            verbose=self.verbose
+        )
+
+    @task
+    def research_updates(self) -> Task:
+        return Task(
+            config=self.tasks_config['research_updates'], # type: ignore[index]
+            output_pydantic=ResearchDelta,
         )
+
+    @task
+    def patch_report(self) -> Task:
+        return Task(
+            config=self.tasks_config['patch_report'], # type: ignore[index]
+            output_pydantic=ReportPatch,
+        )
+
+    def updates_crew(self) -> Crew:
+        """Only the delta research"""
+        return instrument(cache_llm_calls(Crew(
+            agents=[self.researcher()],
+            tasks=[self.research_updates()],
+            process=Process.sequential,
+            verbose=self.verbose,
+        )), name=__package__)
+
+    def patch_crew(self) -> Crew:
+        """Only the rewrite of the affected report sections"""
+        return instrument(cache_llm_calls(Crew(
+            agents=[self.analyst()],
+            tasks=[self.patch_report()],
+            process=Process.sequential,
+            verbose=self.verbose,
+        )), name=__package__)
@@ -4,7 +4,9 @@ import warnings
 
 from datetime import datetime
 
-from financial_researcher.crew import FinancialResearcher
+# The crew, the batch runner and the utils load crewai, litellm and pydantic;
+# each entry point imports what it needs, after checking its arguments
+# (uv run benchmark_imports keeps this module light)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -21,6 +23,7 @@ def run():
         'company': 'Saudi Aramco',
         'current_year': str(datetime.now().year)
     }
+    from financial_researcher.crew import FinancialResearcher
 
     try:
         result = FinancialResearcher().crew().kickoff(inputs=inputs)
@@ -32,5 +35,94 @@ def run():
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
+def run_incremental():
+    """
+    Update output/research.md and output/report.md with what is new since the last run.
+
+    The first run (no previous report) is a full run.
+    """
+    inputs = {
+        'company': sys.argv[1] if len(sys.argv) > 1 else 'Saudi Aramco',
+        'current_year': str(datetime.now().year)
+    }
+    from financial_researcher.crew import FinancialResearcher, IncrementalFinancialResearcher
+    from crew_utils.incremental import update_report
+
+    update_report(
+        IncrementalFinancialResearcher(),
+        inputs,
+        research_path='output/research.md',
+        report_path='output/report.md',
+        full_run=lambda: FinancialResearcher().crew().kickoff(inputs=inputs),
+    )
+
+def run_batch():
+    """
+    Research every company in a watchlist file (one company per line).
+
+    Usage: run_batch WATCHLIST [workers] [--fresh] [--incremental]
+    Reports go to output/companies/<company>/, with an index in
+    output/companies/index.md. Companies already done are skipped;
+    --fresh researches them all again, --incremental updates existing
+    reports with what is new since their last run.
+    """
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print("Usage: run_batch WATCHLIST [workers] [--fresh] [--incremental]")
+        sys.exit(1)
+    from financial_researcher.batch import load_watchlist, run_batch as research_watchlist
+
+    companies = load_watchlist(args[0])
+    workers = int(args[1]) if len(args) > 1 else 4
+    inputs = {'current_year': str(datetime.now().year)}
+    entries = research_watchlist(companies, inputs, workers=workers, fresh='--fresh' in sys.argv,
+                                 incremental='--incremental' in sys.argv)
+    if any(e['status'] != 'done' for e in entries):
+        sys.exit(1)
+
+def benchmark():
+    """
+    Time the crew end to end against the local stub server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    """
+    inputs = {
+        'company': 'Saudi Aramco',
+        'current_year': str(datetime.now().year)
+    }
+    from financial_researcher.crew import FinancialResearcher
+    from crew_utils.crew_benchmark import run_benchmark
+
+    run_benchmark([('financial_researcher', FinancialResearcher, inputs)])
+
+def benchmark_imports():
+    """
+    Check that importing financial_researcher.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('financial_researcher')
+
+
+def serve():
+    """
+    Serve the crew over HTTP: queued kickoff jobs, progress events, and the
+    research.md and report.md of each job (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    """
+    from financial_researcher.crew import FinancialResearcher
+    from crew_utils.crew_service import CrewService, run_service
+
+    service = CrewService()
+    service.register('financial_researcher', lambda: FinancialResearcher().crew(), lambda: {
+        'company': 'Saudi Aramco',
+        'current_year': str(datetime.now().year)
+    })
+    run_service(service)
+
 if __name__ == "__main__":
     run()
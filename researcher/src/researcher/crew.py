@@ -2,6 +2,11 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
+from crew_utils.search_tool import CachedSerperDevTool
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
+from crew_utils.context_budget import compress_context
+from crew_utils.incremental import ResearchDelta, ReportPatch
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -40,6 +45,8 @@ class Researcher():
     def research_task(self) -> Task:
         return Task(
             config=self.tasks_config['research_task'], # type: ignore[index]
+            # Kept so that incremental runs can build on it
+            output_file='research.md'
         )
 
     @task
@@ -55,10 +62,68 @@ class Researcher():
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
-        return Crew(
+        return instrument(cache_llm_calls(compress_context(Crew(
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
             verbose=True,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
+        ), self.tasks_config)), name=__package__)
+
+
+@CrewBase
+class IncrementalResearcher():
+    """Updates a previous research.md and report.md with what is new since the last run"""
+
+    agents: List[BaseAgent]
+    tasks: List[Task]
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/incremental_tasks.yaml'
+
+    @agent
+    def researcher(self) -> Agent:
+        # What is new since the last run has to be searched for; the model doesn't know it
+        return Agent(
+            config=self.agents_config['researcher'], # type: ignore[index]
+            verbose=True,
+            tools=[CachedSerperDevTool()]
         )
+
+    @agent
+    def reporting_analyst(self) -> Agent:
+        return Agent(
+            config=self.agents_config['reporting_analyst'], # type: ignore[index]
+            verbose=True
+        )
+
+    @task
+    def research_updates(self) -> Task:
+        return Task(
+            config=self.tasks_config['research_updates'], # type: ignore[index]
+            output_pydantic=ResearchDelta,
+        )
+
+    @task
+    def patch_report(self) -> Task:
+        return Task(
+            config=self.tasks_config['patch_report'], # type: ignore[index]
+            output_pydantic=ReportPatch,
+        )
+
+    def updates_crew(self) -> Crew:
+        """Only the delta research"""
+        return instrument(cache_llm_calls(Crew(
+            agents=[self.researcher()],
+            tasks=[self.research_updates()],
+            process=Process.sequential,
+            verbose=True,
+        )), name=__package__)
+
+    def patch_crew(self) -> Crew:
+        """Only the rewrite of the affected report sections"""
+        return instrument(cache_llm_calls(Crew(
+            agents=[self.reporting_analyst()],
+            tasks=[self.patch_report()],
+            process=Process.sequential,
+            verbose=True,
+        )), name=__package__)
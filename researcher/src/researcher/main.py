@@ -4,7 +4,9 @@ import warnings
 
 from datetime import datetime
 
-from researcher.crew import Researcher
+# The crew and its utils load crewai, litellm and pydantic, which take seconds;
+# each entry point imports what it needs, after checking its arguments
+# (uv run benchmark_imports keeps this module light)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -22,20 +24,99 @@ def run():
         'current_year': str(datetime.now().year)
     }
 
+    from researcher.crew import Researcher
+
     try:
         Researcher().crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
 
+def run_incremental():
+    """
+    Update research.md and report.md with what is new since the last run.
+
+    The first run (no previous report) is a full run.
+    """
+    inputs = {
+        'topic': sys.argv[1] if len(sys.argv) > 1 else 'AI LLMs',
+        'current_year': str(datetime.now().year)
+    }
+    from researcher.crew import Researcher, IncrementalResearcher
+    from crew_utils.incremental import update_report
+
+    try:
+        update_report(
+            IncrementalResearcher(),
+            inputs,
+            research_path='research.md',
+            report_path='report.md',
+            full_run=lambda: Researcher().crew().kickoff(inputs=inputs),
+        )
+    except Exception as e:
+        raise Exception(f"An error occurred while updating the report: {e}")
+
+
+def benchmark():
+    """
+    Time the crew end to end against the local stub server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    """
+    inputs = {
+        'topic': 'AI LLMs',
+        'current_year': str(datetime.now().year)
+    }
+    from researcher.crew import Researcher
+    from crew_utils.crew_benchmark import run_benchmark
+
+    run_benchmark([('researcher', Researcher, inputs)])
+
+
+def benchmark_imports():
+    """
+    Check that importing researcher.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('researcher')
+
+
+def serve():
+    """
+    Serve the crew over HTTP: queued kickoff jobs, progress events, and the
+    research.md and report.md of each job (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    """
+    from researcher.crew import Researcher
+    from crew_utils.crew_service import CrewService, run_service
+
+    service = CrewService()
+    service.register('researcher', lambda: Researcher().crew(), lambda: {
+        'topic': 'AI LLMs',
+        'current_year': str(datetime.now().year)
+    })
+    run_service(service)
+
+
 def train():
     """
     Train the crew for a given number of iterations.
+
+    Usage: uv run train N_ITERATIONS FILENAME
     """
+    if len(sys.argv) < 3 or not sys.argv[1].isdigit():
+        raise Exception("Usage: train N_ITERATIONS FILENAME")
     inputs = {
         "topic": "AI LLMs",
         'current_year': str(datetime.now().year)
     }
+    from researcher.crew import Researcher
+
     try:
         Researcher().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
@@ -45,7 +126,13 @@ def train():
 def replay():
     """
     Replay the crew execution from a specific task.
+
+    Usage: uv run replay TASK_ID
     """
+    if len(sys.argv) < 2:
+        raise Exception("No task id provided. Usage: replay TASK_ID")
+    from researcher.crew import Researcher
+
     try:
         Researcher().crew().replay(task_id=sys.argv[1])
 
@@ -55,11 +142,16 @@ def replay():
 def test():
     """
     Test the crew execution and returns the results.
+
+    Usage: uv run test N_ITERATIONS EVAL_LLM
     """
+    if len(sys.argv) < 3 or not sys.argv[1].isdigit():
+        raise Exception("Usage: test N_ITERATIONS EVAL_LLM")
     inputs = {
         "topic": "AI LLMs",
         "current_year": str(datetime.now().year)
     }
+    from researcher.crew import Researcher
 
     try:
         Researcher().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
@@ -67,6 +159,32 @@ def test():
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
 
+def test_parallel():
+    """
+    Test the crew like test(), with several iterations at a time, each writing
+    its files to output/test/<time>/run_<n>/, and print the mean and variance
+    of the scores (see utils/evaluation.py). Outputs scored before are not
+    scored again unless --rescore is given.
+
+    Usage: uv run test_parallel N_ITERATIONS EVAL_LLM [workers] [--rescore]
+    """
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) < 2 or not args[0].isdigit():
+        raise Exception("Usage: test_parallel N_ITERATIONS EVAL_LLM [workers] [--rescore]")
+    inputs = {
+        "topic": "AI LLMs",
+        "current_year": str(datetime.now().year)
+    }
+    from researcher.crew import Researcher
+    from researcher.utils.evaluation import evaluate_crew
+
+    try:
+        evaluate_crew(lambda: Researcher().crew(), int(args[0]), args[1], inputs,
+                      workers=int(args[2]) if len(args) > 2 else 4, rescore='--rescore' in sys.argv)
+
+    except Exception as e:
+        raise Exception(f"An error occurred while testing the crew: {e}")
+
 def run_with_trigger():
     """
     Run the crew with trigger payload.
@@ -86,6 +204,7 @@ def run_with_trigger():
         "topic": "",
         "current_year": ""
     }
+    from researcher.crew import Researcher
 
     try:
         result = Researcher().crew().kickoff(inputs=inputs)
@@ -0,0 +1,202 @@
+"""
+Parallel crew evaluation: crewai's `crew.test()`, with the iterations run
+at the same time.
+
+Crew.test(n_iterations, eval_llm) kicks the crew off n times, one after
+another, and has an evaluator agent score every task output from 1 to 10.
+evaluate_crew() asks the same evaluator the same question, but:
+
+- runs up to `workers` iterations at once, each on its own copy of a warm
+  crew (crew_utils/crew_pool.py), so 20 iterations take about 20 / workers runs
+- writes each iteration's output files to <output_dir>/run_<n>/ instead
+  of all of them to the one research.md and report.md
+- scores after each kickoff, from the iteration's task outputs, and keeps
+  every judgement in a SQLite cache keyed by the evaluator model, the task
+  and the exact output. An output that was scored before is not sent to the
+  evaluator again, so re-running an evaluation only pays for what changed
+- reports each task's and the crew's score as mean, variance and standard
+  deviation over the iterations, next to the per-run scores, and saves it
+  all to <output_dir>/scores.json
+
+The judgement cache lives next to the LLM cache (EVAL_CACHE_PATH, default
+~/.cache/mycrewai/eval_cache.sqlite); `rescore=True` ignores what it holds.
+With LLM_CACHE set, every iteration replays the first one's answers, so
+leave it off to measure the spread of a prompt change.
+
+    evaluate_crew(lambda: Researcher().crew(), 20, 'gpt-4o-mini', inputs, workers=5)
+"""
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator, TaskEvaluationPydanticOutput
+from crewai.utilities.llm_utils import create_llm
+
+from crew_utils.crew_pool import CrewPool, quiet
+from crew_utils.llm_cache import DEFAULT_PATH, LLMCache
+
+DEFAULT_OUTPUT_DIR = os.path.join('output', 'test')
+
+
+class JudgementCache(LLMCache):
+    """Evaluator scores, keyed by everything the evaluator is shown"""
+
+    def __init__(self, path=None):
+        super().__init__(path=path or os.getenv('EVAL_CACHE_PATH')
+                         or os.path.join(os.path.dirname(DEFAULT_PATH), 'eval_cache.sqlite'), ttl=0)
+
+    @staticmethod
+    def judgement_key(model, task, output):
+        agent = task.agent
+        return LLMCache.make_key(model, [
+            task.description,
+            task.expected_output,
+            agent.role if agent else None,
+            agent.goal if agent else None,
+            output,
+        ])
+
+    def score(self, key):
+        hit = self.get(key)
+        return json.loads(hit[1])['quality'] if hit else None
+
+    def put_score(self, key, model, quality):
+        self.put(key, model, 'score', json.dumps({'quality': quality}))
+
+
+class CachedEvaluator(CrewEvaluator):
+    """
+    crewai's evaluator agent and prompt, called directly on a task and its
+    output instead of as a task callback, with its judgements cached
+    """
+
+    def __init__(self, eval_llm, cache=None, rescore=False):
+        # Not CrewEvaluator.__init__: that takes over the callbacks of one crew's tasks
+        self.llm = create_llm(eval_llm)
+        if not self.llm:
+            raise ValueError(f"Could not create the evaluator LLM from {eval_llm!r}")
+        self.cache = cache or JudgementCache()
+        self.rescore = rescore
+        self.scored = self.cached = 0
+
+    def score(self, task, output):
+        """1-10 quality of `output` (a task's raw output) for `task`"""
+        model = getattr(self.llm, 'model', None)
+        key = self.cache.judgement_key(model, task, output)
+        if not self.rescore:
+            quality = self.cache.score(key)
+            if quality is not None:
+                self.cached += 1
+                return quality
+
+        result = self._evaluation_task(self._evaluator_agent(), task, output).execute_sync()
+        if not isinstance(result.pydantic, TaskEvaluationPydanticOutput) or result.pydantic.quality is None:
+            raise ValueError(f"Evaluation of '{task.name or task.description[:40]}' is not in the expected format")
+        quality = float(result.pydantic.quality)
+        self.cache.put_score(key, model, quality)
+        self.scored += 1
+        return quality
+
+
+def spread(values):
+    """mean, variance and standard deviation (sample, 0 for a single value)"""
+    if not values:
+        return {'mean': None, 'variance': None, 'stdev': None}
+    variance = statistics.variance(values) if len(values) > 1 else 0.0
+    return {
+        'mean': round(statistics.fmean(values), 3),
+        'variance': round(variance, 3),
+        'stdev': round(variance ** 0.5, 3),
+    }
+
+
+def run_iteration(pool, evaluator, iteration, inputs, output_dir):
+    """Kick off one copy with its files in <output_dir>/run_<iteration>/, then score its task outputs"""
+    run_dir = os.path.join(output_dir, f'run_{iteration}')
+    os.makedirs(run_dir, exist_ok=True)
+    crew = quiet(pool.crew('crew'))
+    for task in crew.tasks:
+        if task.output_file:
+            task.output_file = os.path.join(run_dir, os.path.basename(task.output_file))
+
+    start = time.perf_counter()
+    result = crew.kickoff(inputs=dict(inputs or {}))
+    seconds = time.perf_counter() - start
+
+    scores = {}
+    for task, output in zip(crew.tasks, result.tasks_output):
+        scores[task.name or task.description[:40]] = evaluator.score(task, output.raw)
+    return {'run': iteration, 'seconds': round(seconds, 2), 'scores': scores,
+            'crew': round(statistics.fmean(scores.values()), 3) if scores else None}
+
+
+def summarize(runs, eval_model):
+    done = [r for r in runs if 'error' not in r]
+    tasks = {}
+    for run in done:
+        for task, score in run['scores'].items():
+            tasks.setdefault(task, []).append(score)
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'eval_llm': eval_model,
+        'iterations': len(runs),
+        'failed': len(runs) - len(done),
+        'tasks': {task: {'scores': scores, **spread(scores)} for task, scores in tasks.items()},
+        'crew': spread([r['crew'] for r in done if r['crew'] is not None]),
+        'seconds': spread([r['seconds'] for r in done]),
+        'runs': runs,
+    }
+
+
+def report(summary, evaluator, wall):
+    print(f"\n📊 Evaluation by {summary['eval_llm']}: {summary['iterations']} iterations in {wall:.1f}s"
+          + (f", {summary['failed']} failed" if summary['failed'] else ''))
+    print(f"  {'task':<34}{'mean':>7}{'variance':>10}{'stdev':>8}  scores")
+    rows = list(summary['tasks'].items()) + [('Crew', {**summary['crew'], 'scores': []})]
+    for task, row in rows:
+        if row['mean'] is None:
+            continue
+        scores = ' '.join(f'{s:g}' for s in row['scores'])
+        print(f"  {task[:33]:<34}{row['mean']:>7.2f}{row['variance']:>10.2f}{row['stdev']:>8.2f}  {scores}")
+    if summary['seconds']['mean'] is not None:
+        print(f"  run time  mean {summary['seconds']['mean']:.1f}s  stdev {summary['seconds']['stdev']:.1f}s")
+    print(f"  {evaluator.scored} outputs scored, {evaluator.cached} judgements reused from {evaluator.cache.path}")
+
+
+def evaluate_crew(build, n_iterations, eval_llm, inputs=None, workers=4, output_dir=None, rescore=False):
+    """
+    Run and score `n_iterations` kickoffs of the crew from `build()`, up to
+    `workers` at a time (see the module docstring); returns the summary.
+    """
+    output_dir = output_dir or os.path.join(DEFAULT_OUTPUT_DIR, datetime.now().strftime('%Y%m%d-%H%M%S'))
+    os.makedirs(output_dir, exist_ok=True)
+    pool = CrewPool({'crew': build}).warm()
+    evaluator = CachedEvaluator(eval_llm, rescore=rescore)
+    workers = max(1, min(workers, n_iterations))
+
+    print(f"🧪 Evaluating {n_iterations} iterations, {workers} at a time, in {output_dir}/")
+    start = time.perf_counter()
+    runs = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_iteration, pool, evaluator, i, inputs, output_dir): i
+                   for i in range(1, n_iterations + 1)}
+        for future in as_completed(futures):
+            iteration = futures[future]
+            try:
+                run = future.result()
+                print(f"  ✅ Run {iteration}: crew score {run['crew']}, {run['seconds']:.1f}s")
+            except Exception as e:
+                run = {'run': iteration, 'error': f'{type(e).__name__}: {e}'}
+                print(f"  ❌ Run {iteration} failed: {run['error']}")
+            runs.append(run)
+    wall = time.perf_counter() - start
+
+    summary = summarize(sorted(runs, key=lambda r: r['run']), getattr(evaluator.llm, 'model', str(eval_llm)))
+    summary['wall_seconds'] = round(wall, 2)
+    with open(os.path.join(output_dir, 'scores.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    report(summary, evaluator, wall)
+    return summary
@@ -1,11 +1,15 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool
+from crew_utils.search_tool import CachedSerperDevTool
 from pydantic import BaseModel, Field
 from typing import List
 from .tools.push_tool import PushNotificationTool
+from crew_utils.llm_cache import cache_llm_calls
+from crew_utils.instrumentation import instrument
+from .utils.pick_history import PickHistory
+from .utils.memory_maintenance import BoundedLTMStorage
 from crewai.memory import LongTermMemory
-from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+from crewai.tasks.task_output import TaskOutput
 import os
 
 class TrendingCompany(BaseModel):
@@ -29,6 +33,13 @@ class TrendingCompanyResearchList(BaseModel):
     """ A list of detailed research on all the companies """
     research_list: List[TrendingCompanyResearch] = Field(description="Comprehensive research on all trending companies")
 
+class StockPick(BaseModel):
+    """ The company picked for investment, and why """
+    name: str = Field(description="Name of the chosen company")
+    ticker: str = Field(description="Stock ticker symbol of the chosen company")
+    rationale: str = Field(description="Detailed report on why this company was chosen")
+    not_selected: str = Field(description="The companies that were not selected and why")
+
 
 @CrewBase
 class StockPicker():
@@ -37,15 +48,46 @@ class StockPicker():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
+    MODES = ('hierarchical', 'direct')
+
+    def __init__(self, history=None, mode=None):
+        self.history = history or PickHistory()
+        # hierarchical: a manager agent delegates the tasks
+        # direct: the three tasks run in their fixed order, no manager
+        self.mode = mode or os.getenv('STOCK_PICKER_MODE', 'hierarchical')
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown mode {self.mode!r}, expected one of {', '.join(self.MODES)}")
+
+    def skip_picked_companies(self, output):
+        """Task callback: drop companies we have picked before, so they are never researched"""
+        trending = output.pydantic
+        if not isinstance(trending, TrendingCompanyList):
+            return
+        new, skipped = self.history.filter_new(trending.companies)
+        if skipped:
+            print(f"⏭️  Already picked before, skipping: {', '.join(c.ticker for c in skipped)}")
+        # Edit in place: the output file and the research task's context use this object
+        trending.companies = new
+        output.raw = trending.model_dump_json()
+
+    def record_pick(self, output):
+        """Task callback: remember the pick so it is filtered out next time"""
+        pick = output.pydantic
+        if isinstance(pick, StockPick):
+            if self.history.picked([pick.ticker]):
+                print(f"⚠️  {pick.ticker} was picked before; it was not in the researched list")
+            self.history.record(pick.ticker, pick.name, rationale=pick.rationale[:500])
+            print(f"📝 Recorded pick: {pick.name} ({pick.ticker})")
+
     @agent
     def trending_company_finder(self) -> Agent:
         return Agent(config=self.agents_config['trending_company_finder'],
-                     tools=[SerperDevTool()], memory=True)
+                     tools=[CachedSerperDevTool()], memory=True)
     
     @agent
     def financial_researcher(self) -> Agent:
         return Agent(config=self.agents_config['financial_researcher'], 
-                     tools=[SerperDevTool()])
+                     tools=[CachedSerperDevTool()])
 
     @agent
     def stock_picker(self) -> Agent:
@@ -57,6 +99,7 @@ class StockPicker():
         return Task(
             config=self.tasks_config['find_trending_companies'],
             output_pydantic=TrendingCompanyList,
+            callback=self.skip_picked_companies,
         )
 
     @task
@@ -70,14 +113,68 @@ class StockPicker():
     def pick_best_company(self) -> Task:
         return Task(
             config=self.tasks_config['pick_best_company'],
+            output_pydantic=StockPick,
+            callback=self.record_pick,
+        )
+
+    def memory_options(self) -> dict:
+        """Crew memory settings shared by every crew built from this class"""
+        # Create memory directory if it doesn't exist
+        os.makedirs("./memory", exist_ok=True)
+        return dict(
+            memory=True,
+            # Long-term memory using SQLite (no embeddings needed),
+            # indexed, capped and compacted (utils/memory_maintenance.py)
+            long_term_memory=LongTermMemory(
+                storage=BoundedLTMStorage(
+                    db_path="./memory/long_term_memory_storage.db"
+                )
+            )
+        )
+
+    def find_crew(self) -> Crew:
+        """Only the trending-company search, for the fan-out pipeline"""
+        return instrument(cache_llm_calls(Crew(
+            agents=[self.trending_company_finder()],
+            tasks=[self.find_trending_companies()],
+            process=Process.sequential,
+            verbose=True,
+            **self.memory_options()
+        )), name=__package__)
+
+    def pick_crew(self, research: TrendingCompanyResearchList) -> Crew:
+        """Only the final pick, fed with research gathered outside the crew"""
+        # pick_best_company reads its context from this task's output
+        self.research_trending_companies().output = TaskOutput(
+            name='research_trending_companies',
+            description=self.research_trending_companies().description,
+            raw=research.model_dump_json(indent=2),
+            pydantic=research,
+            agent=self.financial_researcher().role,
         )
+        return instrument(cache_llm_calls(Crew(
+            agents=[self.stock_picker()],
+            tasks=[self.pick_best_company()],
+            process=Process.sequential,
+            verbose=True,
+            **self.memory_options()
+        )), name=__package__)
+
+    def direct_crew(self) -> Crew:
+        """find -> research -> pick in order; each task gets the previous pydantic output as context"""
+        return instrument(cache_llm_calls(Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+            **self.memory_options()
+        )), name=__package__)
 
     @crew
     def crew(self) -> Crew:
         """Creates the StockPicker crew"""
-
-        # Create memory directory if it doesn't exist
-        os.makedirs("./memory", exist_ok=True)
+        if self.mode == 'direct':
+            return self.direct_crew()
 
         # Manager agent for hierarchical process
         manager = Agent(
@@ -85,18 +182,41 @@ class StockPicker():
             allow_delegation=True
         )
             
-        return Crew(
+        return instrument(cache_llm_calls(Crew(
             agents=self.agents,
             tasks=self.tasks, 
             process=Process.hierarchical,
             verbose=True,
             manager_agent=manager,
-            memory=True,
-            # Long-term memory using SQLite (no embeddings needed)
-            # This is sufficient for tracking previously picked companies
-            long_term_memory=LongTermMemory(
-                storage=LTMSQLiteStorage(
-                    db_path="./memory/long_term_memory_storage.db"
-                )
-            )
-        )
\ No newline at end of file
+            **self.memory_options()
+        )), name=__package__)
+
+
+@CrewBase
+class CompanyResearcher():
+    """Researches a single trending company; the fan-out pipeline runs one per company"""
+
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/company_tasks.yaml'
+
+    @agent
+    def financial_researcher(self) -> Agent:
+        return Agent(config=self.agents_config['financial_researcher'],
+                     tools=[CachedSerperDevTool()])
+
+    @task
+    def research_company(self) -> Task:
+        return Task(
+            config=self.tasks_config['research_company'],
+            output_pydantic=TrendingCompanyResearch,
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the single-company research crew"""
+        return instrument(cache_llm_calls(Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=True,
+        )), name=__package__)
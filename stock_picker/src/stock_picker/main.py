@@ -2,18 +2,105 @@
 import sys
 import warnings
 import os
+import tempfile
 from datetime import datetime
-from stock_picker.crew import StockPicker
+from stock_picker.utils.pick_history import PickHistory
+# The crew and the pipeline load crewai and litellm, so entry points import them when they run
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+def stock_inputs(company_count='2-3'):
+    return {
+        'sector': 'Technology',
+        "current_date": str(datetime.now()),
+        'company_count': company_count,
+        # Only the latest picks go in the prompt; the full history filters in code
+        'recent_picks': PickHistory().recent_summary(),
+    }
+
 def run():
     """    Run the stock picker crew."""
-    inputs = { 'sector': 'Technology',  "current_date": str(datetime.now())    }
+    from stock_picker.crew import StockPicker
+    inputs = stock_inputs()
     # Create and run the crew
     result = StockPicker().crew().kickoff(inputs=inputs)
     # Print the final decision
     print("\n\n=== FINAL DECISION ===\n\n")
     print(result.raw)
 
+def run_direct():
+    """
+    Run the three tasks in order, without the hierarchical manager.
+
+    Same as setting STOCK_PICKER_MODE=direct.
+    """
+    from stock_picker.crew import StockPicker
+    result = StockPicker(mode='direct').crew().kickoff(inputs=stock_inputs())
+    print("\n\n=== FINAL DECISION ===\n\n")
+    print(result.raw)
+
+def run_fan_out():
+    """
+    Research every trending company in parallel, then pick.
+
+    Usage: run_fan_out [companies] [workers]
+    """
+    company_count = sys.argv[1] if len(sys.argv) > 1 else '2-3'
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    from stock_picker.pipeline import pick_with_fan_out
+    result = pick_with_fan_out(stock_inputs(company_count), workers=workers)
+    if result is None:
+        return
+    print("\n\n=== FINAL DECISION ===\n\n")
+    print(result.raw)
+
+def benchmark():
+    """
+    Time the hierarchical and direct crews end to end against the local stub
+    server; no API keys needed.
+
+    uv run benchmark_crew [rounds] [latency_seconds]
+    """
+    from stock_picker.crew import StockPicker
+    from stock_picker.tools.notifier import get_dispatcher
+    from crew_utils.crew_benchmark import run_benchmark
+
+    def stock_picker(mode):
+        # A fresh pick history every round, so no round filters out the last one's pick
+        return lambda: StockPicker(
+            history=PickHistory(os.path.join(tempfile.mkdtemp(prefix='picks_bench_'), 'pick_history.db')),
+            mode=mode,
+        )
+
+    # The picks' push notifications go to the stub; deliver them before it stops
+    run_benchmark([(f'stock_picker {mode}', stock_picker(mode), stock_inputs()) for mode in StockPicker.MODES],
+                  after_kickoff=lambda: get_dispatcher().flush(timeout=10))
+
+def benchmark_imports():
+    """
+    Check that importing stock_picker.main stays light: no crewai, litellm or other
+    heavy package before an entry point runs (see crew_utils/import_benchmark.py).
+
+    Usage: uv run benchmark_imports [rounds] [budget_ms]
+    """
+    from crew_utils.import_benchmark import run
+
+    run('stock_picker')
+
+
+def serve():
+    """
+    Serve the hierarchical and direct crews over HTTP: queued kickoff jobs,
+    progress events, and the JSON files of each job (see crew_utils/crew_service.py).
+
+    Usage: uv run serve_crew [--host HOST] [--port PORT] [--workers N] [--queue N]
+    """
+    from stock_picker.crew import StockPicker
+    from crew_utils.crew_service import CrewService, run_service
+
+    service = CrewService()
+    service.register('stock_picker', lambda: StockPicker(mode='hierarchical').crew(), stock_inputs)
+    service.register('stock_picker_direct', lambda: StockPicker(mode='direct').crew(), stock_inputs)
+    run_service(service)
+
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
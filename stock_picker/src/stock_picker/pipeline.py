@@ -0,0 +1,89 @@
+"""
+Fan-out pipeline for the stock picker.
+
+The hierarchical crew researches every trending company in one
+financial_researcher call. Here the search runs once, then each company is
+researched by its own CompanyResearcher crew, all at the same time (each with
+its own search tool, all sharing one search cache), and the
+TrendingCompanyResearch results are merged back into one
+TrendingCompanyResearchList for the final pick. Researching 20
+candidates takes about as long as researching the slowest one.
+"""
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from stock_picker.crew import (
+    CompanyResearcher,
+    StockPicker,
+    TrendingCompanyResearch,
+    TrendingCompanyResearchList,
+)
+
+
+def research_company(company, inputs):
+    """Research one company on its own crew; returns a TrendingCompanyResearch"""
+    start = time.perf_counter()
+    result = CompanyResearcher().crew().kickoff(inputs={
+        **inputs,
+        'name': company.name,
+        'ticker': company.ticker,
+        'reason': company.reason,
+    })
+    research = result.pydantic
+    if not isinstance(research, TrendingCompanyResearch):
+        # The model ignored the schema; keep its text rather than lose the company
+        research = TrendingCompanyResearch(
+            name=company.name,
+            market_position=result.raw,
+            future_outlook='',
+            investment_potential='',
+        )
+    print(f"✅ Researched {company.name} ({company.ticker}) in {time.perf_counter() - start:.1f}s")
+    return research
+
+
+def research_companies(companies, inputs, workers=8):
+    """Research every company concurrently and merge the results in list order"""
+    workers = max(1, min(workers, len(companies)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(research_company, c, inputs) for c in companies]
+        research_list = []
+        for company, future in zip(companies, futures):
+            try:
+                research_list.append(future.result())
+            except Exception as e:
+                # One failed company should not sink the others
+                print(f"⚠️  Research on {company.name} failed: {e}")
+    return TrendingCompanyResearchList(research_list=research_list)
+
+
+def pick_with_fan_out(inputs, workers=8, output_dir='output'):
+    """
+    Find trending companies, research them all in parallel, then pick one.
+
+    Returns the pick crew's output, or None if there was no new company to research.
+    """
+    picker = StockPicker()
+
+    print("\n🔎 Finding trending companies...")
+    # Companies picked before are already filtered out (StockPicker.skip_picked_companies)
+    trending = picker.find_crew().kickoff(inputs=inputs).pydantic
+    companies = trending.companies
+    if not companies:
+        print("\n🤷 No new trending companies found; every candidate was picked before.")
+        return None
+    print(f"\n📈 Researching {len(companies)} companies with {min(workers, len(companies))} workers...")
+
+    start = time.perf_counter()
+    research = research_companies(companies, inputs, workers)
+    print(f"\n📚 Research done in {time.perf_counter() - start:.1f}s")
+
+    # Same file the hierarchical crew's research task writes
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'research_report.json'), 'w', encoding='utf-8') as f:
+        json.dump(research.model_dump(), f, indent=2)
+
+    print("\n🏆 Picking the best company...")
+    return picker.pick_crew(research).kickoff(inputs=inputs)
@@ -0,0 +1,195 @@
+"""
+Background delivery of push notifications.
+
+PushNotificationTool used to call requests.post inline: a new connection per
+message, no timeout, and the agent waited for Pushover to answer. A slow or
+hung endpoint stalled the whole crew. NotificationDispatcher takes that off
+the agent's path:
+
+- submit() puts the message on a queue and returns at once
+- one worker thread sends it over a pooled requests.Session, with connect and
+  read timeouts
+- failures are retried a bounded number of times with exponential backoff;
+  timeouts, connection errors, 429 and 5xx are retried, other 4xx are not
+- messages that arrive within coalesce_window seconds of each other go out as
+  one notification (duplicates dropped, split at Pushover's 1024 characters)
+- pending messages are flushed at exit, for at most exit_timeout seconds
+
+The endpoint comes from PUSHOVER_URL, so the dispatcher can be pointed at a
+local stub server.
+"""
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
+MAX_MESSAGE_CHARS = 1024  # Pushover's limit
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def coalesce(messages, limit=MAX_MESSAGE_CHARS):
+    """Join messages (dropping duplicates) into as few notifications as fit in `limit` chars"""
+    chunks = []
+    current = ''
+    for message in dict.fromkeys(m.strip() for m in messages if m and m.strip()):
+        while len(message) > limit:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(message[:limit])
+            message = message[limit:]
+        if current and len(current) + 2 + len(message) > limit:
+            chunks.append(current)
+            current = ''
+        current = f'{current}\n\n{message}' if current else message
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class NotificationDispatcher:
+    """Queue + worker thread that delivers notifications over a pooled session"""
+
+    def __init__(self, url=None, user=None, token=None, timeout=(3.05, 10), retries=3, backoff=0.5,
+                 max_backoff=8.0, coalesce_window=1.0, max_queue=100, exit_timeout=15.0):
+        self.url = url or os.getenv("PUSHOVER_URL") or PUSHOVER_URL
+        self.user = user or os.getenv("PUSHOVER_USER")
+        self.token = token or os.getenv("PUSHOVER_TOKEN")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.coalesce_window = coalesce_window
+        self.exit_timeout = exit_timeout
+        self.stats = {'queued': 0, 'dropped': 0, 'sent': 0, 'failed': 0, 'attempts': 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._stopped = threading.Event()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return bool(self.user and self.token)
+
+    def submit(self, message):
+        """Queue a message; returns False if the queue is full and it was dropped"""
+        self._ensure_worker()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self._done(1)
+            self.stats['dropped'] += 1
+            return False
+        self.stats['queued'] += 1
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until every queued message was sent or given up on; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        self.flush(timeout if timeout is not None else self.exit_timeout)
+        self._stopped.set()
+        self.session.close()
+
+    def _ensure_worker(self):
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='push-notifications', daemon=True)
+                self._worker.start()
+
+    def _done(self, count):
+        with self._idle:
+            self._pending -= count
+            if not self._pending:
+                self._idle.notify_all()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            # Anything that arrives within the window rides along
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                for text in coalesce(batch):
+                    try:
+                        self._send(text)
+                    except Exception as e:
+                        # One bad message must not stop the worker; the rest of the queue still goes out
+                        self.stats['failed'] += 1
+                        print(f"✗ Failed to send push notification ({type(e).__name__}: {e}): {text[:100]}...")
+            finally:
+                self._done(len(batch))
+
+    def _send(self, text):
+        payload = {"user": self.user, "token": self.token, "message": text}
+        for attempt in range(self.retries + 1):
+            self.stats['attempts'] += 1
+            try:
+                response = self.session.post(self.url, data=payload, timeout=self.timeout)
+                if response.ok:
+                    self.stats['sent'] += 1
+                    print(f"✓ Push notification sent: {text[:100]}...")
+                    return True
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUSES:
+                    break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                error = type(e).__name__
+            except requests.RequestException as e:
+                # InvalidURL, TooManyRedirects and the like: retrying won't help
+                error = type(e).__name__
+                break
+            if attempt < self.retries:
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+        self.stats['failed'] += 1
+        print(f"✗ Failed to send push notification ({error}): {text[:100]}...")
+        return False
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """The process-wide dispatcher, flushed at exit"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            atexit.register(_dispatcher.close)
+        return _dispatcher
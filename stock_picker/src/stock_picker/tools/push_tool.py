@@ -1,8 +1,8 @@
 from crewai.tools import BaseTool
 from typing import Type, Any
 from pydantic import BaseModel, Field
-import os
-import requests
+
+from .notifier import get_dispatcher
 
 
 class PushNotificationInput(BaseModel):
@@ -10,7 +10,7 @@ class PushNotificationInput(BaseModel):
     message: str = Field(..., description="The message to be sent to the user.")
 
 
-class PushNotificationTool(BaseTool):  
+class PushNotificationTool(BaseTool):
     name: str = "Send a Push Notification"
     description: str = (
         "This tool is used to send a push notification to the user. "
@@ -24,24 +24,14 @@ class PushNotificationTool(BaseTool):
         if isinstance(message, dict):
             message = message.get('message', str(message))
         
-        pushover_user = os.getenv("PUSHOVER_USER")
-        pushover_token = os.getenv("PUSHOVER_TOKEN")
-        
+        dispatcher = get_dispatcher()
         # Only send if credentials are set
-        if pushover_user and pushover_token:
-            pushover_url = "https://api.pushover.net/1/messages.json"
-            payload = {
-                "user": pushover_user, 
-                "token": pushover_token, 
-                "message": message
-            } 
-            try:
-                response = requests.post(pushover_url, data=payload)
-                print(f"✓ Push notification sent: {message[:100]}...")
-                return f"Notification sent successfully: {message}"
-            except Exception as e:
-                print(f"✗ Failed to send push notification: {e}")
-                return f"Failed to send notification: {str(e)}"
-        else:
+        if not dispatcher.configured:
             print(f"ℹ Push notification (not sent - no credentials): {message}")
-            return f"Notification logged (credentials not set): {message}"
\ No newline at end of file
+            return f"Notification logged (credentials not set): {message}"
+
+        # Delivery happens in the background; the agent does not wait for Pushover
+        if dispatcher.submit(message):
+            return f"Notification queued for delivery: {message}"
+        print(f"✗ Push notification dropped (queue full): {message[:100]}...")
+        return f"Failed to send notification (queue full): {message}"
@@ -0,0 +1,98 @@
+"""
+Long-term memory lookups: crewAI's LTMSQLiteStorage vs BoundedLTMStorage.
+
+Fills a scratch database with 10k and 100k stored task runs (spread over two
+years, across 50 task descriptions), then measures for each storage:
+
+- lookup latency (crewAI asks for the latest 2 rows of the task description)
+- the size of the "Historical Data" block that lookup injects into the prompt
+- for the bounded storage, how long compact() took and how many rows remain
+
+    uv run benchmark_memory [runs ...]
+"""
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+
+from stock_picker.utils.memory_maintenance import BoundedLTMStorage, compact
+
+TASKS = 50
+LOOKUPS = 200
+DESCRIPTION = ("Find the top trending companies in the news in {sector} by searching the latest news. "
+               "Find new companies that you've not found before. Run {n}.")
+SUGGESTION = "Cover {topic} in more depth and cite the news source and date for every claim (run {n})."
+TOPICS = ["revenue growth", "valuation", "competition", "regulation", "supply chain", "AI demand", "margins"]
+
+
+def fill(db_path, runs, seed=7):
+    """Write `runs` crewAI-style LTM rows"""
+    rng = random.Random(seed)
+    LTMSQLiteStorage(db_path=db_path)  # creates the table exactly as crewAI does
+    now = time.time()
+    rows = []
+    for n in range(runs):
+        task = DESCRIPTION.format(sector=f"Sector {n % TASKS}", n=n % TASKS)
+        suggestions = [SUGGESTION.format(topic=rng.choice(TOPICS), n=rng.randrange(runs))
+                       for _ in range(rng.randint(3, 12))]
+        metadata = {"suggestions": suggestions, "quality": rng.uniform(5, 10), "agent": "finder",
+                    "expected_output": "A list of trending companies"}
+        rows.append((task, json.dumps(metadata), str(now - rng.uniform(0, 730) * 86400), metadata["quality"]))
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO long_term_memories (task_description, metadata, datetime, score) VALUES (?, ?, ?, ?)", rows)
+
+
+def prompt_block(rows):
+    """The text crewAI's ContextualMemory builds from an LTM lookup"""
+    if not rows:
+        return ""
+    suggestions = list(dict.fromkeys(s for row in rows for s in row["metadata"]["suggestions"]))
+    return "Historical Data:\n" + "\n".join(f"- {s}" for s in suggestions)
+
+
+def measure(storage):
+    tasks = [DESCRIPTION.format(sector=f"Sector {i % TASKS}", n=i % TASKS) for i in range(LOOKUPS)]
+    start = time.perf_counter()
+    sizes = [len(prompt_block(storage.load(task, 2))) for task in tasks]
+    return (time.perf_counter() - start) / LOOKUPS * 1000, sum(sizes) / len(sizes)
+
+
+def run():
+    """
+    Benchmark memory lookups at 10k and 100k stored runs and print a report.
+    """
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    workdir = tempfile.mkdtemp(prefix='ltm_bench_')
+
+    print(f"\n📊 Long-term memory lookups ({LOOKUPS} lookups, latest 2 rows each)")
+    print("-" * 86)
+    print(f"{'runs':>8}  {'storage':<22}{'rows':>8}{'lookup (ms)':>13}{'prompt (chars)':>16}{'compact (s)':>13}{'DB (MB)':>9}")
+    for runs in sizes:
+        raw_path = os.path.join(workdir, f'raw_{runs}.db')
+        fill(raw_path, runs)
+        bounded_path = os.path.join(workdir, f'bounded_{runs}.db')
+        shutil.copy(raw_path, bounded_path)
+
+        ms, chars = measure(LTMSQLiteStorage(db_path=raw_path))
+        print(f"{runs:>8}  {'LTMSQLiteStorage':<22}{runs:>8}{ms:>13.2f}{chars:>16.0f}{'':>13}"
+              f"{os.path.getsize(raw_path) / 1e6:>9.1f}")
+
+        start = time.perf_counter()
+        stats = compact(bounded_path)
+        seconds = time.perf_counter() - start
+        ms, chars = measure(BoundedLTMStorage(db_path=bounded_path))
+        print(f"{runs:>8}  {'BoundedLTMStorage':<22}{stats['after']:>8}{ms:>13.2f}{chars:>16.0f}{seconds:>13.2f}"
+              f"{os.path.getsize(bounded_path) / 1e6:>9.1f}")
+    print("-" * 86)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run()
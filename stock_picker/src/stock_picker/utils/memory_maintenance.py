@@ -0,0 +1,190 @@
+"""
+Bounded, compacting long-term memory for the stock picker crews.
+
+crewAI's LTMSQLiteStorage only ever appends: every task run adds a row to
+long_term_memories, lookups scan the whole table (task_description has no
+index), and the rows' suggestion lists go into the agent prompt as they are.
+BoundedLTMStorage is a drop-in replacement that:
+
+- indexes (task_description, datetime), so a lookup reads only its own rows
+- caps what one lookup can inject into a prompt (suggestions per row and
+  characters per suggestion)
+- compacts itself when the table grows past max_rows
+
+compact() does the maintenance:
+
+1. expiry: rows older than max_age_days are deleted
+2. digests: per task description, the newest keep_per_task rows stay as they
+   are, and all older rows are folded into one digest row. The digest keeps
+   the most frequent suggestions and the average score, and it is a normal
+   row, so crewAI reads it like any other memory
+3. cap: if the table is still over max_rows, the oldest rows go
+
+    uv run compact [--db PATH] [--max-rows N] [--max-age-days N] [--keep N]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+
+from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+
+DEFAULT_DBS = ("./memory/long_term_memory_storage.db", "./memory/long_term_memory.db")
+MAX_ROWS = 2000
+MAX_AGE_DAYS = 180
+KEEP_PER_TASK = 5
+DIGEST_SUGGESTIONS = 10
+# What one lookup may put into a prompt
+MAX_SUGGESTIONS_PER_ROW = 5
+MAX_SUGGESTION_CHARS = 300
+
+
+def ensure_index(conn):
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ltm_task_datetime "
+        "ON long_term_memories(task_description, datetime)"
+    )
+
+
+def trim_metadata(metadata):
+    """Bound the suggestions a row contributes to the prompt"""
+    suggestions = metadata.get("suggestions") or []
+    metadata["suggestions"] = [s[:MAX_SUGGESTION_CHARS] for s in suggestions[:MAX_SUGGESTIONS_PER_ROW]]
+    return metadata
+
+
+def digest_rows(rows):
+    """Fold (metadata_json, datetime, score) rows into one digest row"""
+    counts = Counter()
+    folded = 0
+    last = {}
+    for metadata_json, _, _ in rows:
+        metadata = json.loads(metadata_json)
+        # A digest counts as many rows as it was made from
+        weight = metadata.get("digest_of", 1)
+        folded += weight
+        for suggestion in metadata.get("suggestions") or []:
+            counts[suggestion] += weight
+        last = metadata
+    scores = [score for _, _, score in rows if score is not None]
+    score = sum(scores) / len(scores) if scores else None
+    metadata = {
+        "suggestions": [s for s, _ in counts.most_common(DIGEST_SUGGESTIONS)],
+        "quality": score,
+        "digest_of": folded,
+        "agent": last.get("agent"),
+        "expected_output": last.get("expected_output"),
+    }
+    newest = max(str(dt) for _, dt, _ in rows)
+    return json.dumps(metadata), newest, score
+
+
+def compact(db_path, max_rows=MAX_ROWS, max_age_days=MAX_AGE_DAYS, keep_per_task=KEEP_PER_TASK, vacuum=True):
+    """Expire, digest and cap one LTM database; returns a dict of what changed"""
+    stats = {"db": db_path, "expired": 0, "digested": 0, "digests": 0, "capped": 0}
+    with sqlite3.connect(db_path) as conn:
+        ensure_index(conn)
+        stats["before"] = conn.execute("SELECT COUNT(*) FROM long_term_memories").fetchone()[0]
+
+        # 1. expiry (crewAI stores datetime as a unix timestamp string)
+        if max_age_days:
+            cutoff = time.time() - max_age_days * 86400
+            stats["expired"] = conn.execute(
+                "DELETE FROM long_term_memories WHERE CAST(datetime AS REAL) < ?", (cutoff,)
+            ).rowcount
+
+        # 2. digests, per task description that has more rows than we keep
+        crowded = conn.execute(
+            "SELECT task_description FROM long_term_memories "
+            "GROUP BY task_description HAVING COUNT(*) > ?", (keep_per_task,)
+        ).fetchall()
+        for (task_description,) in crowded:
+            old = conn.execute(
+                "SELECT id, metadata, datetime, score FROM long_term_memories "
+                "WHERE task_description = ? ORDER BY datetime DESC LIMIT -1 OFFSET ?",
+                (task_description, keep_per_task),
+            ).fetchall()
+            if len(old) < 2:
+                continue
+            metadata, newest, score = digest_rows([row[1:] for row in old])
+            conn.executemany("DELETE FROM long_term_memories WHERE id = ?", [(row[0],) for row in old])
+            conn.execute(
+                "INSERT INTO long_term_memories (task_description, metadata, datetime, score) VALUES (?, ?, ?, ?)",
+                (task_description, metadata, newest, score),
+            )
+            stats["digested"] += len(old)
+            stats["digests"] += 1
+
+        # 3. hard cap on the whole table
+        if max_rows:
+            stats["capped"] = conn.execute(
+                "DELETE FROM long_term_memories WHERE id IN ("
+                "SELECT id FROM long_term_memories ORDER BY datetime DESC LIMIT -1 OFFSET ?)",
+                (max_rows,),
+            ).rowcount
+
+        stats["after"] = conn.execute("SELECT COUNT(*) FROM long_term_memories").fetchone()[0]
+        conn.commit()
+    if vacuum:
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("VACUUM")
+    return stats
+
+
+class BoundedLTMStorage(LTMSQLiteStorage):
+    """LTMSQLiteStorage with an index, bounded lookups and automatic compaction"""
+
+    def __init__(self, db_path=None, max_rows=MAX_ROWS, max_age_days=MAX_AGE_DAYS, keep_per_task=KEEP_PER_TASK):
+        self.max_rows = max_rows
+        self.max_age_days = max_age_days
+        self.keep_per_task = keep_per_task
+        super().__init__(db_path=db_path)
+        if self.row_count() > max_rows:
+            self.compact()
+
+    def _initialize_db(self):
+        super()._initialize_db()
+        with sqlite3.connect(self.db_path) as conn:
+            ensure_index(conn)
+
+    def row_count(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM long_term_memories").fetchone()[0]
+
+    def compact(self):
+        return compact(self.db_path, self.max_rows, self.max_age_days, self.keep_per_task, vacuum=False)
+
+    def save(self, task_description, metadata, datetime, score):
+        super().save(task_description, metadata, datetime, score)
+        # Compact in batches rather than on every save
+        if self.row_count() > self.max_rows * 1.1:
+            self.compact()
+
+    def load(self, task_description, latest_n):
+        rows = super().load(task_description, latest_n)
+        if rows:
+            for row in rows:
+                trim_metadata(row["metadata"])
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the stock picker's long-term memory")
+    parser.add_argument("--db", action="append", help="database to compact (default: both in ./memory)")
+    parser.add_argument("--max-rows", type=int, default=MAX_ROWS)
+    parser.add_argument("--max-age-days", type=int, default=MAX_AGE_DAYS, help="0 keeps rows forever")
+    parser.add_argument("--keep", type=int, default=KEEP_PER_TASK, help="raw rows kept per task description")
+    args = parser.parse_args()
+
+    for db_path in args.db or [p for p in DEFAULT_DBS if os.path.exists(p)]:
+        size_before = os.path.getsize(db_path)
+        stats = compact(db_path, args.max_rows, args.max_age_days, args.keep)
+        print(f"🧹 {db_path}: {stats['before']} -> {stats['after']} rows "
+              f"(expired {stats['expired']}, folded {stats['digested']} into {stats['digests']} digests, "
+              f"capped {stats['capped']}); {size_before / 1024:.0f} KB -> {os.path.getsize(db_path) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
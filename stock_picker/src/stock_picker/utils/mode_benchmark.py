@@ -0,0 +1,103 @@
+"""
+StockPicker: hierarchical mode vs direct mode.
+
+Runs the full crew in both modes (alternating, `rounds` times each) with the
+configured models and reports, per mode:
+
+- LLM calls, and how many of them were the manager's
+- prompt, completion and total tokens
+- wall time
+
+Usage is read from each LLM's own counters (every distinct LLM once), so the
+manager's calls are counted exactly once. The LLM response cache is switched
+off, and picks go to a scratch history so the rounds do not filter each
+other's companies. The runs make real API calls and overwrite output/.
+
+    uv run benchmark_modes [rounds]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from stock_picker.crew import StockPicker
+from stock_picker.main import stock_inputs
+from stock_picker.utils.pick_history import PickHistory
+
+FIELDS = ('calls', 'manager_calls', 'prompt_tokens', 'completion_tokens', 'total_tokens')
+
+
+def llm_usage(crew):
+    """Calls and tokens summed over the crew's distinct LLMs"""
+    llms = {}
+    for agent in crew.agents:
+        llms[id(agent.llm)] = agent.llm
+    manager_llm = crew.manager_agent.llm if crew.manager_agent else None
+    if manager_llm is not None:
+        llms[id(manager_llm)] = manager_llm
+
+    usage = Counter()
+    for llm in llms.values():
+        if not hasattr(llm, 'get_token_usage_summary'):
+            continue
+        summary = llm.get_token_usage_summary()
+        usage['calls'] += summary.successful_requests
+        usage['prompt_tokens'] += summary.prompt_tokens
+        usage['completion_tokens'] += summary.completion_tokens
+        usage['total_tokens'] += summary.total_tokens
+        if llm is manager_llm:
+            usage['manager_calls'] += summary.successful_requests
+    return usage
+
+
+def run_once(mode, history):
+    crew = StockPicker(history=history, mode=mode).crew()
+    start = time.perf_counter()
+    crew.kickoff(inputs=stock_inputs())
+    usage = llm_usage(crew)
+    usage['seconds'] = time.perf_counter() - start
+    return usage
+
+
+def run():
+    """
+    Run the crew in hierarchical and direct mode and print calls, tokens and time.
+    """
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    # Cache hits would hide the calls we are counting
+    os.environ['LLM_CACHE'] = '0'
+    history = PickHistory(os.path.join(tempfile.mkdtemp(prefix='picks_bench_'), 'pick_history.db'))
+
+    results = {mode: [] for mode in StockPicker.MODES}
+    for i in range(rounds):
+        for mode in StockPicker.MODES:
+            print(f"\n⏱️  Round {i + 1}/{rounds}: {mode} mode")
+            try:
+                results[mode].append(run_once(mode, history))
+            except Exception as e:
+                print(f"⚠️  {mode} run failed: {e}")
+
+    print(f"\n📊 StockPicker modes (mean of {rounds} round(s))")
+    print("-" * 84)
+    print(f"{'mode':<14}{'LLM calls':>11}{'manager':>9}{'prompt tok':>12}{'completion tok':>16}"
+          f"{'total tok':>11}{'wall (s)':>11}")
+    means = {}
+    for mode, runs in results.items():
+        if not runs:
+            print(f"{mode:<14}{'failed':>11}")
+            continue
+        means[mode] = {k: sum(r[k] for r in runs) / len(runs) for k in FIELDS + ('seconds',)}
+        m = means[mode]
+        print(f"{mode:<14}{m['calls']:>11.1f}{m['manager_calls']:>9.1f}{m['prompt_tokens']:>12.0f}"
+              f"{m['completion_tokens']:>16.0f}{m['total_tokens']:>11.0f}{m['seconds']:>11.1f}")
+    print("-" * 84)
+    if len(means) == 2 and means['direct']['total_tokens'] and means['direct']['seconds']:
+        h, d = means['hierarchical'], means['direct']
+        print(f"direct mode: {h['calls'] - d['calls']:.1f} fewer LLM calls, "
+              f"{h['total_tokens'] / d['total_tokens']:.1f}x fewer tokens, "
+              f"{h['seconds'] / d['seconds']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,116 @@
+"""
+NotificationDispatcher against the local stub, with scripted failures.
+
+Each case points a fresh dispatcher at crew_utils' StubServer, scripts the
+HTTP statuses the stub answers with, and checks how many attempts were made
+and which notifications the stub received:
+
+- 503 and 429 are retried until the stub answers 200
+- a 503 that never clears is given up on after `retries` retries
+- other 4xx (400) are not retried, and the next message still goes out
+- messages within coalesce_window go out as one notification, duplicates
+  dropped; a message after the window goes out on its own
+- a message over 1024 characters is split into 1024-character notifications
+- a message submitted just before the process exits is flushed at exit
+
+Backoff and the coalesce window are shortened so the run takes a few seconds.
+No network or Pushover account is needed. Exits 1 if any check fails.
+
+    uv run benchmark_notifier
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+
+from crew_utils.stub_server import StubServer, stub_environment
+
+from stock_picker.tools.notifier import MAX_MESSAGE_CHARS, NotificationDispatcher
+
+WINDOW = 0.3
+EXIT_SCRIPT = "from stock_picker.tools.notifier import get_dispatcher; get_dispatcher().submit('sent at exit')"
+
+
+def dispatcher(server, **kwargs):
+    """A dispatcher pointed at `server`, with short backoff and coalesce window"""
+    options = dict(user='stub', token='stub', retries=3, backoff=0.01, max_backoff=0.05, coalesce_window=WINDOW)
+    return NotificationDispatcher(url=stub_environment(server.url)['PUSHOVER_URL'], **{**options, **kwargs})
+
+
+def deliver(statuses, batches, **kwargs):
+    """
+    Submit each batch of messages (a window apart) to a dispatcher whose stub
+    answers `statuses`, and return its stats and the notifications delivered.
+    """
+    with StubServer(push_statuses=statuses) as server:
+        notifier = dispatcher(server, **kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i, batch in enumerate(batches):
+                if i:
+                    time.sleep(WINDOW * 2)
+                for message in batch:
+                    notifier.submit(message)
+            notifier.flush(timeout=30)
+            notifier.close(timeout=1)
+        return notifier.stats, list(server.pushes), server.counts['push']
+
+
+def at_exit():
+    """A process that submits a message and exits at once; the stub must still receive it"""
+    with StubServer() as server:
+        env = dict(os.environ, **stub_environment(server.url))
+        subprocess.run([sys.executable, '-c', EXIT_SCRIPT], env=env, capture_output=True, timeout=60)
+        posts = server.counts['push']
+        # The child's stats die with it; what the stub received is what counts
+        stats = {'attempts': posts, 'sent': len(server.pushes), 'failed': posts - len(server.pushes)}
+        return stats, list(server.pushes), posts
+
+
+def cases():
+    """(name, run, expected attempts, sent, failed, expected notifications)"""
+    long = 'x' * (MAX_MESSAGE_CHARS * 2 + 100)
+    return [
+        ('retry 503, then 200', lambda: deliver([503, 503], [['a']]), 3, 1, 0, ['a']),
+        ('retry 429, then 200', lambda: deliver([429], [['a']]), 2, 1, 0, ['a']),
+        ('503 until retries run out', lambda: deliver([503] * 4, [['a']]), 4, 0, 1, []),
+        ('no retry on 400', lambda: deliver([400], [['a'], ['b']]), 2, 1, 1, ['b']),
+        ('coalesce within the window', lambda: deliver([], [['a', 'b', 'a'], ['c']]), 2, 2, 0, ['a\n\nb', 'c']),
+        ('split at 1024 characters', lambda: deliver([], [[long]]), 3, 3, 0,
+         [long[:MAX_MESSAGE_CHARS], long[MAX_MESSAGE_CHARS:2 * MAX_MESSAGE_CHARS], long[2 * MAX_MESSAGE_CHARS:]]),
+        ('flush at exit', at_exit, 1, 1, 0, ['sent at exit']),
+    ]
+
+
+def run():
+    """
+    Run every case against the stub and print a report; exit 1 if any failed.
+    """
+    print(f"\n📨 NotificationDispatcher against the stub (coalesce window {WINDOW}s)")
+    print("-" * 86)
+    print(f"{'case':<30}{'attempts':>10}{'sent':>6}{'failed':>8}{'pushes':>8}{'time (s)':>10}  result")
+    failures = []
+    for name, case, attempts, sent, failed, pushes in cases():
+        start = time.perf_counter()
+        stats, delivered, posts = case()
+        seconds = time.perf_counter() - start
+        problems = []
+        if stats['attempts'] != attempts or posts != attempts:
+            problems.append(f"{stats['attempts']} attempts ({posts} reached the stub), expected {attempts}")
+        if (stats['sent'], stats['failed']) != (sent, failed):
+            problems.append(f"{stats['sent']} sent and {stats['failed']} failed, expected {sent} and {failed}")
+        if delivered != pushes:
+            problems.append(f"delivered {[m[:40] for m in delivered]}, expected {[m[:40] for m in pushes]}")
+        print(f"{name:<30}{stats['attempts']:>10}{stats['sent']:>6}{stats['failed']:>8}{len(delivered):>8}"
+              f"{seconds:>10.2f}  {'✗' if problems else '✓'}")
+        failures += [f"{name}: {problem}" for problem in problems]
+    print("-" * 86)
+    if failures:
+        print("\n".join(f"✗ {failure}" for failure in failures))
+        sys.exit(1)
+    print("✓ All notifier checks passed")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,124 @@
+"""
+Pick history: every company the crew has picked, indexed by ticker and date.
+
+"Don't pick the same company twice" used to be left to the agents and their
+long-term memory. Now it is enforced in code:
+
+- the trending-company list is filtered against this table before any
+  research runs, so no research calls are spent on companies already picked
+- the final pick is recorded here
+- the finder's prompt gets only the most recent tickers (a fixed number), so
+  the prompt does not grow with the history
+
+    python -m stock_picker.utils.pick_history list [limit]
+    python -m stock_picker.utils.pick_history forget TICKER
+"""
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+DEFAULT_PATH = "./memory/pick_history.db"
+RECENT_IN_PROMPT = 20
+
+
+def normalize_ticker(ticker):
+    """'nasdaq: $nvda ' -> 'NVDA'"""
+    ticker = (ticker or '').strip().upper()
+    if ':' in ticker:
+        ticker = ticker.split(':', 1)[1]
+    return ticker.strip().lstrip('$')
+
+
+class PickHistory:
+    """SQLite table of past picks"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS picks (
+                id INTEGER PRIMARY KEY,
+                ticker TEXT NOT NULL,
+                name TEXT NOT NULL,
+                picked_at TEXT NOT NULL,
+                rationale TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_picks_ticker ON picks(ticker);
+            CREATE INDEX IF NOT EXISTS idx_picks_picked_at ON picks(picked_at);
+        """)
+        self._conn.commit()
+
+    def record(self, ticker, name, rationale='', picked_at=None):
+        picked_at = picked_at or datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO picks (ticker, name, picked_at, rationale) VALUES (?, ?, ?, ?)",
+                (normalize_ticker(ticker), name, picked_at, rationale),
+            )
+            self._conn.commit()
+
+    def picked(self, tickers):
+        """The subset of `tickers` that has been picked before (one indexed lookup)"""
+        tickers = sorted({normalize_ticker(t) for t in tickers if t})
+        if not tickers:
+            return set()
+        marks = ','.join('?' * len(tickers))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT ticker FROM picks WHERE ticker IN ({marks})", tickers
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def recent(self, limit=RECENT_IN_PROMPT):
+        """[(ticker, name, picked_at)], newest first"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT ticker, name, picked_at FROM picks ORDER BY picked_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def recent_summary(self, limit=RECENT_IN_PROMPT):
+        """Short text for the finder's prompt: the last `limit` picks"""
+        picks = self.recent(limit)
+        if not picks:
+            return 'none yet'
+        return ', '.join(f'{name} ({ticker})' for ticker, name, _ in picks)
+
+    def forget(self, ticker):
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM picks WHERE ticker = ?", (normalize_ticker(ticker),)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def filter_new(self, companies):
+        """Split TrendingCompany objects into (new, already_picked), keeping their order"""
+        picked = self.picked(c.ticker for c in companies)
+        new = [c for c in companies if normalize_ticker(c.ticker) not in picked]
+        skipped = [c for c in companies if normalize_ticker(c.ticker) in picked]
+        return new, skipped
+
+    def close(self):
+        self._conn.close()
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    history = PickHistory()
+    if command == 'list':
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+        for ticker, name, picked_at in history.recent(limit):
+            print(f"{picked_at}  {ticker:<8} {name}")
+    elif command == 'forget' and len(sys.argv) > 2:
+        print(f"Removed {history.forget(sys.argv[2])} picks of {normalize_ticker(sys.argv[2])}")
+    else:
+        print("Usage: python -m stock_picker.utils.pick_history [list [limit] | forget TICKER]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()